@@ -24,15 +24,24 @@ Estado de cuenta por cobrar en moneda original (Odoo 19)
             "l10n_cr_statement_currency/static/src/scss/account_report_original_currency.scss",
             "l10n_cr_statement_currency/static/src/scss/statement_pdf.scss",
         ],
+        "web.assets_backend": [
+            "l10n_cr_statement_currency/static/src/components/statement_instrumentation_warning.xml",
+            "l10n_cr_statement_currency/static/src/components/statement_report_filters.xml",
+        ],
     },
     "data": [
         "security/ir.model.access.csv",
         "data/account_report.xml",
+        "data/ir_cron.xml",
         "reports/statement_paperformat.xml",
         "reports/statement_report.xml",
         "reports/statement_report_templates.xml",
+        "views/res_company_views.xml",
         "views/res_partner_views.xml",
         "views/statement_send_wizard_views.xml",
+        "views/statement_send_job_views.xml",
+        "views/statement_batch_run_views.xml",
+        "views/statement_open_balance_views.xml",
     ],
     "installable": True,
     "application": False,
@@ -0,0 +1,53 @@
+import json
+
+from werkzeug.wsgi import wrap_file
+
+from odoo import http
+from odoo.http import content_disposition, request
+
+STATEMENT_EXPORT_REPORT_XMLIDS = (
+    "l10n_cr_statement_currency.statement_report",
+    "l10n_cr_statement_currency.statement_summary_report",
+)
+
+
+class StatementExportController(http.Controller):
+
+    @http.route("/l10n_cr_statement_currency/statements_zip", type="http", auth="user", methods=["GET"])
+    def download_statements_zip(self, report_id, options, **kwargs):
+        """Stream the per-partner statement ZIP straight from its temporary file."""
+        report = self._get_statement_report(report_id)
+        spool, filename = report._export_statement_to_zip(json.loads(options))
+        return self._spooled_file_response(spool, filename, "application/zip")
+
+    @http.route("/l10n_cr_statement_currency/statement_xlsx", type="http", auth="user", methods=["GET"])
+    def download_statement_xlsx(self, report_id, options, **kwargs):
+        """Stream the original-currency ledger workbook straight from its temporary file."""
+        report = self._get_statement_report(report_id)
+        spool, filename = report._export_statement_to_xlsx(json.loads(options))
+        return self._spooled_file_response(
+            spool, filename, "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+        )
+
+    def _get_statement_report(self, report_id):
+        """Return the statement report ``report_id`` points to; any other report is a 404."""
+        reports = [request.env.ref(xmlid, raise_if_not_found=False) for xmlid in STATEMENT_EXPORT_REPORT_XMLIDS]
+        report = next((report for report in reports if report and str(report.id) == str(report_id)), None)
+        if report is None:
+            raise request.not_found()
+        return report
+
+    def _spooled_file_response(self, spool, filename, content_type):
+        spool.seek(0, 2)
+        size = spool.tell()
+        spool.seek(0)
+        response = request.make_response(
+            wrap_file(request.httprequest.environ, spool),
+            headers=[
+                ("Content-Type", content_type),
+                ("Content-Length", str(size)),
+                ("Content-Disposition", content_disposition(filename)),
+            ],
+        )
+        response.direct_passthrough = True
+        return response
@@ -59,7 +59,12 @@ def _find_partner_reports_menu(env):
 
 
 def post_init_hook(env):
-    """Move the statement menu under the Partner Reports sub-menu if present."""
+    """Move the statement menu under the Partner Reports sub-menu if present.
+
+    Also build the open balance summary for the existing ledger.
+    """
+    env["statement.open.balance"]._rebuild_all()
+
     statement_menu = env.ref(
         "l10n_cr_statement_currency.menu_statement_report", raise_if_not_found=False
     )
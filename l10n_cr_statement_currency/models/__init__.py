@@ -1,4 +1,14 @@
 from . import account_move
+from . import account_move_line
+from . import account_partial_reconcile
 from . import account_report
+from . import ir_attachment
 from . import outstanding_original_currency_report
+from . import res_company
+from . import res_currency
+from . import res_lang
 from . import res_partner
+from . import statement_batch_run
+from . import statement_batch_shard
+from . import statement_open_balance
+from . import statement_send_job
@@ -1,7 +1,74 @@
 from odoo import fields, models
+from odoo.tools import SQL
+
+# Rows of the customer statement: posted customer invoices/refunds still open.
+# Readers add this predicate to their queries so the planner can match the
+# partial index below; ``statement_predicate_sql`` qualifies the columns
+# with the table alias of the query. Historical cutoffs rebuild the
+# residual themselves and only use the posted part.
+STATEMENT_POSTED_MOVE_CONDITIONS = (
+    ("move_type", "IN ('out_invoice', 'out_refund')"),
+    ("state", "= 'posted'"),
+)
+STATEMENT_OPEN_MOVE_CONDITIONS = STATEMENT_POSTED_MOVE_CONDITIONS + (("amount_residual", "<> 0"),)
+
+
+def statement_predicate(conditions):
+    """Unqualified predicate of ``conditions``, for index definitions and single-table queries."""
+    return " AND ".join(f"{column} {condition}" for column, condition in conditions)
+
+
+def statement_predicate_sql(conditions, table):
+    """Predicate of ``conditions`` with every column qualified by ``table``."""
+    return SQL(" AND ").join(
+        SQL("%s %s", SQL.identifier(table, column), SQL(condition)) for column, condition in conditions
+    )
+
+
+STATEMENT_POSTED_MOVE_PREDICATE = statement_predicate(STATEMENT_POSTED_MOVE_CONDITIONS)
+STATEMENT_OPEN_MOVE_PREDICATE = statement_predicate(STATEMENT_OPEN_MOVE_CONDITIONS)
 
 
 class AccountMove(models.Model):
     _inherit = "account.move"
 
     fp_consecutive_number = fields.Char(string="Consecutive Number")
+
+    _statement_open_receivable_idx = models.Index(
+        f"(company_id, partner_id, currency_id, invoice_date) WHERE {STATEMENT_OPEN_MOVE_PREDICATE}"
+    )
+
+    def _post(self, soft=True):
+        posted = super()._post(soft=soft)
+        posted._schedule_statement_balance_refresh()
+        return posted
+
+    def button_draft(self):
+        result = super().button_draft()
+        self._schedule_statement_balance_refresh()
+        return result
+
+    def button_cancel(self):
+        result = super().button_cancel()
+        self._schedule_statement_balance_refresh()
+        return result
+
+    def _schedule_statement_balance_refresh(self):
+        """Refresh the summary of the customers whose receivable the moves change.
+
+        Only customer invoices/refunds and the receivable lines of other
+        moves (payments, entries) count: vendor bills, bank statements or
+        payroll entries leave the summary and the result cache alone.
+        """
+        customer_moves = self.filtered(lambda move: move.move_type in ("out_invoice", "out_refund"))
+        receivable_lines = self.line_ids.filtered(lambda line: line.account_id.account_type == "asset_receivable")
+        self.env["statement.open.balance"]._schedule_refresh(
+            (customer_moves.partner_id | receivable_lines.partner_id).ids
+            + customer_moves._statement_partnerless_refresh_ids()
+        )
+
+    def _statement_partnerless_refresh_ids(self):
+        """``[False]`` when a customer invoice/refund has no partner (see ``_schedule_refresh``)."""
+        if any(move.move_type in ("out_invoice", "out_refund") and not move.partner_id for move in self):
+            return [False]
+        return []
@@ -0,0 +1,26 @@
+from odoo import models
+
+from .account_move import statement_predicate
+
+# Payment lines of the customer statement that still have an unapplied
+# amount, matching the partial index below (see ``account_move``).
+# Historical cutoffs rebuild the residual themselves and only use the
+# posted part.
+STATEMENT_POSTED_PAYMENT_CONDITIONS = (
+    ("parent_state", "= 'posted'"),
+    ("payment_id", "IS NOT NULL"),
+)
+STATEMENT_PENDING_PAYMENT_CONDITIONS = STATEMENT_POSTED_PAYMENT_CONDITIONS + (
+    ("reconciled", "IS NOT TRUE"),
+    ("amount_residual", "< 0"),
+)
+STATEMENT_POSTED_PAYMENT_PREDICATE = statement_predicate(STATEMENT_POSTED_PAYMENT_CONDITIONS)
+STATEMENT_PENDING_PAYMENT_PREDICATE = statement_predicate(STATEMENT_PENDING_PAYMENT_CONDITIONS)
+
+
+class AccountMoveLine(models.Model):
+    _inherit = "account.move.line"
+
+    _statement_pending_payment_idx = models.Index(
+        f"(company_id, partner_id, date) WHERE {STATEMENT_PENDING_PAYMENT_PREDICATE}"
+    )
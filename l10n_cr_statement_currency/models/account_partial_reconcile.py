@@ -0,0 +1,24 @@
+from odoo import api, models
+
+
+class AccountPartialReconcile(models.Model):
+    _inherit = "account.partial.reconcile"
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        partials = super().create(vals_list)
+        partials._schedule_statement_balance_refresh()
+        return partials
+
+    def unlink(self):
+        self._schedule_statement_balance_refresh()
+        return super().unlink()
+
+    def _schedule_statement_balance_refresh(self):
+        # Reconciliations of payables leave the customer summary alone.
+        lines = (self.debit_move_id | self.credit_move_id).filtered(
+            lambda line: line.account_id.account_type == "asset_receivable"
+        )
+        self.env["statement.open.balance"]._schedule_refresh(
+            (lines.partner_id | lines.move_id.partner_id).ids + lines.move_id._statement_partnerless_refresh_ids()
+        )
@@ -1,5 +1,25 @@
-from odoo import _, fields, models
+import json
+import logging
+import os
+import tempfile
+import threading
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlencode
+
+from odoo import _, api, fields, models
 from odoo.exceptions import UserError
+from odoo.tools.pdf import merge_pdf
+
+from .statement_instrumentation import StatementInstrumentation
+from .statement_xlsx import StatementXlsxWriter
+
+_logger = logging.getLogger(__name__)
+
+STATEMENT_PDF_REPORT_XMLID = "l10n_cr_statement_currency.action_partner_statement_pdf"
+STATEMENT_PDF_CHUNK_SIZE_PARAM = "l10n_cr_statement_currency.pdf_chunk_size"
+STATEMENT_PDF_WORKERS_PARAM = "l10n_cr_statement_currency.pdf_workers"
+DEFAULT_STATEMENT_PDF_CHUNK_SIZE = 100
 
 
 class AccountReport(models.Model):
@@ -12,9 +32,21 @@ class AccountReport(models.Model):
         the value is truthy or even a sequence. Custom reports (especially section
         headers/subtotals and synthetic ids) may end up with ``move_id=False``.
         """
-        self._sanitize_move_id(lines)
+        if not self._is_statement_report():
+            self._sanitize_move_id(lines)
+            return super()._postprocess_chatter_for_annotations(lines)
+        instrumentation = StatementInstrumentation(self.env, "report_postprocess")
+        with instrumentation.stage("sanitize_move_id") as counts:
+            self._sanitize_move_id(lines)
+            counts["lines"] = len(lines)
+        instrumentation.log(report_id=self.id)
         return super()._postprocess_chatter_for_annotations(lines)
 
+    def _is_statement_report(self):
+        """The statement report or one of its variants (the summary report)."""
+        statement_report = self.env.ref("l10n_cr_statement_currency.statement_report", raise_if_not_found=False)
+        return bool(statement_report) and statement_report in (self | self.root_report_id)
+
     def _sanitize_move_id(self, lines):
         for line in self._walk_line_dicts(lines):
             if "move_id" not in line:
@@ -68,20 +100,20 @@ class AccountReport(models.Model):
 
     def _export_statement_to_custom_pdf(self, options):
         self.ensure_one()
-        partners = self._statement_partners_from_options(options)
+        instrumentation = StatementInstrumentation(self.env, "report_pdf_export")
+        with instrumentation.stage("partners") as counts:
+            partners = self._statement_partners_from_options(options)
+            counts["partners"] = len(partners)
         if not partners:
             raise UserError(
                 _("No hay clientes con saldo pendiente para los filtros indicados.")
             )
 
         cutoff_date = self._statement_cutoff_from_options(options)
-        report_xmlid = "l10n_cr_statement_currency.action_partner_statement_pdf"
-
-        pdf_content, _dummy_type = (
-            self.env["ir.actions.report"]
-            .with_context(statement_cutoff_date=cutoff_date)
-            ._render_qweb_pdf(report_xmlid, res_ids=partners.ids)
-        )
+        with instrumentation.stage("render") as counts:
+            pdf_content = self._render_statement_pdf(partners, cutoff_date)
+            counts["bytes"] = len(pdf_content)
+        instrumentation.log(report_id=self.id, cutoff_date=cutoff_date)
 
         if len(partners) == 1:
             partner_name = (partners.name or str(partners.id)).replace("/", "-")
@@ -98,34 +130,242 @@ class AccountReport(models.Model):
             "file_type": "pdf",
         }
 
-    def _statement_partners_from_options(self, options):
+    # ------------------------------------------------------------------
+    # ZIP export: one PDF per partner, written into a ZIP spooled to a
+    # temporary file and streamed by the controller, so worker memory
+    # only ever holds one partner's PDF.
+    # ------------------------------------------------------------------
+    def action_export_statement_zip(self, options):
+        self.ensure_one()
+        if not self._statement_has_partners(options):
+            raise UserError(
+                _("No hay clientes con saldo pendiente para los filtros indicados.")
+            )
+        query = urlencode({"report_id": self.id, "options": json.dumps(self._statement_export_options(options))})
+        return {
+            "type": "ir.actions.act_url",
+            "url": f"/l10n_cr_statement_currency/statements_zip?{query}",
+            "target": "download",
+        }
+
+    def _statement_export_options(self, options):
+        # Only the keys used to select partners and rows, and the cutoff, travel in the URL.
+        handler = self.env["account.outstanding.original.currency.report.handler"]
+        return {
+            "date": {"date_to": (options.get("date") or {}).get("date_to")},
+            "journals": [
+                {"id": journal["id"], "selected": True}
+                for journal in (options.get("journals") or [])
+                if journal.get("id") and journal.get("selected")
+            ],
+            "partner_ids": handler._extract_partner_ids(options),
+            "statement_min_balance": options.get("statement_min_balance") or 0.0,
+            "statement_min_days_overdue": options.get("statement_min_days_overdue") or 0,
+            "statement_aging_buckets": options.get("statement_aging_buckets") or [],
+        }
+
+    def _export_statement_to_zip(self, options):
+        """Write one statement PDF per partner into a ZIP on disk.
+
+        Returns the open temporary file and the download file name.
+        """
+        self.ensure_one()
+        partners = self._statement_partners_from_options(options)
+        if not partners:
+            raise UserError(
+                _("No hay clientes con saldo pendiente para los filtros indicados.")
+            )
+
+        cutoff_date = self._statement_cutoff_from_options(options)
+        spool = tempfile.TemporaryFile(prefix="statements_", suffix=".zip")
+        used_names = set()
+        with zipfile.ZipFile(spool, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+            for partner in partners:
+                pdf_content = self._render_statement_pdf_chunk(self.env, partner.ids, cutoff_date)
+                filename = partner._get_statement_pdf_filename()
+                if filename in used_names:
+                    filename = f"{filename[:-4]}_{partner.id}.pdf"
+                used_names.add(filename)
+                archive.writestr(filename, pdf_content)
+                # Drop the rendered partner from the cache so memory stays flat.
+                self.env.invalidate_all()
+
+        filename = _("Estados de Cuenta - %(date)s.zip") % {"date": cutoff_date}
+        return spool, filename
+
+    # ------------------------------------------------------------------
+    # XLSX export: the original-currency ledger written straight from the
+    # streamed move/payment rows into a constant-memory workbook spooled
+    # to a temporary file, instead of the generic export of the report
+    # lines.
+    # ------------------------------------------------------------------
+    def action_export_statement_xlsx(self, options):
+        self.ensure_one()
+        if not self._statement_has_partners(options):
+            raise UserError(
+                _("No hay clientes con saldo pendiente para los filtros indicados.")
+            )
+        query = urlencode({"report_id": self.id, "options": json.dumps(self._statement_export_options(options))})
+        return {
+            "type": "ir.actions.act_url",
+            "url": f"/l10n_cr_statement_currency/statement_xlsx?{query}",
+            "target": "download",
+        }
+
+    def _export_statement_to_xlsx(self, options):
+        """Write the aging sheet and one ledger sheet per currency into an XLSX on disk.
+
+        Returns the open temporary file and the download file name.
+        """
+        self.ensure_one()
+        handler = self.env["account.outstanding.original.currency.report.handler"]
+        instrumentation = StatementInstrumentation(self.env, "xlsx_export")
+        reference_date = handler._get_reference_date(options)
+        as_of_date = handler._get_as_of_date(reference_date)
+
+        with instrumentation.stage("summary_rows") as counts:
+            entries = handler._get_statement_summary_entries(options)
+            counts["rows"] = len(entries)
+        if not entries:
+            raise UserError(
+                _("No hay clientes con saldo pendiente para los filtros indicados.")
+            )
+        currencies = self.env["res.currency"].browse({entry["currency_id"] for entry in entries}).sorted("name")
+        aging_labels = self.env["res.partner"]._statement_aging_labels(self.env.company._get_statement_aging_limits())
+
+        spool = tempfile.TemporaryFile(prefix="statement_", suffix=".xlsx")
+        writer = StatementXlsxWriter(self.env, spool)
+        writer.write_aging_sheet(entries, aging_labels, {currency.id: currency for currency in currencies})
+        for currency in currencies:
+            writer.add_currency_sheet(currency)
+        with instrumentation.stage("move_rows") as counts:
+            move_rows = handler._iter_open_move_rows(
+                handler._get_moves_domain(options), reference_date=reference_date, as_of_date=as_of_date
+            )
+            counts["rows"] = 0
+            for row in move_rows:
+                writer.write_move(row)
+                counts["rows"] += 1
+        with instrumentation.stage("pending_payment_rows") as counts:
+            payment_rows = handler._iter_pending_payment_rows(
+                handler._get_pending_payment_lines_domain(options), as_of_date=as_of_date
+            )
+            counts["rows"] = 0
+            for row in payment_rows:
+                writer.write_payment(row)
+                counts["rows"] += 1
+        with instrumentation.stage("close_workbook"):
+            writer.close()
+        instrumentation.log(report_id=self.id)
+
+        filename = _("Estado de cuenta moneda original - %(date)s.xlsx") % {"date": reference_date}
+        return spool, filename
+
+    # ------------------------------------------------------------------
+    # Bulk PDF rendering: wkhtmltopdf runs once per chunk of partners and
+    # several chunks are rendered at the same time, each in its own thread
+    # and cursor, then the chunk PDFs are merged back in partner order.
+    # ------------------------------------------------------------------
+    def _statement_pdf_render_settings(self):
+        """Return ``(chunk_size, max_workers)`` from the system parameters."""
+        ICP = self.env["ir.config_parameter"].sudo()
+        try:
+            chunk_size = int(ICP.get_param(STATEMENT_PDF_CHUNK_SIZE_PARAM, DEFAULT_STATEMENT_PDF_CHUNK_SIZE))
+        except (TypeError, ValueError):
+            chunk_size = DEFAULT_STATEMENT_PDF_CHUNK_SIZE
+        try:
+            max_workers = int(ICP.get_param(STATEMENT_PDF_WORKERS_PARAM, min(4, os.cpu_count() or 1)))
+        except (TypeError, ValueError):
+            max_workers = 1
+        return max(chunk_size, 1), max(max_workers, 1)
+
+    def _render_statement_pdf(self, partners, cutoff_date):
+        chunk_size, max_workers = self._statement_pdf_render_settings()
+        chunks = [partners.ids[index : index + chunk_size] for index in range(0, len(partners), chunk_size)]
+
+        # Worker threads use their own cursor and cannot see uncommitted data,
+        # which is what tests run on: keep those renders sequential.
+        if len(chunks) <= 1 or max_workers == 1 or self.env.registry.in_test_mode():
+            pdf_chunks = [self._render_statement_pdf_chunk(self.env, chunk, cutoff_date) for chunk in chunks]
+        else:
+            _logger.info(
+                "Rendering %s statements in %s chunks with %s workers", len(partners), len(chunks), max_workers
+            )
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(chunks))) as executor:
+                pdf_chunks = list(
+                    executor.map(
+                        lambda chunk: self._render_statement_pdf_chunk_threaded(chunk, cutoff_date), chunks
+                    )
+                )
+        return pdf_chunks[0] if len(pdf_chunks) == 1 else merge_pdf(pdf_chunks)
+
+    def _get_prerendered_statement_pdf(self, partners, data_by_partner):
+        """Return the merged stored PDFs of ``partners``, or None unless every one is current."""
+        attachments = partners._get_current_statement_attachments(data_by_partner)
+        if len(attachments) != len(partners):
+            return None
+        pdfs = [attachments[partner_id].raw for partner_id in partners.ids]
+        return pdfs[0] if len(pdfs) == 1 else merge_pdf(pdfs)
+
+    def _render_statement_pdf_chunk_threaded(self, partner_ids, cutoff_date):
+        threading.current_thread().dbname = self.env.cr.dbname
+        with self.env.registry.cursor() as cr:
+            env = api.Environment(cr, self.env.uid, self.env.context)
+            return self._render_statement_pdf_chunk(env, partner_ids, cutoff_date)
+
+    def _render_statement_pdf_chunk(self, env, partner_ids, cutoff_date):
+        """Return the PDF of ``partner_ids``, copied from the stored statements when all are current.
+
+        Only today's statements are pre-rendered, so other cutoffs skip the
+        lookup and the template prepares the data itself. Otherwise the data
+        prepared for the lookup is handed to the render, so it is read once.
+        """
+        data = None
+        if cutoff_date == fields.Date.context_today(self):
+            partners = env["res.partner"].browse(partner_ids)
+            data_by_partner = partners._prepare_statement_data_batch(cutoff_date)
+            stored = self.with_env(env)._get_prerendered_statement_pdf(partners, data_by_partner)
+            if stored is not None:
+                return stored
+            data = {"statement_data_by_partner": data_by_partner}
+        pdf_content, _dummy_type = (
+            env["ir.actions.report"]
+            .with_context(statement_cutoff_date=cutoff_date)
+            ._render_qweb_pdf(STATEMENT_PDF_REPORT_XMLID, res_ids=partner_ids, data=data)
+        )
+        return pdf_content
+
+    def _statement_explicit_partner_ids(self, options):
         explicit = []
         for pid in options.get("partner_ids") or []:
             try:
                 explicit.append(int(pid))
             except (TypeError, ValueError):
                 continue
-        if explicit:
+        return explicit
+
+    def _statement_partners_from_options(self, options):
+        handler = self.env["account.outstanding.original.currency.report.handler"]
+        explicit = self._statement_explicit_partner_ids(options)
+        # Chosen partners are printed even without balance, unless a filter
+        # (threshold, days overdue, aging) is meant to sort them out.
+        if explicit and not handler._has_statement_filters(options):
             return self.env["res.partner"].browse(explicit).exists()
 
-        cutoff = self._statement_cutoff_from_options(options)
-        domain = [
-            ("move_type", "in", ("out_invoice", "out_refund")),
-            ("state", "=", "posted"),
-            ("amount_residual", "!=", 0.0),
-            ("company_id", "in", self.env.companies.ids),
-            ("invoice_date", "<=", cutoff),
-        ]
-        selected_journal_ids = [
-            journal.get("id")
-            for journal in (options.get("journals") or [])
-            if journal.get("id") and journal.get("selected")
-        ]
-        if selected_journal_ids:
-            domain.append(("journal_id", "in", selected_journal_ids))
-
-        moves = self.env["account.move"].search(domain)
-        return moves.mapped("partner_id").sorted(lambda p: (p.name or "").lower())
+        # Partner ids and names come straight from the report's partner
+        # aggregates (open invoices and unapplied payments), so no move is
+        # loaded just to find who to print.
+        return self.env["res.partner"].browse(
+            partner_id for partner_id, _partner_name in handler._get_statement_partners(options)
+        )
+
+    def _statement_has_partners(self, options):
+        """Whether ``_statement_partners_from_options`` is not empty, checked before sending a download."""
+        handler = self.env["account.outstanding.original.currency.report.handler"]
+        explicit = self._statement_explicit_partner_ids(options)
+        if explicit and not handler._has_statement_filters(options):
+            return bool(self.env["res.partner"].browse(explicit).exists())
+        return handler._has_statement_partners(options)
 
     def _statement_cutoff_from_options(self, options):
         raw_date_to = (options.get("date") or {}).get("date_to")
@@ -0,0 +1,17 @@
+from odoo import fields, models
+
+
+class IrAttachment(models.Model):
+    _inherit = "ir.attachment"
+
+    statement_fingerprint = fields.Char(
+        string="Huella de estado de cuenta",
+        index="btree_not_null",
+        copy=False,
+        help="Hash of the statement content this PDF was rendered from; used to reuse identical renders.",
+    )
+    statement_prerendered = fields.Boolean(
+        string="Estado de cuenta pre-generado",
+        copy=False,
+        help="Rendered ahead of time by the nightly statement cron; replaced when the statement changes.",
+    )
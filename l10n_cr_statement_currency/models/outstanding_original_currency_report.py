@@ -1,8 +1,27 @@
-from collections import defaultdict
+from datetime import timedelta
+from itertools import count
 
 from odoo import _, fields, models
-from odoo.tools.misc import formatLang
-from odoo.tools import float_is_zero
+from odoo.tools import SQL
+
+from .account_move import STATEMENT_OPEN_MOVE_CONDITIONS, STATEMENT_POSTED_MOVE_CONDITIONS, statement_predicate_sql
+from .account_move_line import STATEMENT_PENDING_PAYMENT_CONDITIONS, STATEMENT_POSTED_PAYMENT_CONDITIONS
+from .statement_cache import StatementResultCache
+from .statement_formatter import statement_amount_formatter
+from .statement_instrumentation import StatementInstrumentation
+from .statement_partner_groups import StatementPartnerGroups
+from .statement_rows import StatementMoveRow, StatementPaymentRow
+
+# Report data already computed in this worker, keyed by database, ledger
+# change marker, user context and the options that drive the data. Only
+# totals and detail pages go in; full-ledger row sets are never cached.
+STATEMENT_RESULT_CACHE = StatementResultCache(max_entries=256, max_rows=50000)
+_CACHE_MISS = object()
+# Rows pulled from the database per round trip when streaming move/payment rows.
+STATEMENT_FETCH_BATCH_SIZE = 2000
+# Partners whose moves (or pending payments) one unfold_all query loads.
+STATEMENT_UNFOLD_PARTNER_CHUNK = 200
+_STREAM_CURSOR_IDS = count(1)
 
 
 class OutstandingOriginalCurrencyReportHandler(models.AbstractModel):
@@ -10,25 +29,109 @@ class OutstandingOriginalCurrencyReportHandler(models.AbstractModel):
     _inherit = "account.report.custom.handler"
     _description = "Outstanding Receivable in Original Currency Report Handler"
     _COLUMN_EXPRESSIONS = ("fecha", "fecha_vencimiento", "dias_vencidos", "importe_original", "saldo")
+    _SUMMARY_COLUMN_EXPRESSIONS = ("saldo_facturas", "pagos_pendientes", "saldo_neto") + tuple(
+        f"antiguedad_{bucket}" for bucket in ("current", "period_1", "period_2", "period_3", "older")
+    )
 
     def _custom_options_initializer(self, report, options, previous_options=None):
         super()._custom_options_initializer(report, options, previous_options=previous_options)
         self._apply_context_partner_filter(options)
         options.setdefault("unfold_all", False)
-        self._sync_column_labels(report, options)
+        options.setdefault("buttons", []).append(
+            {
+                "name": _("ZIP"),
+                "sequence": 35,
+                "action": "action_export_statement_zip",
+            }
+        )
+        options["statement_summary"] = report == self.env.ref(
+            "l10n_cr_statement_currency.statement_summary_report", raise_if_not_found=False
+        )
+        if not options["statement_summary"]:
+            options["buttons"].append(
+                {
+                    "name": _("XLSX moneda original"),
+                    "sequence": 36,
+                    "action": "action_export_statement_xlsx",
+                }
+            )
+        aging_labels = self.env["res.partner"]._statement_aging_labels(
+            self.env.company._get_statement_aging_limits()
+        )
+        self._init_statement_filter_options(options, previous_options or {}, aging_labels)
+        label_overrides = {}
+        if options["statement_summary"]:
+            # Aging headers follow the periods configured on the company.
+            label_overrides = {f"antiguedad_{bucket}": label for bucket, label in aging_labels.items()}
+        self._sync_column_labels(report, options, label_overrides)
+
+    def _init_statement_filter_options(self, options, previous_options, aging_labels):
+        """Minimum net balance, minimum days overdue and aging buckets filters."""
+        try:
+            min_balance = max(float(previous_options.get("statement_min_balance") or 0.0), 0.0)
+        except (TypeError, ValueError):
+            min_balance = 0.0
+        try:
+            min_days_overdue = max(int(previous_options.get("statement_min_days_overdue") or 0), 0)
+        except (TypeError, ValueError):
+            min_days_overdue = 0
+        selected_buckets = [
+            bucket for bucket in previous_options.get("statement_aging_buckets") or [] if bucket in aging_labels
+        ]
+        options["statement_min_balance"] = min_balance
+        options["statement_min_days_overdue"] = min_days_overdue
+        options["statement_aging_buckets"] = selected_buckets
+        options["statement_aging_bucket_filters"] = [
+            {"id": bucket, "name": label, "selected": bucket in selected_buckets}
+            for bucket, label in aging_labels.items()
+        ]
 
-    def _sync_column_labels(self, report, options):
+    def _get_custom_display_config(self):
+        config = super()._get_custom_display_config()
+        config.setdefault("templates", {})["AccountReportFilters"] = (
+            "l10n_cr_statement_currency.StatementReportFilters"
+        )
+        return config
+
+    def _has_statement_filters(self, options):
+        return bool(
+            options.get("statement_min_balance")
+            or options.get("statement_min_days_overdue")
+            or options.get("statement_aging_buckets")
+        )
+
+    def _can_use_open_balance_summary(self, options):
+        """The summary table has no journal, due date or threshold dimension.
+
+        Its rows stop at today's documents, so a cutoff after today (which
+        the live path keeps as the document date bound) reads the ledger.
+        """
+        raw_date_to = (options.get("date") or {}).get("date_to")
+        try:
+            date_to = fields.Date.to_date(raw_date_to) if raw_date_to else None
+        except (ValueError, TypeError):
+            date_to = None
+        if date_to and date_to > fields.Date.context_today(self):
+            return False
+        return not self._has_statement_filters(options) and self.env["statement.open.balance"]._is_usable_for(
+            self._get_reference_date(options), self._get_selected_journal_ids(options)
+        )
+
+    def _sync_column_labels(self, report, options, label_overrides=None):
         """Keep Odoo's header metadata intact and only fill visible labels."""
         ordered_columns = report.column_ids.sorted("sequence")
         if not ordered_columns:
             return
 
+        label_overrides = label_overrides or {}
         labels_by_expression = {
-            column.expression_label: column.name
+            column.expression_label: label_overrides.get(column.expression_label, column.name)
             for column in ordered_columns
             if column.expression_label
         }
-        ordered_labels = [column.name for column in ordered_columns]
+        ordered_labels = [
+            labels_by_expression.get(column.expression_label, column.name) for column in ordered_columns
+        ]
 
         for index, column in enumerate(options.get("columns", [])):
             label = labels_by_expression.get(column.get("expression_label"))
@@ -92,291 +195,981 @@ class OutstandingOriginalCurrencyReportHandler(models.AbstractModel):
         options["partner"] = [{"id": partner.id, "name": partner.display_name, "selected": True} for partner in partners]
 
     def _dynamic_lines_generator(self, report, options, all_column_groups_expression_totals, warnings=None):
-        grouped_results = self._get_grouped_moves(options)
-        lines = []
+        # Only the level-1 partner rows are built here, from a per-partner
+        # aggregate. Currency and detail rows are produced by the expand
+        # functions below, so folded partners never load their moves.
+        if options.get("statement_summary"):
+            return self._summary_lines_generator(report, options, warnings)
 
         unfolded_lines = set(options.get("unfolded_lines", []))
         unfold_all = options.get("unfold_all")
+        instrumentation = StatementInstrumentation(self.env, "report_lines")
+
+        # Lines are wrapped into the ``(sequence, line)`` pairs account_reports
+        # expects as they are produced, so the report never holds a second
+        # full-size copy of them.
+        lines = []
+        with instrumentation.stage("partner_totals") as counts:
+            partner_totals = self._get_partner_totals(options, "moves")
+            counts["rows"] = len(partner_totals)
+        with instrumentation.stage("build_partner_lines") as counts:
+            lines.extend(
+                (0, line)
+                for line in self._iter_partner_lines(report, partner_totals, unfolded_lines, unfold_all)
+            )
+            counts["lines"] = len(lines)
+
+        with instrumentation.stage("pending_payments_section") as counts:
+            lines.extend(
+                (0, line)
+                for line in self._iter_pending_payments_section_lines(report, options, unfolded_lines, unfold_all)
+            )
+            counts["lines"] = len(lines) - len(partner_totals)
 
-        for partner_key in sorted(grouped_results.keys(), key=lambda key: (key[1] or "").lower()):
-            partner_id, partner_name = partner_key
-            partner_payload = grouped_results[partner_key]
+        instrumentation.log(report_id=report.id, unfold_all=bool(unfold_all))
+        instrumentation.add_report_warning(warnings)
+        return lines
+
+    def _iter_partner_lines(self, report, partner_totals, unfolded_lines, unfold_all):
+        for partner_id, partner_name in self._sort_partner_totals(partner_totals):
             partner_line_id = report._get_generic_line_id("res.partner", partner_id, markup="partner")
-            partner_is_unfolded = unfold_all or partner_line_id in unfolded_lines
+            yield {
+                "id": partner_line_id,
+                "name": partner_name,
+                "level": 1,
+                "unfoldable": True,
+                "unfolded": bool(unfold_all or partner_line_id in unfolded_lines),
+                "expand_function": "_report_expand_unfoldable_line_statement_partner",
+                "class": "o_statement_original_currency_partner",
+                "columns": self._empty_columns(),
+            }
 
-            lines.append(
-                {
-                    "id": partner_line_id,
-                    "name": partner_name or _("No Partner"),
-                    "level": 1,
-                    "unfoldable": True,
-                    "unfolded": bool(partner_is_unfolded),
-                    "class": "o_statement_original_currency_partner",
-                    "columns": self._empty_columns(),
-                }
+    def _iter_pending_payments_section_lines(self, report, options, unfolded_lines, unfold_all):
+        partner_totals = self._get_partner_totals(options, "pending_payments")
+        if not partner_totals:
+            return
+
+        section_line_id = report._get_generic_line_id("account.report", report.id, markup="pending_payments_section")
+        yield {
+            "id": section_line_id,
+            "name": _("Pending payments to reconcile"),
+            "level": 1,
+            "class": "o_statement_original_currency_section",
+            "columns": self._empty_columns(),
+        }
+
+        for partner_id, partner_name in self._sort_partner_totals(partner_totals):
+            partner_line_id = report._get_generic_line_id(
+                "res.partner", partner_id, parent_line_id=section_line_id, markup="pending_payment_partner"
+            )
+            yield {
+                "id": partner_line_id,
+                "parent_id": section_line_id,
+                "name": partner_name,
+                "level": 2,
+                "unfoldable": True,
+                "unfolded": bool(unfold_all or partner_line_id in unfolded_lines),
+                "expand_function": "_report_expand_unfoldable_line_statement_payment_partner",
+                "class": "o_statement_original_currency_partner",
+                "columns": self._empty_columns(),
+            }
+
+    # ------------------------------------------------------------------
+    # Summary mode: per partner/currency totals only, no move rows
+    # ------------------------------------------------------------------
+    def _summary_lines_generator(self, report, options, warnings):
+        instrumentation = StatementInstrumentation(self.env, "report_summary_lines")
+        with instrumentation.stage("summary_rows") as counts:
+            entries = self._get_cached_result(
+                options, ("summary_rows",), lambda: self._get_statement_summary_entries(options)
             )
+            counts["rows"] = len(entries)
+
+        with instrumentation.stage("build_summary_lines") as counts:
+            currencies = self.env["res.currency"].browse({entry["currency_id"] for entry in entries})
+            currency_by_id = {currency.id: currency for currency in currencies}
+            lines = []
+            partner_line_id = None
+            previous_partner_id = None
+            for entry in entries:
+                if not lines or entry["partner_id"] != previous_partner_id:
+                    previous_partner_id = entry["partner_id"]
+                    partner_line_id = report._get_generic_line_id(
+                        "res.partner", entry["partner_id"], markup="summary_partner"
+                    )
+                    lines.append((0, {
+                        "id": partner_line_id,
+                        "name": entry["partner_name"],
+                        "level": 1,
+                        "class": "o_statement_original_currency_partner",
+                        "columns": self._empty_columns(self._SUMMARY_COLUMN_EXPRESSIONS),
+                    }))
+                lines.append((0, self._get_summary_currency_line(
+                    report, partner_line_id, entry, currency_by_id[entry["currency_id"]]
+                )))
+            counts["lines"] = len(lines)
+
+        instrumentation.log(report_id=report.id)
+        instrumentation.add_report_warning(warnings)
+        return lines
+
+    def _get_summary_currency_line(self, report, partner_line_id, entry, currency):
+        amounts = [entry["open_total"], entry["pending_total"], entry["open_total"] - entry["pending_total"]]
+        amounts += [entry["aging"][bucket] for bucket in self.env["res.partner"]._AGING_BUCKETS]
+        return {
+            "id": report._get_generic_line_id(
+                "res.currency", currency.id, parent_line_id=partner_line_id, markup="summary_currency"
+            ),
+            "parent_id": partner_line_id,
+            "name": entry["currency_name"],
+            "level": 2,
+            "columns": [
+                {"expression_label": expression, **self._monetary_col(report, amount, currency)}
+                for expression, amount in zip(self._SUMMARY_COLUMN_EXPRESSIONS, amounts)
+            ],
+        }
 
-            if not partner_is_unfolded:
-                continue
+    def _get_statement_summary_entries(self, options):
+        """Return per partner/currency open, pending and aging totals, sorted by partner then currency.
 
-            for currency_id, currency_data in sorted(
-                partner_payload.items(), key=lambda item: (item[1]["currency_name"] or "")
-            ):
-                currency = self.env["res.currency"].browse(currency_id)
-                currency_line_id = report._get_generic_line_id(
-                    "res.currency", currency_id, parent_line_id=partner_line_id, markup="currency"
+        Read from the ``statement.open.balance`` summary when it covers the
+        options, otherwise from grouped queries on the ledger; move and
+        payment rows are never loaded either way.
+        """
+        reference_date = self._get_reference_date(options)
+        if self._can_use_open_balance_summary(options):
+            rows = self.env["statement.open.balance"]._fetch_summary_rows(
+                self.env.companies.ids, partner_ids=self._extract_partner_ids(options)
+            )
+        else:
+            rows = [
+                dict(row, open_total=row["residual"], pending_total=0.0)
+                for row in self._fetch_open_move_aging_totals(
+                    self._get_moves_domain(options),
+                    reference_date,
+                    self.env.company._get_statement_aging_limits(),
+                    as_of_date=self._get_as_of_date(reference_date),
                 )
-                currency_is_unfolded = unfold_all or currency_line_id in unfolded_lines
-
-                lines.append(
-                    {
-                        "id": currency_line_id,
-                        "parent_id": partner_line_id,
-                        "name": currency_data["currency_name"],
-                        "level": 2,
-                        "unfoldable": True,
-                        "unfolded": bool(currency_is_unfolded),
-                        "class": "o_statement_original_currency_currency",
-                        "columns": self._empty_columns(),
-                    }
+            ]
+            rows += [
+                dict(row, aging_bucket=None, open_total=0.0, pending_total=row["subtotal_residual"])
+                for row in self._fetch_pending_payment_partner_currency_totals(
+                    self._get_pending_payment_lines_domain(options),
+                    as_of_date=self._get_as_of_date(reference_date),
                 )
+            ]
+
+        no_partner_label = _("No Partner")
+        entries = {}
+        for row in rows:
+            key = (row["partner_id"], row["currency_id"])
+            if key not in entries:
+                entries[key] = {
+                    "partner_id": row["partner_id"] or False,
+                    "partner_name": row["partner_name"] or no_partner_label,
+                    "currency_id": row["currency_id"],
+                    "currency_name": row["currency_name"],
+                    "open_total": 0.0,
+                    "pending_total": 0.0,
+                    "aging": dict.fromkeys(self.env["res.partner"]._AGING_BUCKETS, 0.0),
+                }
+            entry = entries[key]
+            entry["open_total"] += row["open_total"]
+            entry["pending_total"] += row["pending_total"]
+            if row["aging_bucket"]:
+                entry["aging"][row["aging_bucket"]] += row["open_total"]
+        return sorted(
+            entries.values(),
+            key=lambda entry: (entry["partner_name"].lower(), entry["partner_id"], entry["currency_name"]),
+        )
 
-                if not currency_is_unfolded:
-                    continue
+    def _get_partner_totals(self, options, kind):
+        """Return the partners to list for ``kind`` ("moves" or "pending_payments").
 
-                for move in currency_data["moves"]:
-                    lines.append(
-                        {
-                            "id": report._get_generic_line_id("account.move", move["id"], parent_line_id=currency_line_id),
-                            "parent_id": currency_line_id,
-                            "name": move["display_number"],
-                            "level": 3,
-                            "caret_options": "account.move",
-                            "move_id": (move["id"], move["display_number"]),
-                            "class": "o_statement_original_currency_detail",
-                            "columns": [
-                                {
-                                    "name": self._fmt_date(move["invoice_date"]),
-                                    "expression_label": "fecha",
-                                },
-                                {
-                                    "name": self._fmt_date(move["invoice_date_due"]),
-                                    "expression_label": "fecha_vencimiento",
-                                },
-                                self._days_col(move["days_overdue"]),
-                                {
-                                    "expression_label": "importe_original",
-                                    **self._monetary_col(report, move["original_amount"], currency),
-                                },
-                                {
-                                    "expression_label": "saldo",
-                                    **self._monetary_col(report, move["residual_amount"], currency),
-                                },
-                            ],
-                        }
-                    )
+        The maintained ``statement.open.balance`` summary answers this in a
+        few rows when it covers the options (today's cutoff, no journal
+        filter); otherwise the ledger itself is aggregated.
+        """
+        return self._get_cached_result(
+            options, ("partner_totals", kind), lambda: self._compute_partner_totals(options, kind)
+        )
 
-                lines.append(
-                    {
-                        "id": report._get_generic_line_id("res.currency", currency_id, parent_line_id=currency_line_id, markup="subtotal"),
-                        "parent_id": currency_line_id,
-                        "name": _("Subtotal"),
-                        "level": 3,
-                        "class": "o_statement_original_currency_subtotal",
-                        "columns": [
-                            {"name": "", "expression_label": "fecha"},
-                            {"name": "", "expression_label": "fecha_vencimiento"},
-                            {"name": "", "expression_label": "dias_vencidos"},
-                            {
-                                "expression_label": "importe_original",
-                                **self._monetary_col(report, currency_data["subtotal_original"], currency),
-                            },
-                            {
-                                "expression_label": "saldo",
-                                **self._monetary_col(report, currency_data["subtotal_residual"], currency),
-                            },
-                        ],
-                    }
-                )
+    def _compute_partner_totals(self, options, kind):
+        if self._can_use_open_balance_summary(options):
+            return self.env["statement.open.balance"]._fetch_partner_totals(
+                kind, self.env.companies.ids, partner_ids=self._extract_partner_ids(options)
+            )
+        as_of_date = self._get_options_as_of_date(options)
+        if kind == "moves":
+            return self._fetch_open_move_partner_totals(self._get_moves_domain(options), as_of_date=as_of_date)
+        return self._fetch_pending_payment_partner_totals(
+            self._get_pending_payment_lines_domain(options), as_of_date=as_of_date
+        )
 
-        self._append_pending_payments_section(report, options, lines, unfolded_lines, unfold_all)
-        return [(0, line) for line in lines]
+    # ------------------------------------------------------------------
+    # Result cache
+    # ------------------------------------------------------------------
+    def _get_cached_result(self, options, key, compute):
+        """Return ``compute()``, memoized until the receivable ledger changes.
+
+        Entries are keyed by the ``statement.open.balance`` ledger change
+        marker, read in the transaction snapshot like the data itself, so
+        any posted/reset invoice or (un)reconciliation makes them
+        unreachable and the LRU eventually drops them. Cached values are
+        shared between requests and must not be mutated by callers.
+        """
+        if not self._use_result_cache():
+            return compute()
+        cache_key = (
+            self.env.cr.dbname,
+            self.env["statement.open.balance"]._get_ledger_change_marker(),
+            self.env.uid,
+            tuple(self.env.companies.ids),
+            self.env.lang,
+            self._get_options_cache_key(options),
+            key,
+        )
+        result = STATEMENT_RESULT_CACHE.get(cache_key, _CACHE_MISS)
+        if result is _CACHE_MISS:
+            result = compute()
+            STATEMENT_RESULT_CACHE.put(cache_key, result)
+        return result
+
+    def _use_result_cache(self):
+        # A transaction that changed the ledger would cache data no other
+        # transaction sees under a marker another one may reach. Tests
+        # share one transaction whose data never commits, so results must
+        # not outlive a test; the cache tests force it on.
+        return not (
+            self.env.registry.in_test_mode()
+            or self.env["statement.open.balance"]._has_uncommitted_ledger_changes()
+        )
 
-    def _append_pending_payments_section(self, report, options, lines, unfolded_lines, unfold_all):
-        grouped_pending_payments = self._get_grouped_pending_payments(options)
-        if not grouped_pending_payments:
-            return
+    def _get_options_cache_key(self, options):
+        """The options the statement data depends on (not the unfolded lines or display flags)."""
+        return (
+            self._get_reference_date(options),
+            tuple(self._get_selected_journal_ids(options)),
+            tuple(self._extract_partner_ids(options)),
+            options.get("export_mode"),
+            options.get("statement_min_balance"),
+            options.get("statement_min_days_overdue"),
+            tuple(options.get("statement_aging_buckets") or ()),
+        )
 
-        section_line_id = report._get_generic_line_id("account.report", report.id, markup="pending_payments_section")
-        lines.append(
-            {
-                "id": section_line_id,
-                "name": _("Pending payments to reconcile"),
-                "level": 1,
-                "class": "o_statement_original_currency_section",
-                "columns": self._empty_columns(),
-            }
+    def _get_statement_partners(self, options):
+        """Return ``(partner_id, partner_name)`` of every partner to print, sorted by name.
+
+        Partners with open invoices and partners with only unapplied
+        payments both count; the filters of ``options`` apply as in the report.
+        """
+        partner_totals = self._get_partner_totals(options, "moves") + self._get_partner_totals(
+            options, "pending_payments"
+        )
+        return self._sort_partner_totals(
+            {row["partner_id"]: row for row in partner_totals if row["partner_id"]}.values()
         )
 
-        for partner_key in sorted(grouped_pending_payments.keys(), key=lambda key: (key[1] or "").lower()):
-            partner_id, partner_name = partner_key
-            partner_payload = grouped_pending_payments[partner_key]
-            partner_line_id = report._get_generic_line_id(
-                "res.partner", partner_id, parent_line_id=section_line_id, markup="pending_payment_partner"
+    def _has_statement_partners(self, options):
+        """Whether ``_get_statement_partners`` would return anyone, without aggregating every partner.
+
+        The export actions only need to know the selection is not empty;
+        the queries here stop at the first open item of a partner.
+        """
+        if self._can_use_open_balance_summary(options):
+            return self.env["statement.open.balance"]._has_partner_balances(
+                self.env.companies.ids, partner_ids=self._extract_partner_ids(options)
+            )
+        as_of_date = self._get_options_as_of_date(options)
+        open_moves = self._search_open_moves(self._get_moves_domain(options), as_of_date)
+        residual_join, residual = self._get_open_move_residual_sql(open_moves, as_of_date)
+        self.env.cr.execute(SQL(
+            """
+            SELECT EXISTS(
+                    SELECT FROM account_move move
+                           %(residual_join)s
+                      JOIN res_currency currency ON currency.id = move.currency_id
+                     WHERE move.id IN (%(move_ids)s)
+                       AND move.partner_id IS NOT NULL
+                       AND ABS(%(residual)s) >= currency.rounding / 2
+                   )
+                OR EXISTS(
+                    SELECT FROM (%(pending)s) pending
+                     WHERE pending.partner_id IS NOT NULL
+                   )
+            """,
+            residual=residual,
+            residual_join=residual_join,
+            move_ids=open_moves.subselect(),
+            pending=self._get_pending_payment_rows_sql(self._get_pending_payment_lines_domain(options), as_of_date),
+        ))
+        return self.env.cr.fetchone()[0]
+
+    def _sort_partner_totals(self, partner_totals):
+        no_partner_label = _("No Partner")
+        partners = [(row["partner_id"] or False, row["partner_name"] or no_partner_label) for row in partner_totals]
+        return sorted(partners, key=lambda partner: (partner[1] or "").lower())
+
+    # ------------------------------------------------------------------
+    # Expand functions (account_reports unfold / unfold_all hooks)
+    # ------------------------------------------------------------------
+    def _custom_unfold_all_batch_data_generator(self, report, options, lines_to_expand_by_function):
+        """With unfold_all, load the partners by chunks instead of one query per unfold.
+
+        account_reports expands the partner lines in display order, so the
+        moves and pending payments are loaded ``STATEMENT_UNFOLD_PARTNER_CHUNK``
+        partners of that order at a time (``StatementPartnerGroups``) and
+        never for the whole ledger at once. The report lines built from
+        them are all returned together by account_reports, though, so
+        they still grow with the ledger.
+        """
+        if not any(function_name.startswith("_report_expand_unfoldable_line_statement_")
+                   for function_name in lines_to_expand_by_function):
+            return None
+        instrumentation = StatementInstrumentation(self.env, "report_unfold_all")
+        with instrumentation.stage("partner_order") as counts:
+            move_partner_ids = [
+                partner_id for partner_id, _partner_name in self._sort_partner_totals(
+                    self._get_partner_totals(options, "moves")
+                )
+            ]
+            payment_partner_ids = [
+                partner_id for partner_id, _partner_name in self._sort_partner_totals(
+                    self._get_partner_totals(options, "pending_payments")
+                )
+            ]
+            counts["partners"] = len(move_partner_ids)
+            counts["payment_partners"] = len(payment_partner_ids)
+        instrumentation.log(report_id=report.id)
+        # Not cached: together the chunks cover every row of the ledger.
+        return {
+            "moves": StatementPartnerGroups(
+                lambda partner_ids: self._get_grouped_moves(options, [("partner_id", "in", partner_ids)]),
+                move_partner_ids,
+                STATEMENT_UNFOLD_PARTNER_CHUNK,
+            ),
+            "pending_payments": StatementPartnerGroups(
+                lambda partner_ids: self._get_grouped_pending_payments(options, [("partner_id", "in", partner_ids)]),
+                payment_partner_ids,
+                STATEMENT_UNFOLD_PARTNER_CHUNK,
+            ),
+        }
+
+    def _get_detail_page_limit(self, report, options):
+        """Return how many detail lines one unfold / "load more" click may send."""
+        if report.load_more_limit and options.get("export_mode") != "print":
+            return report.load_more_limit
+        return None
+
+    def _report_expand_unfoldable_line_statement_partner(
+        self, line_dict_id, groupby, options, progress, offset, unfold_all_batch_data=None
+    ):
+        report = self.env["account.report"].browse(options["report_id"])
+        partner_id = report._get_res_id_from_line_id(line_dict_id, "res.partner") or False
+        if unfold_all_batch_data:
+            currency_totals = [
+                {"currency_id": currency_id, "currency_name": currency_data["currency_name"]}
+                for currency_id, currency_data in unfold_all_batch_data["moves"].get(partner_id, {}).items()
+            ]
+        else:
+            currency_totals = self._get_cached_result(
+                options,
+                ("move_currency_totals", partner_id),
+                lambda: self._fetch_open_move_currency_totals(
+                    self._get_moves_domain(options) + [("partner_id", "=", partner_id)],
+                    as_of_date=self._get_options_as_of_date(options),
+                ),
+            )
+
+        lines = self._build_currency_lines(
+            report,
+            options,
+            line_dict_id,
+            currency_totals,
+            level=2,
+            markup="currency",
+            expand_function="_report_expand_unfoldable_line_statement_currency",
+        )
+        return {"lines": lines, "offset_increment": len(lines), "has_more": False}
+
+    def _report_expand_unfoldable_line_statement_currency(
+        self, line_dict_id, groupby, options, progress, offset, unfold_all_batch_data=None
+    ):
+        report = self.env["account.report"].browse(options["report_id"])
+        partner_id = report._get_res_id_from_line_id(line_dict_id, "res.partner") or False
+        currency_id = report._get_res_id_from_line_id(line_dict_id, "res.currency")
+        currency = self.env["res.currency"].browse(currency_id)
+        limit = self._get_detail_page_limit(report, options)
+        instrumentation = StatementInstrumentation(self.env, "report_expand_moves")
+
+        if unfold_all_batch_data:
+            currency_data = unfold_all_batch_data["moves"].get(partner_id, {}).get(currency_id)
+            if not currency_data:
+                return {"lines": [], "offset_increment": 0, "has_more": False}
+            page = currency_data["moves"][offset : offset + limit + 1 if limit else None]
+            subtotal = currency_data
+        else:
+            domain = self._get_moves_domain(options) + [
+                ("partner_id", "=", partner_id),
+                ("currency_id", "=", currency_id),
+            ]
+            with instrumentation.stage("fetch_moves") as counts:
+                # Fetch one extra row to know whether a "load more" line is needed.
+                page = self._get_cached_result(
+                    options,
+                    ("move_page", partner_id, currency_id, offset, limit),
+                    lambda: [
+                        self._prepare_move_values(row)
+                        for row in self._fetch_open_move_rows(
+                            domain,
+                            reference_date=self._get_reference_date(options),
+                            offset=offset,
+                            limit=limit + 1 if limit else None,
+                            as_of_date=self._get_options_as_of_date(options),
+                        )
+                    ],
+                )
+                # The subtotal always covers the whole group, so it comes from an
+                # aggregate instead of the (possibly partial) page of moves.
+                subtotal = None
+                if not offset:
+                    subtotal = self._get_cached_result(
+                        options,
+                        ("move_subtotal", partner_id, currency_id),
+                        lambda: next(
+                            iter(self._fetch_open_move_currency_totals(
+                                domain, as_of_date=self._get_options_as_of_date(options)
+                            )),
+                            None,
+                        ),
+                    )
+                counts["rows"] = len(page)
+
+        has_more = bool(limit) and len(page) > limit
+        if has_more:
+            page = page[:limit]
+
+        with instrumentation.stage("build_move_lines") as counts:
+            lines = [self._get_move_line(report, line_dict_id, move, currency) for move in page]
+            counts["lines"] = len(lines)
+        after_load_more_lines = []
+        if not offset and subtotal:
+            after_load_more_lines.append(
+                self._get_subtotal_line(
+                    report,
+                    line_dict_id,
+                    currency,
+                    subtotal["subtotal_original"],
+                    subtotal["subtotal_residual"],
+                    level=3,
+                    markup="subtotal",
+                )
+            )
+        instrumentation.log(line_id=line_dict_id, offset=offset)
+        return {
+            "lines": lines,
+            "after_load_more_lines": after_load_more_lines,
+            "offset_increment": len(page),
+            "has_more": has_more,
+        }
+
+    def _report_expand_unfoldable_line_statement_payment_partner(
+        self, line_dict_id, groupby, options, progress, offset, unfold_all_batch_data=None
+    ):
+        report = self.env["account.report"].browse(options["report_id"])
+        partner_id = report._get_res_id_from_line_id(line_dict_id, "res.partner") or False
+        if unfold_all_batch_data:
+            currency_totals = [
+                {"currency_id": currency_id, "currency_name": currency_data["currency_name"]}
+                for currency_id, currency_data in unfold_all_batch_data["pending_payments"].get(partner_id, {}).items()
+            ]
+        else:
+            currency_totals = self._get_cached_result(
+                options,
+                ("payment_currency_totals", partner_id),
+                lambda: self._fetch_pending_payment_currency_totals(
+                    self._get_pending_payment_lines_domain(options) + [("partner_id", "=", partner_id)],
+                    as_of_date=self._get_options_as_of_date(options),
+                ),
             )
-            partner_is_unfolded = unfold_all or partner_line_id in unfolded_lines
 
+        lines = self._build_currency_lines(
+            report,
+            options,
+            line_dict_id,
+            currency_totals,
+            level=3,
+            markup="pending_payment_currency",
+            expand_function="_report_expand_unfoldable_line_statement_payment_currency",
+        )
+        return {"lines": lines, "offset_increment": len(lines), "has_more": False}
+
+    def _report_expand_unfoldable_line_statement_payment_currency(
+        self, line_dict_id, groupby, options, progress, offset, unfold_all_batch_data=None
+    ):
+        report = self.env["account.report"].browse(options["report_id"])
+        partner_id = report._get_res_id_from_line_id(line_dict_id, "res.partner") or False
+        currency_id = report._get_res_id_from_line_id(line_dict_id, "res.currency")
+        currency = self.env["res.currency"].browse(currency_id)
+        limit = self._get_detail_page_limit(report, options)
+        instrumentation = StatementInstrumentation(self.env, "report_expand_pending_payments")
+
+        if unfold_all_batch_data:
+            currency_data = unfold_all_batch_data["pending_payments"].get(partner_id, {}).get(currency_id)
+            if not currency_data:
+                return {"lines": [], "offset_increment": 0, "has_more": False}
+            page = currency_data["payments"][offset : offset + limit + 1 if limit else None]
+            subtotal = currency_data
+        else:
+            domain = self._get_pending_payment_lines_domain(options) + [("partner_id", "=", partner_id)]
+            with instrumentation.stage("fetch_payments") as counts:
+                page = self._get_cached_result(
+                    options,
+                    ("payment_page", partner_id, currency_id, offset, limit),
+                    lambda: [
+                        self._prepare_payment_values(row)
+                        for row in self._fetch_pending_payment_rows(
+                            domain,
+                            currency_id=currency_id,
+                            offset=offset,
+                            limit=limit + 1 if limit else None,
+                            as_of_date=self._get_options_as_of_date(options),
+                        )
+                    ],
+                )
+                subtotal = None
+                if not offset:
+                    subtotal = next(
+                        (
+                            totals
+                            for totals in self._get_cached_result(
+                                options,
+                                ("payment_currency_totals", partner_id),
+                                lambda: self._fetch_pending_payment_currency_totals(
+                                    domain, as_of_date=self._get_options_as_of_date(options)
+                                ),
+                            )
+                            if totals["currency_id"] == currency_id
+                        ),
+                        None,
+                    )
+                counts["rows"] = len(page)
+
+        has_more = bool(limit) and len(page) > limit
+        if has_more:
+            page = page[:limit]
+
+        with instrumentation.stage("build_payment_lines") as counts:
+            lines = [self._get_payment_line(report, line_dict_id, payment, currency) for payment in page]
+            counts["lines"] = len(lines)
+        after_load_more_lines = []
+        if not offset and subtotal:
+            after_load_more_lines.append(
+                self._get_subtotal_line(
+                    report,
+                    line_dict_id,
+                    currency,
+                    subtotal["subtotal_original"],
+                    subtotal["subtotal_residual"],
+                    level=4,
+                    markup="pending_payment_subtotal",
+                )
+            )
+        instrumentation.log(line_id=line_dict_id, offset=offset)
+        return {
+            "lines": lines,
+            "after_load_more_lines": after_load_more_lines,
+            "offset_increment": len(page),
+            "has_more": has_more,
+        }
+
+    # ------------------------------------------------------------------
+    # Line builders
+    # ------------------------------------------------------------------
+    def _build_currency_lines(self, report, options, partner_line_id, currency_totals, level, markup, expand_function):
+        unfolded_lines = set(options.get("unfolded_lines", []))
+        unfold_all = options.get("unfold_all")
+
+        lines = []
+        for currency_row in sorted(currency_totals, key=lambda row: row["currency_name"] or ""):
+            currency_line_id = report._get_generic_line_id(
+                "res.currency", currency_row["currency_id"], parent_line_id=partner_line_id, markup=markup
+            )
             lines.append(
                 {
-                    "id": partner_line_id,
-                    "parent_id": section_line_id,
-                    "name": partner_name or _("No Partner"),
-                    "level": 2,
+                    "id": currency_line_id,
+                    "parent_id": partner_line_id,
+                    "name": currency_row["currency_name"],
+                    "level": level,
                     "unfoldable": True,
-                    "unfolded": bool(partner_is_unfolded),
-                    "class": "o_statement_original_currency_partner",
+                    "unfolded": bool(unfold_all or currency_line_id in unfolded_lines),
+                    "expand_function": expand_function,
+                    "class": "o_statement_original_currency_currency",
                     "columns": self._empty_columns(),
                 }
             )
+        return lines
 
-            if not partner_is_unfolded:
-                continue
-
-            for currency_id, currency_data in sorted(
-                partner_payload.items(), key=lambda item: (item[1]["currency_name"] or "")
-            ):
-                currency = self.env["res.currency"].browse(currency_id)
-                currency_line_id = report._get_generic_line_id(
-                    "res.currency", currency_id, parent_line_id=partner_line_id, markup="pending_payment_currency"
-                )
-                currency_is_unfolded = unfold_all or currency_line_id in unfolded_lines
-
-                lines.append(
-                    {
-                        "id": currency_line_id,
-                        "parent_id": partner_line_id,
-                        "name": currency_data["currency_name"],
-                        "level": 3,
-                        "unfoldable": True,
-                        "unfolded": bool(currency_is_unfolded),
-                        "class": "o_statement_original_currency_currency",
-                        "columns": self._empty_columns(),
-                    }
-                )
-
-                if not currency_is_unfolded:
-                    continue
+    def _get_move_line(self, report, currency_line_id, move, currency):
+        return {
+            "id": report._get_generic_line_id("account.move", move["id"], parent_line_id=currency_line_id),
+            "parent_id": currency_line_id,
+            "name": move["display_number"],
+            "level": 3,
+            "caret_options": "account.move",
+            "move_id": (move["id"], move["display_number"]),
+            "class": "o_statement_original_currency_detail",
+            "columns": [
+                {
+                    "name": self._fmt_date(move["invoice_date"]),
+                    "expression_label": "fecha",
+                },
+                {
+                    "name": self._fmt_date(move["invoice_date_due"]),
+                    "expression_label": "fecha_vencimiento",
+                },
+                self._days_col(move["days_overdue"]),
+                {
+                    "expression_label": "importe_original",
+                    **self._monetary_col(report, move["original_amount"], currency),
+                },
+                {
+                    "expression_label": "saldo",
+                    **self._monetary_col(report, move["residual_amount"], currency),
+                },
+            ],
+        }
 
-                for payment in currency_data["payments"]:
-                    lines.append(
-                        {
-                            "id": report._get_generic_line_id("account.move", payment["move_id"], parent_line_id=currency_line_id),
-                            "parent_id": currency_line_id,
-                            "name": payment["display_number"],
-                            "level": 4,
-                            "caret_options": "account.move",
-                            "move_id": (payment["move_id"], payment["display_number"]),
-                            "class": "o_statement_original_currency_detail",
-                            "columns": [
-                                {
-                                    "name": self._fmt_date(payment["payment_date"]),
-                                    "expression_label": "fecha",
-                                },
-                                {"name": "", "expression_label": "fecha_vencimiento"},
-                                {"name": "", "expression_label": "dias_vencidos"},
-                                {
-                                    "expression_label": "importe_original",
-                                    **self._monetary_col(report, payment["payment_amount"], currency),
-                                },
-                                {
-                                    "expression_label": "saldo",
-                                    **self._monetary_col(report, payment["residual_amount"], currency),
-                                },
-                            ],
-                        }
-                    )
+    def _get_payment_line(self, report, currency_line_id, payment, currency):
+        return {
+            "id": report._get_generic_line_id("account.move", payment["move_id"], parent_line_id=currency_line_id),
+            "parent_id": currency_line_id,
+            "name": payment["display_number"],
+            "level": 4,
+            "caret_options": "account.move",
+            "move_id": (payment["move_id"], payment["display_number"]),
+            "class": "o_statement_original_currency_detail",
+            "columns": [
+                {
+                    "name": self._fmt_date(payment["payment_date"]),
+                    "expression_label": "fecha",
+                },
+                {"name": "", "expression_label": "fecha_vencimiento"},
+                {"name": "", "expression_label": "dias_vencidos"},
+                {
+                    "expression_label": "importe_original",
+                    **self._monetary_col(report, payment["payment_amount"], currency),
+                },
+                {
+                    "expression_label": "saldo",
+                    **self._monetary_col(report, payment["residual_amount"], currency),
+                },
+            ],
+        }
 
-                lines.append(
-                    {
-                        "id": report._get_generic_line_id(
-                            "res.currency", currency_id, parent_line_id=currency_line_id, markup="pending_payment_subtotal"
-                        ),
-                        "parent_id": currency_line_id,
-                        "name": _("Subtotal"),
-                        "level": 4,
-                        "class": "o_statement_original_currency_subtotal",
-                        "columns": [
-                            {"name": "", "expression_label": "fecha"},
-                            {"name": "", "expression_label": "fecha_vencimiento"},
-                            {"name": "", "expression_label": "dias_vencidos"},
-                            {
-                                "expression_label": "importe_original",
-                                **self._monetary_col(report, currency_data["subtotal_original"], currency),
-                            },
-                            {
-                                "expression_label": "saldo",
-                                **self._monetary_col(report, currency_data["subtotal_residual"], currency),
-                            },
-                        ],
-                    }
-                )
+    def _get_subtotal_line(self, report, currency_line_id, currency, subtotal_original, subtotal_residual, level, markup):
+        return {
+            "id": report._get_generic_line_id(
+                "res.currency", currency.id, parent_line_id=currency_line_id, markup=markup
+            ),
+            "parent_id": currency_line_id,
+            "name": _("Subtotal"),
+            "level": level,
+            "class": "o_statement_original_currency_subtotal",
+            "columns": [
+                {"name": "", "expression_label": "fecha"},
+                {"name": "", "expression_label": "fecha_vencimiento"},
+                {"name": "", "expression_label": "dias_vencidos"},
+                {
+                    "expression_label": "importe_original",
+                    **self._monetary_col(report, subtotal_original, currency),
+                },
+                {
+                    "expression_label": "saldo",
+                    **self._monetary_col(report, subtotal_residual, currency),
+                },
+            ],
+        }
 
-    def _empty_columns(self):
-        return [{"name": "", "expression_label": expression} for expression in self._COLUMN_EXPRESSIONS]
+    def _empty_columns(self, expressions=None):
+        return [
+            {"name": "", "expression_label": expression} for expression in expressions or self._COLUMN_EXPRESSIONS
+        ]
 
     def _report_custom_engine_outstanding_original_currency(self, *args, **kwargs):
         """Placeholder to expose editable expression rows in report configuration."""
         return {}
 
-    def _get_grouped_moves(self, options):
-        moves = self.env["account.move"].search(
-            self._get_moves_domain(options),
-            order="partner_id, currency_id, invoice_date, id",
-        )
+    def _get_grouped_moves(self, options, extra_domain=None):
+        """Return ``{partner_id: {currency_id: group}}`` of the open moves of ``options``.
 
+        A group holds the currency name, the subtotals and the
+        ``StatementMoveRow`` list of its moves.
+        """
         reference_date = self._get_reference_date(options)
-        partner_currency_map = defaultdict(dict)
-        for move in moves:
-            currency = move.currency_id
-            residual_amount = move.amount_residual
-            if float_is_zero(residual_amount, precision_rounding=currency.rounding):
-                continue
-
-            partner_key = (move.partner_id.id, move.partner_id.name or _("No Partner"))
-            currency_id = currency.id
-            if currency_id not in partner_currency_map[partner_key]:
-                partner_currency_map[partner_key][currency_id] = {
-                    "currency_name": currency.name,
+        partner_currency_map = {}
+        domain = self._get_moves_domain(options) + (extra_domain or [])
+        for row in self._iter_open_move_rows(
+            domain, reference_date=reference_date, as_of_date=self._get_as_of_date(reference_date)
+        ):
+            currency_groups = partner_currency_map.setdefault(row["partner_id"] or False, {})
+            group = currency_groups.get(row["currency_id"])
+            if group is None:
+                group = currency_groups[row["currency_id"]] = {
+                    "currency_name": row["currency_name"],
                     "subtotal_original": 0.0,
                     "subtotal_residual": 0.0,
                     "moves": [],
                 }
 
-            sign = -1 if move.move_type == "out_refund" else 1
-            original_amount = sign * move.amount_total
-            residual_amount = sign * residual_amount
+            move = self._prepare_move_values(row)
+            group["subtotal_original"] += move.original_amount
+            group["subtotal_residual"] += move.residual_amount
+            # Rows already come ordered by invoice date and id, so the moves
+            # list needs no extra sort.
+            group["moves"].append(move)
 
-            partner_currency_map[partner_key][currency_id]["subtotal_original"] += original_amount
-            partner_currency_map[partner_key][currency_id]["subtotal_residual"] += residual_amount
-            partner_currency_map[partner_key][currency_id]["moves"].append(
-                {
-                    "id": move.id,
-                    "invoice_date": move.invoice_date,
-                    "invoice_date_due": move.invoice_date_due,
-                    "display_number": move.fp_consecutive_number or move.name,
-                    "original_amount": original_amount,
-                    "residual_amount": residual_amount,
-                    "days_overdue": self._compute_days_overdue(move.invoice_date_due, reference_date),
-                }
-            )
+        return partner_currency_map
 
-        for partner_data in partner_currency_map.values():
-            for currency_payload in partner_data.values():
-                currency_payload["moves"].sort(
-                    key=lambda move: (move["invoice_date"] or fields.Date.to_date("1900-01-01"), move["id"])
-                )
+    def _prepare_move_values(self, row):
+        sign = -1 if row["move_type"] == "out_refund" else 1
+        return StatementMoveRow(
+            row["id"],
+            row["invoice_date"],
+            row["invoice_date_due"],
+            row["fp_consecutive_number"] or row["name"],
+            sign * row["amount_total"],
+            sign * row["amount_residual"],
+            row["days_overdue"],
+        )
 
-        return partner_currency_map
+    def _get_options_as_of_date(self, options):
+        return self._get_as_of_date(self._get_reference_date(options))
+
+    def _get_as_of_date(self, reference_date):
+        """Return ``reference_date`` when it lies before today, else None.
+
+        A past cutoff needs the residuals as they were on that date; up to
+        today the stored ``amount_residual`` is exact and much cheaper.
+        """
+        if reference_date and reference_date < fields.Date.context_today(self):
+            return reference_date
+        return None
+
+    def _search_open_moves(self, domain, as_of_date=None):
+        """Return the ``_search`` query of the open moves matching ``domain``.
+
+        The predicate of the statement partial index is added on top of the
+        domain: it is already implied by the statement domains, but the ORM
+        renders ``!=`` with an extra ``IS NULL`` branch, which keeps the
+        planner from proving the index applies. At a past ``as_of_date``
+        moves paid since then still count, so only the posted part applies.
+        """
+        self.env["account.move"].flush_model()
+        query = self.env["account.move"]._search(domain)
+        query.add_where(statement_predicate_sql(
+            STATEMENT_POSTED_MOVE_CONDITIONS if as_of_date else STATEMENT_OPEN_MOVE_CONDITIONS, query.table
+        ))
+        return query
+
+    def _search_pending_payment_lines(self, domain, as_of_date=None):
+        """Return the ``_search`` query of the pending payment lines matching ``domain``.
+
+        Same as ``_search_open_moves`` for the payment lines partial index.
+        """
+        self.env["account.move.line"].flush_model()
+        query = self.env["account.move.line"]._search(domain)
+        query.add_where(statement_predicate_sql(
+            STATEMENT_POSTED_PAYMENT_CONDITIONS if as_of_date else STATEMENT_PENDING_PAYMENT_CONDITIONS, query.table
+        ))
+        return query
+
+    def _get_open_move_residual_sql(self, query, as_of_date=None):
+        """Return ``(join, residual)`` SQL giving the unsigned residual of the ``move`` rows of ``query``.
+
+        Without ``as_of_date`` this is the stored ``amount_residual``. At a
+        past date it is rebuilt for all the moves at once, in one grouped
+        query: the receivable (payment term) lines of each move minus the
+        partial reconciliations whose ``max_date`` is on or before the
+        cutoff, so payments and credit notes applied later are ignored.
+        """
+        if not as_of_date:
+            return SQL(), SQL("move.amount_residual")
+        residuals = SQL(
+            """
+            SELECT item.move_id, ABS(SUM(item.amount)) AS amount_residual
+              FROM (
+                    SELECT line.move_id, line.amount_currency AS amount
+                      FROM account_move_line line
+                     WHERE line.move_id IN (%(move_ids)s)
+                       AND line.display_type = 'payment_term'
+
+                 UNION ALL
+
+                    SELECT line.move_id, -partial.debit_amount_currency
+                      FROM account_partial_reconcile partial
+                      JOIN account_move_line line ON line.id = partial.debit_move_id
+                     WHERE line.move_id IN (%(move_ids)s)
+                       AND line.display_type = 'payment_term'
+                       AND partial.max_date <= %(as_of_date)s
+
+                 UNION ALL
+
+                    SELECT line.move_id, partial.credit_amount_currency
+                      FROM account_partial_reconcile partial
+                      JOIN account_move_line line ON line.id = partial.credit_move_id
+                     WHERE line.move_id IN (%(move_ids)s)
+                       AND line.display_type = 'payment_term'
+                       AND partial.max_date <= %(as_of_date)s
+                   ) item
+          GROUP BY item.move_id
+            """,
+            move_ids=query.subselect(),
+            as_of_date=as_of_date,
+        )
+        return SQL("JOIN (%s) as_of ON as_of.move_id = move.id", residuals), SQL("as_of.amount_residual")
+
+    def _fetch_open_move_rows(self, domain, reference_date=None, offset=0, limit=None, as_of_date=None):
+        """Read the statement columns of the moves matching ``domain`` in one query."""
+        self.env.cr.execute(self._get_open_move_rows_sql(domain, reference_date, offset, limit, as_of_date))
+        return self.env.cr.dictfetchall()
+
+    def _iter_open_move_rows(self, domain, reference_date=None, as_of_date=None):
+        """Like ``_fetch_open_move_rows`` without paging, streamed (see ``_stream_rows``)."""
+        return self._stream_rows(self._get_open_move_rows_sql(domain, reference_date, as_of_date=as_of_date))
+
+    def _get_open_move_rows_sql(self, domain, reference_date=None, offset=0, limit=None, as_of_date=None):
+        """SQL selecting the statement columns of the moves matching ``domain``.
+
+        The domain goes through ``_search`` so record rules still apply, but
+        only the columns the statement needs are fetched and no record ever
+        lands in the ORM cache. Rows are ordered by partner,
+        currency, invoice date and id; ``offset``/``limit`` page through them.
+        Moves whose residual rounds to zero in their currency are skipped.
+        ``days_overdue`` is computed by the database at ``reference_date``
+        (today by default); ``amount_residual`` is the one at ``as_of_date``
+        when given (see ``_get_open_move_residual_sql``).
+        """
+        reference_date = reference_date or fields.Date.context_today(self)
+        query = self._search_open_moves(domain, as_of_date)
+        residual_join, residual = self._get_open_move_residual_sql(query, as_of_date)
+        return SQL(
+            """
+            SELECT move.id,
+                   move.partner_id,
+                   partner.name AS partner_name,
+                   move.currency_id,
+                   currency.name AS currency_name,
+                   move.move_type,
+                   move.name,
+                   move.fp_consecutive_number,
+                   move.invoice_date,
+                   move.invoice_date_due,
+                   move.amount_total,
+                   %(residual)s AS amount_residual,
+                   GREATEST(COALESCE(%(reference_date)s - move.invoice_date_due, 0), 0) AS days_overdue
+              FROM account_move move
+                   %(residual_join)s
+              JOIN res_currency currency ON currency.id = move.currency_id
+         LEFT JOIN res_partner partner ON partner.id = move.partner_id
+             WHERE move.id IN (%(move_ids)s)
+               AND ABS(%(residual)s) >= currency.rounding / 2
+          ORDER BY move.partner_id, move.currency_id, move.invoice_date NULLS FIRST, move.id
+             LIMIT %(limit)s
+            OFFSET %(offset)s
+            """,
+            residual=residual,
+            residual_join=residual_join,
+            reference_date=reference_date,
+            move_ids=query.subselect(),
+            limit=limit,
+            offset=offset,
+        )
+
+    def _fetch_open_move_partner_totals(self, domain, as_of_date=None):
+        """Return one row per partner having open moves matching ``domain``."""
+        query = self._search_open_moves(domain, as_of_date)
+        residual_join, residual = self._get_open_move_residual_sql(query, as_of_date)
+        self.env.cr.execute(SQL(
+            """
+            SELECT move.partner_id,
+                   partner.name AS partner_name,
+                   COUNT(*) AS move_count
+              FROM account_move move
+                   %(residual_join)s
+              JOIN res_currency currency ON currency.id = move.currency_id
+         LEFT JOIN res_partner partner ON partner.id = move.partner_id
+             WHERE move.id IN (%(move_ids)s)
+               AND ABS(%(residual)s) >= currency.rounding / 2
+          GROUP BY move.partner_id, partner.name
+            """,
+            residual=residual,
+            residual_join=residual_join,
+            move_ids=query.subselect(),
+        ))
+        return self.env.cr.dictfetchall()
+
+    def _fetch_open_move_currency_totals(self, domain, as_of_date=None):
+        """Return the exact signed original/residual subtotals per currency of ``domain``."""
+        query = self._search_open_moves(domain, as_of_date)
+        residual_join, residual = self._get_open_move_residual_sql(query, as_of_date)
+        self.env.cr.execute(SQL(
+            """
+            SELECT move.currency_id,
+                   currency.name AS currency_name,
+                   SUM(CASE WHEN move.move_type = 'out_refund' THEN -move.amount_total ELSE move.amount_total END)
+                       AS subtotal_original,
+                   SUM(CASE WHEN move.move_type = 'out_refund' THEN -%(residual)s ELSE %(residual)s END)
+                       AS subtotal_residual
+              FROM account_move move
+                   %(residual_join)s
+              JOIN res_currency currency ON currency.id = move.currency_id
+             WHERE move.id IN (%(move_ids)s)
+               AND ABS(%(residual)s) >= currency.rounding / 2
+          GROUP BY move.currency_id, currency.name
+            """,
+            residual=residual,
+            residual_join=residual_join,
+            move_ids=query.subselect(),
+        ))
+        return self.env.cr.dictfetchall()
+
+    def _fetch_open_move_aging_totals(self, domain, reference_date, limits, as_of_date=None):
+        """Return the signed original and residual totals per partner, currency and aging bucket of ``domain``.
+
+        ``limits`` are the three period boundaries in days; bucket keys are
+        the ones of ``res.partner._AGING_BUCKETS``.
+        """
+        query = self._search_open_moves(domain, as_of_date)
+        residual_join, residual = self._get_open_move_residual_sql(query, as_of_date)
+        self.env.cr.execute(SQL(
+            """
+            SELECT move.partner_id,
+                   partner.name AS partner_name,
+                   move.currency_id,
+                   currency.name AS currency_name,
+                   %(bucket)s AS aging_bucket,
+                   COUNT(*) AS move_count,
+                   SUM(CASE WHEN move.move_type = 'out_refund' THEN -move.amount_total ELSE move.amount_total END)
+                       AS original,
+                   SUM(CASE WHEN move.move_type = 'out_refund' THEN -%(residual)s ELSE %(residual)s END)
+                       AS residual
+              FROM account_move move
+                   %(residual_join)s
+              JOIN res_currency currency ON currency.id = move.currency_id
+         LEFT JOIN res_partner partner ON partner.id = move.partner_id
+             WHERE move.id IN (%(move_ids)s)
+               AND ABS(%(residual)s) >= currency.rounding / 2
+          GROUP BY move.partner_id, partner.name, move.currency_id, currency.name, aging_bucket
+            """,
+            bucket=self.env["res.partner"]._statement_aging_bucket_sql(
+                SQL("move.invoice_date_due"), reference_date, limits=limits
+            ),
+            residual=residual,
+            residual_join=residual_join,
+            move_ids=query.subselect(),
+        ))
+        return self.env.cr.dictfetchall()
 
     def _get_reference_date(self, options):
         today = fields.Date.context_today(self)
@@ -390,12 +1183,6 @@ class OutstandingOriginalCurrencyReportHandler(models.AbstractModel):
                 pass
         return today
 
-    def _compute_days_overdue(self, due_date, reference_date):
-        if not due_date:
-            return 0
-        delta = (reference_date - due_date).days
-        return delta if delta > 0 else 0
-
     def _days_col(self, value):
         return {
             "name": str(value) if value else "",
@@ -406,15 +1193,29 @@ class OutstandingOriginalCurrencyReportHandler(models.AbstractModel):
         }
 
     def _get_moves_domain(self, options):
+        """Open moves of the statement, with the threshold/overdue filters of ``options``."""
+        domain = self._get_open_moves_base_domain(options) + self._get_due_date_filter_domain(options)
+        if options.get("statement_min_balance"):
+            query = self._search_open_moves(
+                self._get_open_moves_base_domain(options), self._get_options_as_of_date(options)
+            )
+            query.add_where(self._get_min_balance_condition(
+                options, SQL.identifier(query.table, "partner_id"), SQL.identifier(query.table, "currency_id")
+            ))
+            domain.append(("id", "in", query))
+        return domain
+
+    def _get_open_moves_base_domain(self, options):
         # Outstanding balance is a point-in-time snapshot: include every
         # posted invoice/refund with residual up to the cutoff date, ignoring
         # any lower date bound the UI might provide.
         domain = [
             ("move_type", "in", ("out_invoice", "out_refund")),
             ("state", "=", "posted"),
-            ("amount_residual", "!=", 0.0),
             ("company_id", "in", self.env.companies.ids),
         ]
+        if not self._get_options_as_of_date(options):
+            domain.append(("amount_residual", "!=", 0.0))
 
         date_to = (options.get("date") or {}).get("date_to")
         if date_to:
@@ -429,58 +1230,271 @@ class OutstandingOriginalCurrencyReportHandler(models.AbstractModel):
             domain.append(("partner_id", "in", partner_ids))
         return domain
 
-    def _get_grouped_pending_payments(self, options):
-        pending_lines = self.env["account.move.line"].search(
-            self._get_pending_payment_lines_domain(options),
-            order="partner_id, currency_id, date, id",
-        )
-
-        partner_currency_map = defaultdict(dict)
-        for line in pending_lines:
-            currency = line.currency_id or line.company_currency_id
-            residual_amount = self._get_receivable_residual_amount(line, currency)
-            if float_is_zero(residual_amount, precision_rounding=currency.rounding):
-                continue
-
-            payment_amount = self._get_receivable_original_amount(line, currency)
-            if float_is_zero(payment_amount, precision_rounding=currency.rounding):
-                continue
-
-            partner_key = (line.partner_id.id, line.partner_id.name or _("No Partner"))
-            currency_id = currency.id
-            if currency_id not in partner_currency_map[partner_key]:
-                partner_currency_map[partner_key][currency_id] = {
-                    "currency_name": currency.name,
+    def _get_grouped_pending_payments(self, options, extra_domain=None):
+        """Same as ``_get_grouped_moves`` for the pending payments (``StatementPaymentRow``)."""
+        partner_currency_map = {}
+        domain = self._get_pending_payment_lines_domain(options) + (extra_domain or [])
+        for row in self._iter_pending_payment_rows(domain, as_of_date=self._get_options_as_of_date(options)):
+            currency_groups = partner_currency_map.setdefault(row["partner_id"], {})
+            group = currency_groups.get(row["currency_id"])
+            if group is None:
+                group = currency_groups[row["currency_id"]] = {
+                    "currency_name": row["currency_name"],
                     "subtotal_original": 0.0,
                     "subtotal_residual": 0.0,
                     "payments": [],
                 }
 
-            partner_currency_map[partner_key][currency_id]["subtotal_original"] += payment_amount
-            partner_currency_map[partner_key][currency_id]["subtotal_residual"] += residual_amount
-            partner_currency_map[partner_key][currency_id]["payments"].append(
-                {
-                    "line_id": line.id,
-                    "move_id": line.move_id.id,
-                    "payment_date": line.date,
-                    "display_number": line.payment_id.name or line.move_id.name,
-                    "payment_amount": payment_amount,
-                    "residual_amount": residual_amount,
-                }
-            )
+            payment = self._prepare_payment_values(row)
+            group["subtotal_original"] += payment.payment_amount
+            group["subtotal_residual"] += payment.residual_amount
+            group["payments"].append(payment)
 
         return partner_currency_map
 
+    def _prepare_payment_values(self, row):
+        return StatementPaymentRow(
+            row["id"],
+            row["move_id"],
+            row["date"],
+            row["display_number"],
+            row["payment_amount"],
+            row["residual_amount"],
+        )
+
+    def _get_pending_payment_rows_sql(self, domain, as_of_date=None):
+        """SQL selecting the statement columns of the payment lines matching ``domain``.
+
+        Amounts are expressed in the line currency (company currency when the
+        line has none) and sign-flipped so a payment shows as a positive
+        amount. Lines whose payment amount or residual rounds to zero in that
+        currency are left out. At a past ``as_of_date`` the residual is the
+        line amount minus the partial reconciliations dated on or before it.
+        """
+        query = self._search_pending_payment_lines(domain, as_of_date)
+        if as_of_date:
+            residual_join = SQL(
+                """
+                LEFT JOIN (
+                    SELECT item.line_id,
+                           SUM(item.amount_currency) AS amount_currency,
+                           SUM(item.amount) AS amount
+                      FROM (
+                            SELECT partial.credit_move_id AS line_id,
+                                   partial.credit_amount_currency AS amount_currency,
+                                   partial.amount
+                              FROM account_partial_reconcile partial
+                             WHERE partial.credit_move_id IN (%(line_ids)s)
+                               AND partial.max_date <= %(as_of_date)s
+
+                         UNION ALL
+
+                            SELECT partial.debit_move_id, -partial.debit_amount_currency, -partial.amount
+                              FROM account_partial_reconcile partial
+                             WHERE partial.debit_move_id IN (%(line_ids)s)
+                               AND partial.max_date <= %(as_of_date)s
+                           ) item
+                  GROUP BY item.line_id
+                ) as_of ON as_of.line_id = line.id
+                """,
+                line_ids=query.subselect(),
+                as_of_date=as_of_date,
+            )
+            residual = SQL(
+                """
+                CASE WHEN line.currency_id IS NOT NULL THEN line.amount_currency + COALESCE(as_of.amount_currency, 0)
+                     ELSE line.balance + COALESCE(as_of.amount, 0) END
+                """
+            )
+        else:
+            residual_join = SQL()
+            residual = SQL(
+                """
+                CASE WHEN line.currency_id IS NOT NULL THEN line.amount_residual_currency
+                     ELSE line.amount_residual END
+                """
+            )
+        return SQL(
+            """
+            SELECT line.id,
+                   line.move_id,
+                   line.partner_id,
+                   partner.name AS partner_name,
+                   currency.id AS currency_id,
+                   currency.name AS currency_name,
+                   line.date,
+                   COALESCE(NULLIF(payment.name, ''), move.name) AS display_number,
+                   CASE WHEN line.currency_id IS NOT NULL THEN -line.amount_currency ELSE -line.balance END
+                       AS payment_amount,
+                   -(%(residual)s) AS residual_amount
+              FROM account_move_line line
+                   %(residual_join)s
+              JOIN account_move move ON move.id = line.move_id
+              JOIN res_company company ON company.id = line.company_id
+              JOIN res_currency currency ON currency.id = COALESCE(line.currency_id, company.currency_id)
+              JOIN res_partner partner ON partner.id = line.partner_id
+         LEFT JOIN account_payment payment ON payment.id = line.payment_id
+             WHERE line.id IN (%(line_ids)s)
+               AND ABS(CASE WHEN line.currency_id IS NOT NULL THEN line.amount_currency ELSE line.balance END)
+                   >= currency.rounding / 2
+               AND ABS(%(residual)s) >= currency.rounding / 2
+            """,
+            residual=residual,
+            residual_join=residual_join,
+            line_ids=query.subselect(),
+        )
+
+    def _fetch_pending_payment_rows(self, domain, currency_id=None, offset=0, limit=None, as_of_date=None):
+        """Read the pending payment lines of ``domain`` ordered by partner, currency, date and id."""
+        self.env.cr.execute(self._get_ordered_pending_payment_rows_sql(domain, currency_id, offset, limit, as_of_date))
+        return self.env.cr.dictfetchall()
+
+    def _iter_pending_payment_rows(self, domain, as_of_date=None):
+        """Like ``_fetch_pending_payment_rows`` without paging, streamed (see ``_stream_rows``)."""
+        return self._stream_rows(self._get_ordered_pending_payment_rows_sql(domain, as_of_date=as_of_date))
+
+    def _get_ordered_pending_payment_rows_sql(self, domain, currency_id=None, offset=0, limit=None, as_of_date=None):
+        return SQL(
+            """
+            SELECT *
+              FROM (%s) pending
+             WHERE %s
+          ORDER BY pending.partner_id, pending.currency_id, pending.date, pending.id
+             LIMIT %s
+            OFFSET %s
+            """,
+            self._get_pending_payment_rows_sql(domain, as_of_date),
+            SQL("pending.currency_id = %s", currency_id) if currency_id else SQL("TRUE"),
+            limit,
+            offset,
+        )
+
+    def _stream_rows(self, query):
+        """Yield the dict rows of ``query`` through a server-side cursor.
+
+        ``dictfetchall`` on the whole ledger keeps every row twice (the
+        driver tuples and the dicts) until the caller is done; here only
+        ``STATEMENT_FETCH_BATCH_SIZE`` raw rows are in memory at a time.
+        What the consumer keeps of them is up to it: the XLSX export
+        writes each row out, the unfold_all groups keep one chunk of
+        partners, a statement keeps the rows of its partners.
+        Other queries may run on the cursor between two rows. The cursor
+        belongs to the transaction: a consumer stopping early simply leaves
+        it to be dropped at commit or rollback.
+        """
+        cr = self.env.cr
+        cursor_name = SQL.identifier(f"statement_rows_{next(_STREAM_CURSOR_IDS)}")
+        cr.execute(SQL("DECLARE %s NO SCROLL CURSOR FOR %s", cursor_name, query))
+        while True:
+            cr.execute(SQL("FETCH FORWARD %s FROM %s", STATEMENT_FETCH_BATCH_SIZE, cursor_name))
+            rows = cr.dictfetchall()
+            yield from rows
+            if len(rows) < STATEMENT_FETCH_BATCH_SIZE:
+                break
+        cr.execute(SQL("CLOSE %s", cursor_name))
+
+    def _fetch_pending_payment_partner_totals(self, domain, as_of_date=None):
+        """Return one row per partner having unreconciled payment lines matching ``domain``."""
+        self.env.cr.execute(SQL(
+            """
+            SELECT pending.partner_id,
+                   pending.partner_name,
+                   COUNT(*) AS line_count
+              FROM (%s) pending
+          GROUP BY pending.partner_id, pending.partner_name
+            """,
+            self._get_pending_payment_rows_sql(domain, as_of_date),
+        ))
+        return self.env.cr.dictfetchall()
+
+    def _fetch_pending_payment_currency_totals(self, domain, as_of_date=None):
+        """Return the exact payment/residual subtotals per currency of ``domain``."""
+        self.env.cr.execute(SQL(
+            """
+            SELECT pending.currency_id,
+                   pending.currency_name,
+                   SUM(pending.payment_amount) AS subtotal_original,
+                   SUM(pending.residual_amount) AS subtotal_residual
+              FROM (%s) pending
+          GROUP BY pending.currency_id, pending.currency_name
+            """,
+            self._get_pending_payment_rows_sql(domain, as_of_date),
+        ))
+        return self.env.cr.dictfetchall()
+
+    def _fetch_pending_payment_partner_currency_totals(self, domain, as_of_date=None):
+        """Return the payment/residual totals per partner and currency of ``domain``."""
+        self.env.cr.execute(SQL(
+            """
+            SELECT pending.partner_id,
+                   pending.partner_name,
+                   pending.currency_id,
+                   pending.currency_name,
+                   SUM(pending.payment_amount) AS subtotal_original,
+                   SUM(pending.residual_amount) AS subtotal_residual
+              FROM (%s) pending
+          GROUP BY pending.partner_id, pending.partner_name, pending.currency_id, pending.currency_name
+            """,
+            self._get_pending_payment_rows_sql(domain, as_of_date),
+        ))
+        return self.env.cr.dictfetchall()
+
     def _get_pending_payment_lines_domain(self, options):
+        """Pending payment lines of the statement, restricted by the filters of ``options``.
+
+        Days overdue and aging buckets select invoices; the payments are
+        then those of the partners having such invoices.
+        """
+        domain = self._get_pending_payment_lines_base_domain(options)
+        due_date_domain = self._get_due_date_filter_domain(options)
+        if not options.get("statement_min_balance") and not due_date_domain:
+            return domain
+
+        as_of_date = self._get_options_as_of_date(options)
+        query = self._search_pending_payment_lines(self._get_pending_payment_lines_base_domain(options), as_of_date)
+        if options.get("statement_min_balance"):
+            currency_sql = SQL(
+                "COALESCE(%s, (SELECT company.currency_id FROM res_company company WHERE company.id = %s))",
+                SQL.identifier(query.table, "currency_id"),
+                SQL.identifier(query.table, "company_id"),
+            )
+            query.add_where(self._get_min_balance_condition(
+                options, SQL.identifier(query.table, "partner_id"), currency_sql
+            ))
+        if due_date_domain:
+            moves = self._search_open_moves(self._get_moves_domain(options), as_of_date)
+            residual_join, residual = self._get_open_move_residual_sql(moves, as_of_date)
+            query.add_where(SQL(
+                """
+                %(partner)s IN (
+                    SELECT move.partner_id
+                      FROM account_move move
+                           %(residual_join)s
+                     WHERE move.id IN (%(move_ids)s)
+                       AND %(residual)s <> 0
+                )
+                """,
+                partner=SQL.identifier(query.table, "partner_id"),
+                residual_join=residual_join,
+                move_ids=moves.subselect(),
+                residual=residual,
+            ))
+        domain.append(("id", "in", query))
+        return domain
+
+    def _get_pending_payment_lines_base_domain(self, options):
         domain = [
             ("account_id.account_type", "=", "asset_receivable"),
             ("parent_state", "=", "posted"),
             ("payment_id", "!=", False),
-            ("reconciled", "=", False),
             ("partner_id", "!=", False),
             ("company_id", "in", self.env.companies.ids),
-            ("amount_residual", "<", 0.0),
         ]
+        if self._get_options_as_of_date(options):
+            # Lines reconciled since the cutoff were still pending on it.
+            domain.append(("balance", "<", 0.0))
+        else:
+            domain += [("reconciled", "=", False), ("amount_residual", "<", 0.0)]
 
         date_to = (options.get("date") or {}).get("date_to")
         if date_to:
@@ -495,6 +1509,80 @@ class OutstandingOriginalCurrencyReportHandler(models.AbstractModel):
             domain.append(("partner_id", "in", partner_ids))
         return domain
 
+    def _get_due_date_filter_domain(self, options):
+        """Due date predicates for the minimum days overdue and aging bucket options."""
+        reference_date = self._get_reference_date(options)
+        domain = []
+        min_days_overdue = options.get("statement_min_days_overdue")
+        if min_days_overdue:
+            domain.append(("invoice_date_due", "<=", reference_date - timedelta(days=min_days_overdue)))
+
+        buckets = options.get("statement_aging_buckets")
+        if buckets:
+            # Same boundaries as res.partner._statement_aging_bucket_sql, as due date ranges.
+            period_1, period_2, period_3 = self.env.company._get_statement_aging_limits()
+
+            def due_between(min_days, max_days):
+                return [
+                    "&",
+                    ("invoice_date_due", ">=", reference_date - timedelta(days=max_days)),
+                    ("invoice_date_due", "<=", reference_date - timedelta(days=min_days)),
+                ]
+
+            bucket_domains = {
+                "current": ["|", ("invoice_date_due", "=", False), ("invoice_date_due", ">=", reference_date)],
+                "period_1": due_between(1, period_1),
+                "period_2": due_between(period_1 + 1, period_2),
+                "period_3": due_between(period_2 + 1, period_3),
+                "older": [("invoice_date_due", "<", reference_date - timedelta(days=period_3))],
+            }
+            domain += ["|"] * (len(buckets) - 1)
+            for bucket in buckets:
+                domain += bucket_domains[bucket]
+        return domain
+
+    def _get_min_balance_condition(self, options, partner_sql, currency_sql):
+        """SQL condition keeping the partner/currency pairs whose net balance reaches the minimum.
+
+        The net balance (open invoices minus pending payments) is aggregated
+        and filtered with HAVING in the database, before any row is loaded.
+        """
+        as_of_date = self._get_options_as_of_date(options)
+        open_moves = self._search_open_moves(self._get_open_moves_base_domain(options), as_of_date)
+        residual_join, residual = self._get_open_move_residual_sql(open_moves, as_of_date)
+        return SQL(
+            """
+            (%(partner)s, %(currency)s) IN (
+                SELECT item.partner_id, item.currency_id
+                  FROM (
+                        SELECT move.partner_id,
+                               move.currency_id,
+                               CASE WHEN move.move_type = 'out_refund' THEN -%(residual)s
+                                    ELSE %(residual)s END AS amount
+                          FROM account_move move
+                               %(residual_join)s
+                         WHERE move.id IN (%(move_ids)s)
+
+                     UNION ALL
+
+                        SELECT pending.partner_id, pending.currency_id, -pending.residual_amount
+                          FROM (%(pending)s) pending
+                       ) item
+              GROUP BY item.partner_id, item.currency_id
+                HAVING SUM(item.amount) >= %(min_balance)s
+            )
+            """,
+            partner=partner_sql,
+            currency=currency_sql,
+            residual=residual,
+            residual_join=residual_join,
+            move_ids=open_moves.subselect(),
+            pending=self._get_pending_payment_rows_sql(
+                self._get_pending_payment_lines_base_domain(options), as_of_date
+            ),
+            min_balance=options["statement_min_balance"],
+        )
+
     def _get_selected_journal_ids(self, options):
         return [
             journal.get("id")
@@ -502,16 +1590,6 @@ class OutstandingOriginalCurrencyReportHandler(models.AbstractModel):
             if journal.get("id") and journal.get("selected")
         ]
 
-    def _get_receivable_original_amount(self, line, currency):
-        if line.currency_id:
-            return -line.amount_currency
-        return -line.balance
-
-    def _get_receivable_residual_amount(self, line, currency):
-        if line.currency_id:
-            return -line.amount_residual_currency
-        return -line.amount_residual
-
     def _extract_partner_ids(self, options):
         partner_ids = options.get("partner_ids") or []
         if isinstance(partner_ids, str):
@@ -553,7 +1631,7 @@ class OutstandingOriginalCurrencyReportHandler(models.AbstractModel):
     def _monetary_col(self, report, amount, currency):
         amount = currency.round(amount or 0.0)
         return {
-            "name": formatLang(self.env, amount, currency_obj=currency),
+            "name": statement_amount_formatter(self.env, currency)(amount),
             "no_format": amount,
             "figure_type": "monetary",
             "currency_id": currency.id,
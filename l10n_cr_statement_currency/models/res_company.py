@@ -0,0 +1,59 @@
+from odoo import _, api, fields, models
+from odoo.exceptions import ValidationError
+
+
+class ResCompany(models.Model):
+    _inherit = "res.company"
+
+    _STATEMENT_AGING_FIELDS = ("statement_aging_period_1", "statement_aging_period_2", "statement_aging_period_3")
+
+    statement_aging_period_1 = fields.Integer(
+        string="Antigüedad: fin del periodo 1 (días)",
+        default=30,
+        help="Last day overdue of the first aging bucket of the customer statement.",
+    )
+    statement_aging_period_2 = fields.Integer(
+        string="Antigüedad: fin del periodo 2 (días)",
+        default=60,
+        help="Last day overdue of the second aging bucket of the customer statement.",
+    )
+    statement_aging_period_3 = fields.Integer(
+        string="Antigüedad: fin del periodo 3 (días)",
+        default=90,
+        help="Last day overdue of the third aging bucket; anything older falls in the last bucket.",
+    )
+    statement_balance_outdated = fields.Boolean(
+        string="Saldos abiertos desactualizados",
+        copy=False,
+        help="The aging periods changed and the open balance summary waits for its refresh run.",
+    )
+
+    @api.constrains(*_STATEMENT_AGING_FIELDS)
+    def _check_statement_aging_periods(self):
+        for company in self:
+            period_1, period_2, period_3 = company._get_statement_aging_limits()
+            if not 0 < period_1 < period_2 < period_3:
+                raise ValidationError(
+                    _("Los periodos de antigüedad del estado de cuenta deben ser positivos y crecientes.")
+                )
+
+    def write(self, vals):
+        aging_changed = any(field in vals for field in self._STATEMENT_AGING_FIELDS)
+        if aging_changed:
+            # Summary rows store their bucket, so new periods need a rebuild.
+            # The report reads the ledger until the refresh run is done; the
+            # run is planned by the rebuild cron, not in this transaction.
+            vals = dict(vals, statement_balance_outdated=True)
+        res = super().write(vals)
+        if aging_changed:
+            self.env.ref("l10n_cr_statement_currency.ir_cron_statement_open_balance_rebuild")._trigger()
+        return res
+
+    def _get_statement_aging_limits(self):
+        """Return the three aging boundaries, in days, as a tuple."""
+        self.ensure_one()
+        return (
+            self.statement_aging_period_1,
+            self.statement_aging_period_2,
+            self.statement_aging_period_3,
+        )
@@ -0,0 +1,13 @@
+from odoo import models
+
+from .statement_formatter import clear_statement_amount_formatters
+
+
+class ResCurrency(models.Model):
+    _inherit = "res.currency"
+
+    def write(self, vals):
+        res = super().write(vals)
+        # Statement amount formatters hold the digits, the symbol and its position.
+        clear_statement_amount_formatters(self.env)
+        return res
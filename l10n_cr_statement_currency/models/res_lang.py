@@ -0,0 +1,13 @@
+from odoo import models
+
+from .statement_formatter import clear_statement_amount_formatters
+
+
+class ResLang(models.Model):
+    _inherit = "res.lang"
+
+    def write(self, vals):
+        res = super().write(vals)
+        # Statement amount formatters hold the grouping and the separators.
+        clear_statement_amount_formatters(self.env)
+        return res
@@ -1,9 +1,16 @@
 import base64
+import hashlib
 import json
 
-from odoo import _, fields, models
-from odoo.tools import float_is_zero
-from odoo.tools.misc import formatLang
+from markupsafe import Markup, escape
+
+from odoo import _, api, fields, models
+from odoo.exceptions import UserError
+from odoo.tools import SQL
+
+from .statement_formatter import statement_amount_formatter
+from .statement_instrumentation import StatementInstrumentation
+from .statement_rows import StatementInvoiceRow, StatementPendingPaymentRow
 
 
 class ResPartner(models.Model):
@@ -12,6 +19,16 @@ class ResPartner(models.Model):
     statement_email = fields.Char(string="Correo para estados de cuenta")
     statement_email_cc = fields.Char(string="CC para estados de cuenta")
 
+    def write(self, vals):
+        res = super().write(vals)
+        # Cached statement lines show the name of the partners with receivable lines.
+        if "name" in vals and self.env["account.move.line"].sudo().search_count([
+            ("partner_id", "in", self.ids),
+            ("account_id.account_type", "=", "asset_receivable"),
+        ], limit=1):
+            self.env["statement.open.balance"]._mark_ledger_changed()
+        return res
+
     # ------------------------------------------------------------------
     # Dynamic report (account_reports) entry point
     # ------------------------------------------------------------------
@@ -71,6 +88,81 @@ class ResPartner(models.Model):
         })
         return recipients
 
+    def _check_statement_target_emails(self):
+        self.ensure_one()
+        if not self._get_statement_target_emails()["email_to"]:
+            raise UserError(_('El contacto no tiene configurado un correo en "Correo para estados de cuenta".'))
+
+    def _get_statement_mail_defaults(self):
+        self.ensure_one()
+        return {
+            "subject": _("Estado de cuenta - %(partner)s") % {"partner": self.name},
+            "body": _(
+                """
+                <p>Dear Sir or Madam, %(partner)s,</p>
+                <p>Please find attached your account statement. If you have any questions, please do not hesitate to contact us.</p>
+                <p>Best regards.</p>
+                """
+            )
+            % {"partner": self.name},
+        }
+
+    def _send_statement_email(self, subject, body):
+        """Render the statement, email it to the statement recipients and log it in the chatter."""
+        self.ensure_one()
+        targets = self._get_statement_target_emails()
+        attachment = self._render_statement_report_pdf()
+        mail = self.env["mail.mail"].create(
+            {
+                "subject": subject,
+                "body_html": body or "",
+                "email_to": targets["email_to"],
+                "email_cc": targets["email_cc"],
+                "attachment_ids": [(4, attachment.id)],
+                "auto_delete": False,
+            }
+        )
+        mail.send()
+        chatter_body = Markup(
+            "<p>%s</p>"
+            "<ul>"
+            "<li><strong>%s</strong> %s</li>"
+            "<li><strong>%s</strong> %s</li>"
+            "<li><strong>%s</strong> %s</li>"
+            "</ul>"
+        ) % (
+            escape(_("Se envió un estado de cuenta por correo electrónico.")),
+            escape(_("Para:")),
+            escape(targets["email_to"] or "-"),
+            escape(_("CC:")),
+            escape(targets["email_cc"] or "-"),
+            escape(_("Asunto:")),
+            escape(subject or "-"),
+        )
+        self.message_post(
+            body=chatter_body,
+            body_is_html=True,
+            attachment_ids=[attachment.id],
+            message_type="comment",
+            subtype_xmlid="mail.mt_note",
+        )
+        return mail
+
+    def action_enqueue_statement_mailing(self):
+        """Queue one statement email per selected partner for the mailing cron."""
+        jobs = self.env["statement.send.job"]._enqueue_partners(self)
+        return {
+            "type": "ir.actions.client",
+            "tag": "display_notification",
+            "params": {
+                "type": "success" if jobs else "warning",
+                "message": _("%(count)s estados de cuenta en cola de envío.") % {"count": len(jobs)},
+                "next": self.env["ir.actions.actions"]._for_xml_id(
+                    "l10n_cr_statement_currency.action_statement_send_job"
+                ),
+            },
+        }
+
     def action_send_statement_wizard(self):
         self.ensure_one()
         return {
@@ -85,10 +177,15 @@ class ResPartner(models.Model):
         }
 
     def action_print_statement_pdf(self):
+        """Download the stored statement PDF when it is still current, else render and store it."""
         self.ensure_one()
-        return self.env.ref(
-            "l10n_cr_statement_currency.action_partner_statement_pdf"
-        ).report_action(self)
+        # The lookup and the render share one preparation of the data.
+        attachment = self._render_statement_report_pdf()
+        return {
+            "type": "ir.actions.act_url",
+            "url": f"/web/content/{attachment.id}?download=true",
+            "target": "download",
+        }
 
     # ------------------------------------------------------------------
     # PDF rendering (QWeb)
@@ -102,14 +199,43 @@ class ResPartner(models.Model):
             "date": today,
         }
 
-    def _render_statement_report_pdf(self):
+    def _render_statement_report_pdf(self, data=None, prerendered=False):
+        """Return the statement PDF attachment, reusing an identical earlier render.
+
+        The rendered file is keyed by a fingerprint of everything the PDF
+        shows, so resends and re-prints of an unchanged statement skip
+        wkhtmltopdf and do not store duplicate attachments. ``data`` spares
+        the preparation when the caller already has it (batch pre-render);
+        ``prerendered`` flags files made ahead of time by the nightly cron.
+        """
         self.ensure_one()
+        instrumentation = StatementInstrumentation(self.env, "partner_statement_pdf")
+        partner = self.with_company(self.company_id)
+        with instrumentation.stage("prepare_data") as counts:
+            data = data or partner._prepare_statement_data()
+            counts["invoices"] = sum(len(entry["invoices"]) for entry in data["by_currency"])
+            counts["pending_payments"] = sum(len(entry["pending_payments"]) for entry in data["by_currency"])
+        with instrumentation.stage("cache_lookup") as counts:
+            fingerprint = partner._statement_fingerprint(data)
+            attachment = partner._get_current_statement_attachments({self.id: data}).get(self.id)
+            counts["hit"] = bool(attachment)
+        if attachment:
+            instrumentation.log(partner_id=self.id)
+            return attachment
+
         report_xmlid = "l10n_cr_statement_currency.action_partner_statement_pdf"
-        pdf_content, _content_type = (
-            self.env["ir.actions.report"]
-            .with_company(self.company_id)
-            ._render_qweb_pdf(report_xmlid, res_ids=self.ids)
-        )
+        with instrumentation.stage("render") as counts:
+            pdf_content, _content_type = (
+                self.env["ir.actions.report"]
+                .with_company(self.company_id)
+                ._render_qweb_pdf(
+                    report_xmlid,
+                    res_ids=self.ids,
+                    data={"statement_data_by_partner": {self.id: data}},
+                )
+            )
+            counts["bytes"] = len(pdf_content)
+        instrumentation.log(partner_id=self.id)
         attachment = self.env["ir.attachment"].create(
             {
                 "name": self._get_statement_pdf_filename(),
@@ -118,18 +244,133 @@ class ResPartner(models.Model):
                 "mimetype": "application/pdf",
                 "res_model": "res.partner",
                 "res_id": self.id,
-                "company_id": self.company_id.id,
+                "company_id": data["company"].id,
+                "statement_fingerprint": fingerprint,
+                "statement_prerendered": prerendered,
             }
         )
         return attachment
 
+    def _get_current_statement_attachments(self, data_by_partner):
+        """Return ``{partner_id: attachment}`` for the stored PDFs still matching ``data_by_partner``.
+
+        A stored statement is current when its fingerprint equals the one of
+        the freshly prepared data; one search covers all the partners.
+        """
+        fingerprints = {partner.id: partner._statement_fingerprint(data_by_partner[partner.id]) for partner in self}
+        attachments = self.env["ir.attachment"].search([
+            ("res_model", "=", "res.partner"),
+            ("res_id", "in", self.ids),
+            ("statement_fingerprint", "in", list(fingerprints.values())),
+        ])
+        return {
+            attachment.res_id: attachment
+            for attachment in attachments
+            if fingerprints[attachment.res_id] == attachment.statement_fingerprint
+        }
+
+    # ------------------------------------------------------------------
+    # Nightly pre-rendering
+    # ------------------------------------------------------------------
+    @api.model
+    def _cron_prerender_statements(self):
+        """Render overnight the statement of every partner with an open balance.
+
+        Prints, mailings and toolbar exports of the day then find a current
+        PDF (same fingerprint) and skip wkhtmltopdf. The cutoff date is part
+        of the fingerprint, so every statement is rendered again each night;
+        the previous pre-renders are dropped. The work is split into partner
+        shards shared by the batch worker crons.
+        """
+        for company in self.env["res.company"].search([]):
+            self.env["statement.batch.run"]._start("prerender", company)
+
+    def _prerender_statements(self):
+        """Pre-render the statements of ``self`` in their language and drop the outdated pre-renders.
+
+        Each company has its own run, so only the pre-renders of the current
+        company are outdated here: shared partners keep those of the others.
+        """
+        current = self.env["ir.attachment"]
+        for lang, partners in self.grouped(lambda partner: partner.lang or self.env.lang).items():
+            partners = partners.with_context(lang=lang)
+            data_by_partner = partners._prepare_statement_data_batch()
+            for partner in partners:
+                current |= partner._render_statement_report_pdf(data=data_by_partner[partner.id], prerendered=True)
+
+        outdated = self.env["ir.attachment"].search([
+            ("res_model", "=", "res.partner"),
+            ("res_id", "in", self.ids),
+            ("statement_prerendered", "=", True),
+            ("company_id", "=", self.env.company.id),
+            ("id", "not in", current.ids),
+        ])
+        # Pre-renders that went out by mail belong to the chatter now.
+        sent = self.env["mail.message"].search([("attachment_ids", "in", outdated.ids)]).attachment_ids
+        (outdated - sent).unlink()
+
+    def _statement_template_version(self):
+        """Identify the statement templates currently installed."""
+        views = self.env["ir.ui.view"].sudo().browse([
+            self.env.ref(xmlid).id
+            for xmlid in (
+                "l10n_cr_statement_currency.statement_layout",
+                "l10n_cr_statement_currency.statement_document",
+                "l10n_cr_statement_currency.statement_report_main",
+            )
+        ])
+        return [
+            self.env["ir.module.module"].sudo()._get("l10n_cr_statement_currency").latest_version,
+            max(views.mapped("write_date")),
+        ]
+
+    def _statement_fingerprint(self, data):
+        """Hash the statement content: cutoff, lines, balances, lang, headers and template."""
+        self.ensure_one()
+        company = data["company"]
+        payload = {
+            "cutoff_date": data["cutoff_date"],
+            "lang": self.env.lang,
+            "template": self._statement_template_version(),
+            "partner": [self.id, self.write_date],
+            "company": [company.id, company.write_date, company.partner_id.write_date],
+            "currencies": [
+                {
+                    "currency_id": entry["currency"].id,
+                    "invoices": [
+                        [
+                            invoice["id"],
+                            invoice["number"],
+                            invoice["invoice_date"],
+                            invoice["invoice_date_due"],
+                            invoice["original_amount"],
+                            invoice["residual_amount"],
+                        ]
+                        for invoice in entry["invoices"]
+                    ],
+                    "pending_payments": [
+                        [
+                            payment["line_id"],
+                            payment["number"],
+                            payment["payment_date"],
+                            payment["original_amount"],
+                            payment["residual_amount"],
+                        ]
+                        for payment in entry["pending_payments"]
+                    ],
+                }
+                for entry in data["by_currency"]
+            ],
+        }
+        return hashlib.sha256(json.dumps(payload, default=str, sort_keys=True).encode()).hexdigest()
+
     # ------------------------------------------------------------------
     # Data preparation for the QWeb PDF
     # ------------------------------------------------------------------
-    _AGING_BUCKETS = ("current", "b1_30", "b31_60", "b61_90", "b90_plus")
+    _AGING_BUCKETS = ("current", "period_1", "period_2", "period_3", "older")
 
     def _statement_format_amount(self, amount, currency):
-        """Format a monetary value stripping the NBSP that formatLang emits.
+        """Format a monetary value like formatLang, with ASCII spaces instead of NBSP.
 
         Some wkhtmltopdf builds (including Cloudpepper's) treat the generated
         HTML as Latin-1 even when UTF-8 is declared, which turns the non
@@ -137,78 +378,120 @@ class ResPartner(models.Model):
         literal glyph "Â". Use a regular ASCII space instead so the output
         is safe across rendering stacks.
         """
-        formatted = formatLang(self.env, amount or 0.0, currency_obj=currency)
-        return formatted.replace("\u00a0", " ") if isinstance(formatted, str) else formatted
+        return self._statement_amount_formatter(currency)(amount)
 
-    def _prepare_statement_data(self, cutoff_date=None):
+    def _statement_amount_formatter(self, currency):
+        """The compiled formatter behind ``_statement_format_amount``, shared by the rows of ``currency``."""
+        return statement_amount_formatter(self.env, currency, ascii_space=True)
+
+    def _prepare_statement_data(self, cutoff_date=None, summary_only=False):
         """Return the dict consumed by the QWeb statement template."""
         self.ensure_one()
+        return self._prepare_statement_data_batch(cutoff_date, summary_only=summary_only)[self.id]
+
+    def _prepare_statement_data_batch(self, cutoff_date=None, summary_only=False):
+        """Return ``{partner_id: statement data}`` for every partner in ``self``.
+
+        Open invoices and pending payments of all the partners are read with
+        one query each, so multi-partner PDF renders run a fixed number of
+        queries no matter how many partners they include. With
+        ``summary_only`` only the per-currency totals and aging are computed,
+        from grouped queries: the ``invoices`` and ``pending_payments`` lists
+        stay empty.
+        """
         cutoff_date = (
             cutoff_date
             or self.env.context.get("statement_cutoff_date")
             or fields.Date.context_today(self)
         )
         company = self.env.company
+        aging_limits = company._get_statement_aging_limits()
+        handler = self.env["account.outstanding.original.currency.report.handler"]
 
-        invoices = self.env["account.move"].search(
-            self._statement_invoice_domain(cutoff_date),
-            order="invoice_date, id",
-        )
-        pending_lines = self.env["account.move.line"].search(
-            self._statement_pending_payment_domain(cutoff_date),
-            order="date, id",
+        # Residuals of a past cutoff are rebuilt from the reconciliations dated up to it.
+        as_of_date = handler._get_as_of_date(fields.Date.to_date(cutoff_date))
+        invoice_domain = self._statement_invoice_domain(cutoff_date)
+        payment_domain = self._statement_pending_payment_domain(cutoff_date)
+        invoice_rows, payment_rows, payment_totals = [], [], []
+        aging_rows = handler._fetch_open_move_aging_totals(
+            invoice_domain, cutoff_date, aging_limits, as_of_date=as_of_date
+        ) if self else []
+        if self and summary_only:
+            payment_totals = handler._fetch_pending_payment_partner_currency_totals(
+                payment_domain, as_of_date=as_of_date
+            )
+        elif self:
+            # Streamed: each row becomes a slotted row as it arrives, the raw
+            # result set is never held as a whole.
+            invoice_rows = handler._iter_open_move_rows(
+                invoice_domain, reference_date=cutoff_date, as_of_date=as_of_date
+            )
+            payment_rows = handler._iter_pending_payment_rows(payment_domain, as_of_date=as_of_date)
+        # Invoice currencies are those of the aging rows; a currency only
+        # found on pending payments is browsed when its first row arrives.
+        currencies = self.env["res.currency"].browse(
+            {row["currency_id"] for row in aging_rows} | {row["currency_id"] for row in payment_totals}
         )
+        currency_by_id = {currency.id: currency for currency in currencies}
+        by_partner = {partner_id: {} for partner_id in self.ids}
 
-        by_currency = {}
+        for row in invoice_rows:
+            currency = currency_by_id[row["currency_id"]]
+            sign = -1 if row["move_type"] == "out_refund" else 1
+            original_amount = sign * row["amount_total"]
+            residual_amount = sign * row["amount_residual"]
 
-        for move in invoices:
-            currency = move.currency_id
-            residual = move.amount_residual
-            if float_is_zero(residual, precision_rounding=currency.rounding):
-                continue
-            sign = -1 if move.move_type == "out_refund" else 1
-            original_amount = sign * move.amount_total
-            residual_amount = sign * residual
-            days_overdue = self._statement_days_overdue(move.invoice_date_due, cutoff_date)
-
-            entry = self._statement_currency_entry(by_currency, currency)
+            entry = self._statement_currency_entry(by_partner[row["partner_id"]], currency)
             entry["invoices"].append(
-                {
-                    "number": move.fp_consecutive_number or move.name,
-                    "invoice_date": move.invoice_date,
-                    "invoice_date_due": move.invoice_date_due,
-                    "days_overdue": days_overdue,
-                    "original_amount": original_amount,
-                    "residual_amount": residual_amount,
-                    "original_formatted": self._statement_format_amount(original_amount, currency),
-                    "residual_formatted": self._statement_format_amount(residual_amount, currency),
-                }
+                StatementInvoiceRow(
+                    row["id"],
+                    row["fp_consecutive_number"] or row["name"],
+                    row["invoice_date"],
+                    row["invoice_date_due"],
+                    row["days_overdue"],
+                    original_amount,
+                    residual_amount,
+                    self._statement_amount_formatter(currency),
+                )
             )
             entry["subtotal_original"] += original_amount
             entry["subtotal_balance"] += residual_amount
-            bucket = self._statement_aging_bucket(days_overdue)
-            entry["aging"][bucket] += residual_amount
 
-        for line in pending_lines:
-            currency = line.currency_id or line.company_currency_id
-            payment_amount = -(line.amount_currency if line.currency_id else line.balance)
-            residual_amount = -(line.amount_residual_currency if line.currency_id else line.amount_residual)
-            if float_is_zero(residual_amount, precision_rounding=currency.rounding):
-                continue
+        for row in aging_rows:
+            entry = self._statement_currency_entry(by_partner[row["partner_id"]], currency_by_id[row["currency_id"]])
+            entry["aging"][row["aging_bucket"]] = row["residual"]
+            if summary_only:
+                entry["subtotal_original"] += row["original"]
+                entry["subtotal_balance"] += row["residual"]
+
+        for row in payment_totals:
+            entry = self._statement_currency_entry(by_partner[row["partner_id"]], currency_by_id[row["currency_id"]])
+            entry["pending_balance"] += row["subtotal_residual"]
+
+        for row in payment_rows:
+            currency = currency_by_id.get(row["currency_id"]) or self.env["res.currency"].browse(row["currency_id"])
+            payment_amount = row["payment_amount"]
+            residual_amount = row["residual_amount"]
 
-            entry = self._statement_currency_entry(by_currency, currency)
+            entry = self._statement_currency_entry(by_partner[row["partner_id"]], currency)
             entry["pending_payments"].append(
-                {
-                    "number": line.payment_id.name or line.move_id.name,
-                    "payment_date": line.date,
-                    "original_amount": payment_amount,
-                    "residual_amount": residual_amount,
-                    "original_formatted": self._statement_format_amount(payment_amount, currency),
-                    "residual_formatted": self._statement_format_amount(residual_amount, currency),
-                }
+                StatementPendingPaymentRow(
+                    row["id"],
+                    row["display_number"],
+                    row["date"],
+                    payment_amount,
+                    residual_amount,
+                    self._statement_amount_formatter(currency),
+                )
             )
             entry["pending_balance"] += residual_amount
 
+        return {
+            partner_id: self._statement_finalize_data(company, cutoff_date, by_currency, aging_limits)
+            for partner_id, by_currency in by_partner.items()
+        }
+
+    def _statement_finalize_data(self, company, cutoff_date, by_currency, aging_limits):
         summary = []
         by_currency_list = []
         for entry in sorted(by_currency.values(), key=lambda e: e["currency_name"] or ""):
@@ -242,6 +525,7 @@ class ResPartner(models.Model):
             "cutoff_date": cutoff_date,
             "by_currency": by_currency_list,
             "currency_summary": summary,
+            "aging_labels": self._statement_aging_labels(aging_limits),
         }
 
     def _statement_currency_entry(self, container, currency):
@@ -261,41 +545,70 @@ class ResPartner(models.Model):
         container[currency.id] = entry
         return entry
 
+    def _statement_is_historical(self, cutoff_date):
+        handler = self.env["account.outstanding.original.currency.report.handler"]
+        return bool(handler._get_as_of_date(fields.Date.to_date(cutoff_date)))
+
     def _statement_invoice_domain(self, cutoff_date):
-        return [
-            ("partner_id", "=", self.id),
+        domain = [
+            ("partner_id", "in", self.ids),
             ("move_type", "in", ("out_invoice", "out_refund")),
             ("state", "=", "posted"),
-            ("amount_residual", "!=", 0.0),
             ("company_id", "in", self.env.companies.ids),
             ("invoice_date", "<=", cutoff_date),
         ]
+        if not self._statement_is_historical(cutoff_date):
+            domain.append(("amount_residual", "!=", 0.0))
+        return domain
 
     def _statement_pending_payment_domain(self, cutoff_date):
-        return [
-            ("partner_id", "=", self.id),
+        domain = [
+            ("partner_id", "in", self.ids),
             ("account_id.account_type", "=", "asset_receivable"),
             ("parent_state", "=", "posted"),
             ("payment_id", "!=", False),
-            ("reconciled", "=", False),
-            ("amount_residual", "<", 0.0),
             ("company_id", "in", self.env.companies.ids),
             ("date", "<=", cutoff_date),
         ]
+        if self._statement_is_historical(cutoff_date):
+            # Lines reconciled since the cutoff were still pending on it.
+            domain.append(("balance", "<", 0.0))
+        else:
+            domain += [("reconciled", "=", False), ("amount_residual", "<", 0.0)]
+        return domain
 
-    def _statement_days_overdue(self, due_date, reference_date):
-        if not due_date:
-            return 0
-        delta = (reference_date - due_date).days
-        return delta if delta > 0 else 0
-
-    def _statement_aging_bucket(self, days_overdue):
-        if days_overdue <= 0:
-            return "current"
-        if days_overdue <= 30:
-            return "b1_30"
-        if days_overdue <= 60:
-            return "b31_60"
-        if days_overdue <= 90:
-            return "b61_90"
-        return "b90_plus"
+    def _statement_aging_bucket_sql(self, date_sql, reference_date, limits=None):
+        """Return the ``_AGING_BUCKETS`` key for the age of ``date_sql`` at ``reference_date``.
+
+        ``limits`` are the three period boundaries in days, either integers
+        or SQL expressions (e.g. company columns); they default to the
+        periods of the current company.
+        """
+        period_1, period_2, period_3 = limits or self.env.company._get_statement_aging_limits()
+        return SQL(
+            """
+            CASE
+                WHEN %(date)s IS NULL OR %(date)s >= %(reference)s THEN 'current'
+                WHEN %(reference)s - %(date)s <= %(period_1)s THEN 'period_1'
+                WHEN %(reference)s - %(date)s <= %(period_2)s THEN 'period_2'
+                WHEN %(reference)s - %(date)s <= %(period_3)s THEN 'period_3'
+                ELSE 'older'
+            END
+            """,
+            date=date_sql,
+            reference=reference_date,
+            period_1=period_1,
+            period_2=period_2,
+            period_3=period_3,
+        )
+
+    def _statement_aging_labels(self, limits):
+        """Return the column headers of the aging table for the given boundaries."""
+        period_1, period_2, period_3 = limits
+        return {
+            "current": _("Al día"),
+            "period_1": f"1 - {period_1}",
+            "period_2": f"{period_1 + 1} - {period_2}",
+            "period_3": f"{period_2 + 1} - {period_3}",
+            "older": f"+{period_3}",
+        }
@@ -0,0 +1,235 @@
+import logging
+
+from odoo import api, fields, models
+from odoo.fields import Command
+from odoo.tools import SQL
+
+from .account_move import STATEMENT_OPEN_MOVE_PREDICATE
+from .account_move_line import STATEMENT_PENDING_PAYMENT_PREDICATE
+
+_logger = logging.getLogger(__name__)
+
+STATEMENT_SHARD_ITEMS_PARAM = "l10n_cr_statement_currency.shard_items"
+DEFAULT_STATEMENT_SHARD_ITEMS = 5000
+# One cron per worker: Odoo never runs the same cron twice at the same time.
+STATEMENT_BATCH_WORKER_CRONS = tuple(
+    f"l10n_cr_statement_currency.ir_cron_statement_batch_worker_{number}" for number in range(1, 5)
+)
+
+
+class StatementBatchRun(models.Model):
+    """One bulk statement operation, split into partner shards.
+
+    The partners are cut into ranges of ids holding about the same number
+    of open items (``statement.batch.shard``). The worker crons claim the
+    shards one at a time and commit after each, so several Odoo workers
+    share a run, a crash only loses the shard in progress and no partner
+    is processed twice.
+    """
+
+    _name = "statement.batch.run"
+    _description = "Proceso masivo de estados de cuenta"
+    _order = "id desc"
+
+    operation = fields.Selection(
+        [
+            ("prerender", "Pre-generar PDF"),
+            ("refresh", "Actualizar saldos abiertos"),
+        ],
+        string="Operación",
+        required=True,
+    )
+    company_id = fields.Many2one(
+        "res.company",
+        string="Compañía",
+        ondelete="cascade",
+        help="Company whose statements are pre-rendered; open balances are refreshed for all companies.",
+    )
+    shard_ids = fields.One2many("statement.batch.shard", "run_id", string="Lotes")
+    shard_count = fields.Integer(string="Lotes", compute="_compute_progress")
+    shard_done_count = fields.Integer(string="Lotes terminados", compute="_compute_progress")
+    partner_count = fields.Integer(string="Clientes", readonly=True)
+    item_count = fields.Integer(string="Documentos abiertos", readonly=True)
+    state = fields.Selection(
+        [
+            ("running", "En curso"),
+            ("done", "Terminado"),
+            ("failed", "Con errores"),
+        ],
+        string="Estado",
+        compute="_compute_progress",
+    )
+
+    @api.depends("shard_ids.state")
+    def _compute_progress(self):
+        # Computed, never stored: workers finishing shards at the same time
+        # must not all write the run row.
+        for run in self:
+            states = run.shard_ids.mapped("state")
+            run.shard_count = len(states)
+            run.shard_done_count = states.count("done")
+            if "pending" in states:
+                run.state = "running"
+            elif "failed" in states:
+                run.state = "failed"
+            else:
+                run.state = "done"
+
+    @api.model
+    def _start(self, operation, company=None, restart=False):
+        """Plan a run of ``operation`` and wake the workers; reuse the run already in progress.
+
+        With ``restart`` a new run is planned even when one is in progress,
+        for when the shards already done by that run are outdated (e.g. new
+        aging periods). Shards are claimed in run order, so the new run
+        processes a partner after the old one.
+
+        Planning is serialized per operation and company with a transaction
+        advisory lock. Without ``restart``, a run that another transaction
+        is planning right now (lock taken) is left to it and an empty
+        recordset is returned, rather than planning the same run twice.
+        """
+        company_id = company.id if company else False
+        lock_key = f"statement.batch.run:{operation}:{company_id or 0}"
+        if restart:
+            self.env.cr.execute(SQL("SELECT pg_advisory_xact_lock(hashtext(%s))", lock_key))
+        else:
+            self.env.cr.execute(SQL("SELECT pg_try_advisory_xact_lock(hashtext(%s))", lock_key))
+            if not self.env.cr.fetchone()[0]:
+                _logger.info("Statement batch run (%s) already being planned, skipped", operation)
+                return self.browse()
+        running = not restart and self.search([
+            ("operation", "=", operation),
+            ("company_id", "=", company_id),
+            ("shard_ids.state", "=", "pending"),
+        ], limit=1)
+        if running:
+            return running
+
+        if operation == "refresh":
+            # Shards cut partner id ranges; the few moves without partner are done here.
+            self.env["statement.open.balance"]._refresh([False])
+
+        item_counts = self._fetch_partner_item_counts(operation, company_id)
+        shards = self._plan_shards(item_counts)
+        run = self.create({
+            "operation": operation,
+            "company_id": company_id,
+            "partner_count": len(item_counts),
+            "item_count": sum(items for _partner_id, items in item_counts),
+            "shard_ids": [Command.create(values) for values in shards],
+        })
+        _logger.info(
+            "Statement batch run %s (%s): %s partners in %s shards", run.id, operation, len(item_counts), len(shards)
+        )
+        self._trigger_workers()
+        return run
+
+    @api.model
+    def action_start_prerender(self):
+        self._start("prerender", self.env.company)
+        return {"type": "ir.actions.client", "tag": "reload"}
+
+    @api.model
+    def action_start_refresh(self):
+        self._start("refresh")
+        return {"type": "ir.actions.client", "tag": "reload"}
+
+    @api.model
+    def _trigger_workers(self):
+        for xmlid in STATEMENT_BATCH_WORKER_CRONS:
+            cron = self.env.ref(xmlid, raise_if_not_found=False)
+            if cron and cron.active:
+                cron._trigger()
+
+    @api.model
+    def _fetch_partner_item_counts(self, operation, company_id=False, partner_range=None):
+        """Return ``[(partner_id, open items)]`` sorted by partner id.
+
+        Open invoices and unapplied payments are counted with the statement
+        predicates. A refresh also covers the partners still present in the
+        summary, so their outdated rows get removed.
+        """
+        self.env.flush_all()
+        filters = SQL("TRUE")
+        if company_id:
+            filters = SQL("%s AND company_id = %s", filters, company_id)
+        if partner_range:
+            filters = SQL("%s AND partner_id BETWEEN %s AND %s", filters, *partner_range)
+        summary_partners = SQL()
+        if operation == "refresh":
+            summary_partners = SQL(
+                """
+                 UNION ALL
+
+                    SELECT partner_id, 1
+                      FROM statement_open_balance
+                     WHERE %s
+                  GROUP BY partner_id
+                """,
+                filters,
+            )
+        self.env.cr.execute(SQL(
+            """
+            SELECT item.partner_id, SUM(item.items)
+              FROM (
+                    SELECT partner_id, COUNT(*) AS items
+                      FROM account_move
+                     WHERE %(open_moves)s AND %(filters)s
+                  GROUP BY partner_id
+
+                 UNION ALL
+
+                    SELECT partner_id, COUNT(*)
+                      FROM account_move_line
+                     WHERE %(pending_payments)s
+                       AND account_id IN (SELECT id FROM account_account WHERE account_type = 'asset_receivable')
+                       AND %(filters)s
+                  GROUP BY partner_id
+                   %(summary_partners)s
+                   ) item
+             WHERE item.partner_id IS NOT NULL
+          GROUP BY item.partner_id
+          ORDER BY item.partner_id
+            """,
+            open_moves=SQL(STATEMENT_OPEN_MOVE_PREDICATE),
+            pending_payments=SQL(STATEMENT_PENDING_PAYMENT_PREDICATE),
+            filters=filters,
+            summary_partners=summary_partners,
+        ))
+        return [(partner_id, int(items)) for partner_id, items in self.env.cr.fetchall()]
+
+    @api.model
+    def _plan_shards(self, item_counts):
+        """Cut the sorted ``(partner_id, items)`` pairs into contiguous id ranges.
+
+        A shard closes once it holds ``shard_items`` open items or as many
+        partners as one PDF render chunk, whichever comes first.
+        """
+        try:
+            max_items = int(self.env["ir.config_parameter"].sudo().get_param(
+                STATEMENT_SHARD_ITEMS_PARAM, DEFAULT_STATEMENT_SHARD_ITEMS
+            ))
+        except (TypeError, ValueError):
+            max_items = DEFAULT_STATEMENT_SHARD_ITEMS
+        max_partners = self.env["account.report"]._statement_pdf_render_settings()[0]
+
+        shards = []
+        shard = None
+        for partner_id, items in item_counts:
+            if (
+                shard is None
+                or shard["partner_count"] >= max_partners
+                or shard["item_count"] + items > max(max_items, 1)
+            ):
+                shard = {
+                    "partner_id_from": partner_id,
+                    "partner_id_to": partner_id,
+                    "item_count": 0,
+                    "partner_count": 0,
+                }
+                shards.append(shard)
+            shard["partner_id_to"] = partner_id
+            shard["item_count"] += items
+            shard["partner_count"] += 1
+        return shards
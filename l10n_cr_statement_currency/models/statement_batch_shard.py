@@ -0,0 +1,207 @@
+import logging
+import time
+
+from odoo import _, api, fields, models
+from odoo.tools import SQL
+
+_logger = logging.getLogger(__name__)
+
+# One row per claim of a shard, committed on its own before the shard is processed.
+SHARD_ATTEMPT_TABLE = "statement_batch_shard_attempt"
+STATEMENT_SHARD_MAX_ATTEMPTS = 3
+STATEMENT_WORKER_TIME_LIMIT_PARAM = "l10n_cr_statement_currency.worker_time_limit"
+DEFAULT_STATEMENT_WORKER_TIME_LIMIT = 240
+
+
+class StatementBatchShard(models.Model):
+    """A range of partner ids of a ``statement.batch.run``.
+
+    A worker claims a shard with ``FOR NO KEY UPDATE SKIP LOCKED``,
+    processes it and marks it done in the same transaction. The row lock
+    keeps other workers away until that commit, and a crashed worker rolls
+    back to ``pending``, so the shard is simply picked up again. Each claim
+    is recorded in ``statement_batch_shard_attempt`` by a transaction of
+    its own, which survives the crash: a shard that killed its worker
+    ``STATEMENT_SHARD_MAX_ATTEMPTS`` times is failed instead of claimed
+    forever.
+    """
+
+    _name = "statement.batch.shard"
+    _description = "Lote de proceso masivo de estados de cuenta"
+    _order = "run_id, id"
+
+    run_id = fields.Many2one("statement.batch.run", string="Proceso", required=True, ondelete="cascade", index=True)
+    partner_id_from = fields.Integer(string="Desde cliente (ID)", required=True)
+    partner_id_to = fields.Integer(string="Hasta cliente (ID)", required=True)
+    partner_count = fields.Integer(string="Clientes")
+    item_count = fields.Integer(string="Documentos abiertos")
+    state = fields.Selection(
+        [
+            ("pending", "Pendiente"),
+            ("done", "Terminado"),
+            ("failed", "Fallido"),
+        ],
+        string="Estado",
+        default="pending",
+        required=True,
+        index=True,
+    )
+    attempt_count = fields.Integer(string="Intentos", compute="_compute_attempt_count")
+    date_done = fields.Datetime(string="Terminado el", readonly=True)
+    error_message = fields.Text(string="Error", readonly=True)
+
+    def init(self):
+        self.env.cr.execute(SQL(
+            """
+            CREATE TABLE IF NOT EXISTS %(table)s (
+                id SERIAL PRIMARY KEY,
+                shard_id INTEGER NOT NULL REFERENCES statement_batch_shard (id) ON DELETE CASCADE,
+                date_start TIMESTAMP NOT NULL DEFAULT (NOW() AT TIME ZONE 'UTC')
+            );
+            CREATE INDEX IF NOT EXISTS %(index)s ON %(table)s (shard_id)
+            """,
+            table=SQL.identifier(SHARD_ATTEMPT_TABLE),
+            index=SQL.identifier(f"{SHARD_ATTEMPT_TABLE}__shard_id_index"),
+        ))
+
+    def _compute_attempt_count(self):
+        counts = {}
+        if self.ids:
+            self.env.cr.execute(SQL(
+                "SELECT shard_id, COUNT(*) FROM %s WHERE shard_id IN %s GROUP BY shard_id",
+                SQL.identifier(SHARD_ATTEMPT_TABLE),
+                tuple(self.ids),
+            ))
+            counts = dict(self.env.cr.fetchall())
+        for shard in self:
+            shard.attempt_count = counts.get(shard.id, 0)
+
+    @api.model
+    def _claim_next(self):
+        """Lock and return the next pending shard no other worker holds, or an empty recordset.
+
+        The attempt is recorded before returning. A shard that already used
+        up its attempts is failed and the next one is claimed.
+        """
+        while True:
+            self.env.flush_all()
+            self.env.cr.execute(SQL(
+                """
+                SELECT id
+                  FROM statement_batch_shard
+                 WHERE state = 'pending'
+              ORDER BY run_id, id
+                 LIMIT 1
+                   FOR NO KEY UPDATE SKIP LOCKED
+                """
+            ))
+            row = self.env.cr.fetchone()
+            shard = self.browse(row[0] if row else [])
+            if not shard or shard._start_attempt():
+                return shard
+            _logger.warning(
+                "Statement batch shard %s abandoned after %s attempts", shard.id, STATEMENT_SHARD_MAX_ATTEMPTS
+            )
+            shard.write({
+                "state": "failed",
+                "error_message": _(
+                    "El lote se interrumpió %(count)s veces sin terminar (tiempo o memoria agotados).",
+                    count=STATEMENT_SHARD_MAX_ATTEMPTS,
+                ),
+            })
+            if not self.env.registry.in_test_mode():
+                self.env.cr.commit()
+
+    def _start_attempt(self):
+        """Record an attempt at the shard in its own committed transaction.
+
+        A worker killed while processing the shard rolls back its own
+        transaction, not this one, so the attempt still counts. The foreign
+        key only takes a key-share lock on the shard, which does not
+        conflict with the claim. Returns False, without recording anything,
+        once the shard has ``STATEMENT_SHARD_MAX_ATTEMPTS`` attempts.
+        """
+        self.ensure_one()
+        table = SQL.identifier(SHARD_ATTEMPT_TABLE)
+        with self.env.registry.cursor() as cr:
+            cr.execute(SQL("SELECT COUNT(*) FROM %s WHERE shard_id = %s", table, self.id))
+            if cr.fetchone()[0] >= STATEMENT_SHARD_MAX_ATTEMPTS:
+                started = False
+            else:
+                cr.execute(SQL("INSERT INTO %s (shard_id) VALUES (%s)", table, self.id))
+                started = True
+        self.invalidate_recordset(["attempt_count"])
+        return started
+
+    def _get_worker_time_limit(self):
+        try:
+            seconds = int(self.env["ir.config_parameter"].sudo().get_param(
+                STATEMENT_WORKER_TIME_LIMIT_PARAM, DEFAULT_STATEMENT_WORKER_TIME_LIMIT
+            ))
+        except (TypeError, ValueError):
+            seconds = DEFAULT_STATEMENT_WORKER_TIME_LIMIT
+        return max(seconds, 1)
+
+    @api.model
+    def _cron_process_shards(self):
+        """Process shards, committing after each one, until none is left or the time limit is reached.
+
+        A worker out of time wakes the workers again instead of running
+        into the cron time limit, which would kill it mid-shard.
+        """
+        deadline = time.monotonic() + self._get_worker_time_limit()
+        processed = 0
+        out_of_time = False
+        while shard := self._claim_next():
+            shard._process()
+            processed += 1
+            if not self.env.registry.in_test_mode():
+                self.env.cr.commit()
+            self.env.invalidate_all()
+            if time.monotonic() >= deadline:
+                out_of_time = True
+                break
+        if processed:
+            _logger.info("Statement batch worker: %s shards processed", processed)
+        if out_of_time:
+            self.env["statement.batch.run"]._trigger_workers()
+
+    def action_retry(self):
+        failed = self.filtered(lambda shard: shard.state == "failed")
+        if failed:
+            # A retried shard gets its attempts back.
+            self.env.cr.execute(SQL(
+                "DELETE FROM %s WHERE shard_id IN %s", SQL.identifier(SHARD_ATTEMPT_TABLE), tuple(failed.ids)
+            ))
+            failed.invalidate_recordset(["attempt_count"])
+        failed.write({"state": "pending", "error_message": False})
+        self.env["statement.batch.run"]._trigger_workers()
+
+    def _process(self):
+        self.ensure_one()
+        try:
+            with self.env.cr.savepoint():
+                self._run_operation()
+        except Exception as error:
+            _logger.warning("Statement batch shard %s failed: %s", self.id, error)
+            self.write({"state": "failed", "error_message": str(error)})
+            return
+        self.write({"state": "done", "date_done": fields.Datetime.now(), "error_message": False})
+
+    def _run_operation(self):
+        run = self.run_id
+        # Partners are looked up again: the ledger may have moved since the run was planned.
+        partner_ids = [
+            partner_id
+            for partner_id, _items in run._fetch_partner_item_counts(
+                run.operation, run.company_id.id, partner_range=(self.partner_id_from, self.partner_id_to)
+            )
+        ]
+        if not partner_ids:
+            return
+        if run.operation == "prerender":
+            self.env["res.partner"].with_company(run.company_id).browse(partner_ids)._prerender_statements()
+        elif run.operation == "refresh":
+            open_balance = self.env["statement.open.balance"]
+            open_balance._refresh(partner_ids)
+            open_balance._mark_ledger_changed()
@@ -0,0 +1,57 @@
+import threading
+from collections import OrderedDict
+
+
+class StatementResultCache:
+    """LRU cache of statement query results, bounded by entries and by rows.
+
+    ``odoo.tools.lru.LRU`` only counts entries, so a few full-ledger
+    results could pin any amount of worker memory. Here every value weighs
+    its number of rows (``len``, or 1 for scalars and records); the least
+    recently used entries are dropped once the total goes over
+    ``max_rows``, and a value heavier than ``max_rows`` is never stored.
+    """
+
+    def __init__(self, max_entries, max_rows):
+        self.max_entries = max_entries
+        self.max_rows = max_rows
+        self.entries = OrderedDict()
+        self.rows = 0
+        self.lock = threading.RLock()
+
+    @staticmethod
+    def weight(value):
+        try:
+            return max(len(value), 1)
+        except TypeError:
+            return 1
+
+    def get(self, key, default=None):
+        with self.lock:
+            if key not in self.entries:
+                return default
+            self.entries.move_to_end(key)
+            return self.entries[key][0]
+
+    def put(self, key, value):
+        """Store ``value`` unless it alone exceeds the row budget; return whether it was stored."""
+        weight = self.weight(value)
+        if weight > self.max_rows:
+            return False
+        with self.lock:
+            if key in self.entries:
+                self.rows -= self.entries.pop(key)[1]
+            self.entries[key] = (value, weight)
+            self.rows += weight
+            while len(self.entries) > self.max_entries or self.rows > self.max_rows:
+                __, (__, evicted_weight) = self.entries.popitem(last=False)
+                self.rows -= evicted_weight
+        return True
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.rows = 0
+
+    def __len__(self):
+        return len(self.entries)
@@ -0,0 +1,59 @@
+import ast
+
+from odoo.addons.base.models.res_lang import intersperse
+from odoo.tools import float_round
+from odoo.tools.misc import NON_BREAKING_SPACE, get_lang
+
+FORMATTERS_CACHE_KEY = "l10n_cr_statement_currency.amount_formatters"
+
+
+def statement_amount_formatter(env, currency, ascii_space=False):
+    """Return a function formatting amounts of ``currency`` exactly like ``formatLang``.
+
+    ``formatLang`` resolves the language, its separators and the currency
+    digits and symbol on every call; here they are resolved once per
+    (language, currency) and the compiled formatter is kept on the cursor,
+    so all the cells of a render share it. Writing a currency or a
+    language drops them (``clear_statement_amount_formatters``). With
+    ``ascii_space`` the non-breaking space between amount and symbol
+    becomes a regular space (see ``res.partner._statement_format_amount``).
+    """
+    formatters = env.cr.cache.setdefault(FORMATTERS_CACHE_KEY, {})
+    key = (env.lang, currency.id, ascii_space)
+    if key not in formatters:
+        formatters[key] = _compile_amount_formatter(env, currency, ascii_space)
+    return formatters[key]
+
+
+def clear_statement_amount_formatters(env):
+    """Forget the formatters compiled on the cursor, e.g. after a currency or language changed."""
+    env.cr.cache.pop(FORMATTERS_CACHE_KEY, None)
+
+
+def _compile_amount_formatter(env, currency, ascii_space):
+    lang = get_lang(env)
+    grouping = ast.literal_eval(lang.grouping)
+    thousands_sep = lang.thousands_sep or ""
+    decimal_point = lang.decimal_point
+    digits = currency.decimal_places
+    number_format = f"%.{digits}f"
+    symbol = currency.symbol
+    space = NON_BREAKING_SPACE
+    symbol_after = currency.position == "after"
+    if ascii_space:
+        # Same as replacing every NBSP of the formatLang output.
+        thousands_sep, decimal_point, space = (
+            part.replace(NON_BREAKING_SPACE, " ") for part in (thousands_sep, decimal_point, space)
+        )
+        symbol = symbol and symbol.replace(NON_BREAKING_SPACE, " ")
+
+    def format_amount(amount):
+        rounded = float_round(amount or 0.0, precision_digits=digits, rounding_method="HALF-EVEN")
+        parts = (number_format % rounded).split(".")
+        parts[0] = intersperse(parts[0], grouping, thousands_sep)[0]
+        formatted = decimal_point.join(parts)
+        if not symbol:
+            return formatted
+        return f"{formatted}{space}{symbol}" if symbol_after else f"{symbol}{space}{formatted}"
+
+    return format_amount
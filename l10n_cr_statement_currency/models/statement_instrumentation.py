@@ -0,0 +1,72 @@
+import json
+import logging
+import time
+from contextlib import contextmanager
+
+from odoo.http import request
+from odoo.tools import str2bool
+
+_logger = logging.getLogger(__name__)
+
+STATEMENT_INSTRUMENTATION_PARAM = "l10n_cr_statement_currency.instrumentation"
+STATEMENT_INSTRUMENTATION_WARNING = "l10n_cr_statement_currency.statement_instrumentation_warning"
+
+
+class StatementInstrumentation:
+    """Per-stage duration, query count and row counts of one statement operation.
+
+    Enabled by the ``l10n_cr_statement_currency.instrumentation`` system
+    parameter or by debug mode. When disabled, ``stage`` only costs a
+    context manager, so it can stay on the hot paths.
+
+        instrumentation = StatementInstrumentation(env, "report_lines")
+        with instrumentation.stage("partner_totals") as counts:
+            rows = ...
+            counts["rows"] = len(rows)
+        instrumentation.log(report_id=report.id)
+    """
+
+    def __init__(self, env, operation):
+        self.env = env
+        self.operation = operation
+        self.enabled = self.is_debug() or str2bool(
+            env["ir.config_parameter"].sudo().get_param(STATEMENT_INSTRUMENTATION_PARAM, "False")
+        )
+        self.stages = []
+
+    @staticmethod
+    def is_debug():
+        return bool(request and request.session.debug)
+
+    @contextmanager
+    def stage(self, name):
+        """Measure the enclosed block; row counts go into the yielded dict."""
+        counts = {}
+        if not self.enabled:
+            yield counts
+            return
+        queries_before = self.env.cr.sql_log_count
+        started = time.perf_counter()
+        try:
+            yield counts
+        finally:
+            self.stages.append({
+                "stage": name,
+                "duration_ms": round((time.perf_counter() - started) * 1000, 1),
+                "queries": self.env.cr.sql_log_count - queries_before,
+                **counts,
+            })
+
+    def log(self, **extra):
+        """Emit one structured (JSON) log record with every stage measured so far."""
+        if not self.stages:
+            return
+        _logger.info(
+            "statement instrumentation: %s",
+            json.dumps({"operation": self.operation, **extra, "stages": self.stages}, default=str),
+        )
+
+    def add_report_warning(self, warnings):
+        """Show the stages as an info block on the report, in debug mode only."""
+        if warnings is not None and self.stages and self.is_debug():
+            warnings[STATEMENT_INSTRUMENTATION_WARNING] = {"alert_type": "info", "stages": self.stages}
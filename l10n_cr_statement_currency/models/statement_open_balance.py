@@ -0,0 +1,418 @@
+import logging
+
+from odoo import _, api, fields, models
+from odoo.exceptions import AccessError
+from odoo.tools import SQL
+from odoo.tools.safe_eval import safe_eval
+
+_logger = logging.getLogger(__name__)
+
+REFRESH_PARTNERS_KEY = "statement.open.balance.partner_ids"
+LEDGER_CHANGE_KEY = "statement.open.balance.ledger_changed"
+LEDGER_CHANGE_TABLE = "statement_ledger_change"
+
+
+class StatementOpenBalance(models.Model):
+    """Per partner/currency/company/aging bucket summary of the open receivable.
+
+    Rows are rebuilt per partner when invoices are posted, reset or
+    cancelled and when partial reconciliations are created or removed, so
+    folded statement views can read a handful of rows instead of scanning
+    ``account_move``. Aging is relative to ``date_computed`` and uses the
+    periods configured on each company; a nightly cron rebuilds everything
+    so buckets follow the calendar. Moves without partner are kept in rows
+    with an empty ``partner_id``, like the "No Partner" group of the report.
+    """
+
+    _name = "statement.open.balance"
+    _description = "Saldo abierto por cliente y moneda"
+    _log_access = False
+
+    partner_id = fields.Many2one("res.partner", string="Cliente", ondelete="cascade", index=True)
+    currency_id = fields.Many2one("res.currency", string="Moneda", required=True, ondelete="cascade")
+    company_id = fields.Many2one("res.company", string="Compañía", required=True, ondelete="cascade", index=True)
+    aging_bucket = fields.Selection(
+        [
+            ("current", "Al día"),
+            ("period_1", "Periodo 1"),
+            ("period_2", "Periodo 2"),
+            ("period_3", "Periodo 3"),
+            ("older", "Más antiguo"),
+        ],
+        string="Antigüedad",
+        required=True,
+    )
+    open_total = fields.Monetary(string="Facturas pendientes", currency_field="currency_id")
+    open_count = fields.Integer(string="Documentos abiertos")
+    pending_total = fields.Monetary(
+        string="Pagos sin aplicar",
+        currency_field="currency_id",
+        help="Unreconciled customer payments, aged by payment date.",
+    )
+    date_computed = fields.Date(string="Calculado al", required=True)
+
+    def init(self):
+        self.env.cr.execute(SQL(
+            """
+            CREATE TABLE IF NOT EXISTS %(table)s (
+                id SERIAL PRIMARY KEY,
+                weight INTEGER NOT NULL DEFAULT 1
+            )
+            """,
+            table=SQL.identifier(LEDGER_CHANGE_TABLE),
+        ))
+
+    # ------------------------------------------------------------------
+    # Incremental maintenance
+    # ------------------------------------------------------------------
+    @api.model
+    def _schedule_refresh(self, partner_ids):
+        """Refresh the rows of ``partner_ids`` once, right before the transaction commits.
+
+        A ``False`` entry refreshes the rows of the moves without partner.
+        """
+        partner_ids = {partner_id or False for partner_id in partner_ids}
+        if not partner_ids:
+            return
+        pending = self.env.cr.precommit.data.setdefault(REFRESH_PARTNERS_KEY, set())
+        if not pending:
+            self.env.cr.precommit.add(self._run_scheduled_refresh)
+        pending.update(partner_ids)
+        self._mark_ledger_changed()
+
+    @api.model
+    def _run_scheduled_refresh(self):
+        partner_ids = self.env.cr.precommit.data.pop(REFRESH_PARTNERS_KEY, set())
+        if partner_ids:
+            self._refresh(partner_ids=list(partner_ids))
+
+    # ------------------------------------------------------------------
+    # Ledger change marker: every transaction changing the open receivable
+    # inserts one row, and the marker is the total weight of the rows the
+    # current snapshot sees. Being read in the snapshot like the ledger, it
+    # only moves when the visible data does, so a reader can never cache
+    # data of one ledger state under the marker of another. Snapshots see a
+    # prefix of the commits, so two of them with the same total saw the
+    # same changes. Inserts take no shared lock.
+    #
+    # The marker is global on purpose: the cached results (partner totals,
+    # orders, partner lists) span many partners, so a marker per partner
+    # would have to be summed over every partner an entry covers, known
+    # only once it is computed. A change drops every entry instead, at most
+    # once per committing transaction.
+    # ------------------------------------------------------------------
+    @api.model
+    def _get_ledger_change_marker(self):
+        self.env.cr.execute(SQL("SELECT COALESCE(SUM(weight), 0) FROM %s", SQL.identifier(LEDGER_CHANGE_TABLE)))
+        return self.env.cr.fetchone()[0]
+
+    @api.model
+    def _mark_ledger_changed(self):
+        """Record a ledger change; visible to this transaction at once, to the others on commit.
+
+        Only the first call of a transaction inserts a row: batch posts and
+        reconciliations call this once per record set, and the marker only
+        has to move once per commit. The id of that row is kept, so a row
+        undone by a savepoint rollback is inserted again.
+        """
+        table = SQL.identifier(LEDGER_CHANGE_TABLE)
+        change_id = self.env.cr.precommit.data.get(LEDGER_CHANGE_KEY)
+        if change_id:
+            self.env.cr.execute(SQL("SELECT 1 FROM %s WHERE id = %s", table, change_id))
+            if self.env.cr.fetchone():
+                return
+        self.env.cr.execute(SQL("INSERT INTO %s DEFAULT VALUES RETURNING id", table))
+        self.env.cr.precommit.data[LEDGER_CHANGE_KEY] = self.env.cr.fetchone()[0]
+
+    @api.model
+    def _has_uncommitted_ledger_changes(self):
+        """Whether this transaction changed the ledger: its marker then counts changes no one else sees."""
+        return bool(self.env.cr.precommit.data.get(LEDGER_CHANGE_KEY))
+
+    @api.model
+    def _compact_ledger_changes(self):
+        """Fold the change rows into one of the same total weight, so the marker stays cheap to read."""
+        self.env.cr.execute(SQL(
+            """
+            WITH removed AS (DELETE FROM %(table)s RETURNING weight)
+            INSERT INTO %(table)s (weight)
+            SELECT SUM(weight) FROM removed HAVING COUNT(*) > 0
+            """,
+            table=SQL.identifier(LEDGER_CHANGE_TABLE),
+        ))
+
+    @api.model
+    def _rebuild_all(self):
+        """Recompute the whole table (recovery command and nightly aging refresh)."""
+        self._refresh()
+        self._mark_ledger_changed()
+        _logger.info("Statement open balances rebuilt")
+
+    @api.model
+    def action_rebuild_all(self):
+        if not self.env.user.has_group("account.group_account_manager"):
+            raise AccessError(_("Solo un administrador contable puede reconstruir los saldos abiertos."))
+        self._rebuild_all()
+        return {"type": "ir.actions.client", "tag": "reload"}
+
+    @api.model
+    def _cron_rebuild(self):
+        # Nightly aging refresh, shared by the batch worker crons in partner shards.
+        # Also triggered when aging periods change: the shards already done
+        # by a run in progress used the old periods, so a new run is planned.
+        self._compact_ledger_changes()
+        outdated_companies = self.env["res.company"].sudo().search([("statement_balance_outdated", "=", True)])
+        self.env["statement.batch.run"]._start("refresh", restart=bool(outdated_companies))
+        outdated_companies.write({"statement_balance_outdated": False})
+
+    @api.model
+    def _partner_filter_sql(self, column, partner_ids):
+        """Condition restricting ``column`` to ``partner_ids`` (``False`` stands for no partner)."""
+        if not partner_ids:
+            return SQL("TRUE")
+        condition = SQL("%s = ANY(%s)", column, [partner_id for partner_id in partner_ids if partner_id])
+        if not all(partner_ids):
+            condition = SQL("(%s OR %s IS NULL)", condition, column)
+        return condition
+
+    @api.model
+    def _get_company_dates(self, company_ids=None):
+        """Return ``{company_id: today}`` in the timezone of each company (of its partner, else UTC).
+
+        Rows are computed for, and checked against, the date of their
+        company, so neither depends on the timezone of the user or of the
+        cron that happens to run them.
+        """
+        companies = self.env["res.company"].sudo().browse(company_ids) if company_ids else (
+            self.env["res.company"].sudo().search([])
+        )
+        now = fields.Datetime.now()
+        return {
+            company.id: fields.Datetime.context_timestamp(
+                company.with_context(tz=company.partner_id.tz or "UTC"), now
+            ).date()
+            for company in companies
+        }
+
+    @api.model
+    def _company_dates_sql(self, company_dates):
+        """``company_date (company_id, today)`` rows of ``company_dates``, to join on."""
+        return SQL(
+            "(VALUES %s) AS company_date (company_id, today)",
+            SQL(", ").join(SQL("(%s, %s::date)", company_id, today) for company_id, today in company_dates.items()),
+        )
+
+    @api.model
+    def _refresh(self, partner_ids=None):
+        """Rebuild the rows of ``partner_ids`` (every row when not given).
+
+        Same scope as the live statement at today's cutoff, today being the
+        date of each company (``_get_company_dates``): documents dated up to
+        then, open moves with or without partner and the pending payments
+        of a partner.
+        """
+        self.env.flush_all()
+        company_dates = self._get_company_dates()
+        reference_date = SQL("company_date.today")
+        # Each row ages with the periods of its own company.
+        company_limits = (
+            SQL("company.statement_aging_period_1"),
+            SQL("company.statement_aging_period_2"),
+            SQL("company.statement_aging_period_3"),
+        )
+        self.env.cr.execute(SQL(
+            "DELETE FROM statement_open_balance WHERE %s",
+            self._partner_filter_sql(SQL.identifier("partner_id"), partner_ids),
+        ))
+        self.env.cr.execute(SQL(
+            """
+            INSERT INTO statement_open_balance (
+                partner_id, currency_id, company_id, aging_bucket,
+                open_total, open_count, pending_total, date_computed
+            )
+            SELECT item.partner_id,
+                   item.currency_id,
+                   item.company_id,
+                   item.aging_bucket,
+                   SUM(item.open_amount),
+                   SUM(item.open_count),
+                   SUM(item.pending_amount),
+                   item.date_computed
+              FROM (
+                    SELECT move.partner_id,
+                           move.currency_id,
+                           move.company_id,
+                           %(move_bucket)s AS aging_bucket,
+                           CASE WHEN move.move_type = 'out_refund' THEN -move.amount_residual
+                                ELSE move.amount_residual END AS open_amount,
+                           1 AS open_count,
+                           0.0 AS pending_amount,
+                           company_date.today AS date_computed
+                      FROM account_move move
+                      JOIN res_company company ON company.id = move.company_id
+                      JOIN %(company_dates)s ON company_date.company_id = move.company_id
+                     WHERE move.move_type IN ('out_invoice', 'out_refund')
+                       AND move.state = 'posted'
+                       AND move.amount_residual <> 0
+                       AND move.invoice_date <= %(reference_date)s
+                       AND %(move_partner_filter)s
+
+                 UNION ALL
+
+                    SELECT line.partner_id,
+                           COALESCE(line.currency_id, company.currency_id),
+                           line.company_id,
+                           %(line_bucket)s,
+                           0.0,
+                           0,
+                           CASE WHEN line.currency_id IS NOT NULL THEN -line.amount_residual_currency
+                                ELSE -line.amount_residual END,
+                           company_date.today
+                      FROM account_move_line line
+                      JOIN account_account account ON account.id = line.account_id
+                      JOIN res_company company ON company.id = line.company_id
+                      JOIN %(company_dates)s ON company_date.company_id = line.company_id
+                     WHERE account.account_type = 'asset_receivable'
+                       AND line.parent_state = 'posted'
+                       AND line.payment_id IS NOT NULL
+                       AND line.reconciled IS NOT TRUE
+                       AND line.amount_residual < 0
+                       AND line.partner_id IS NOT NULL
+                       AND line.date <= %(reference_date)s
+                       AND %(line_partner_filter)s
+                   ) item
+          GROUP BY item.partner_id, item.currency_id, item.company_id, item.aging_bucket, item.date_computed
+            """,
+            reference_date=reference_date,
+            company_dates=self._company_dates_sql(company_dates),
+            move_bucket=self.env["res.partner"]._statement_aging_bucket_sql(
+                SQL("move.invoice_date_due"), reference_date, limits=company_limits
+            ),
+            line_bucket=self.env["res.partner"]._statement_aging_bucket_sql(
+                SQL("line.date"), reference_date, limits=company_limits
+            ),
+            move_partner_filter=self._partner_filter_sql(SQL("move.partner_id"), partner_ids),
+            line_partner_filter=self._partner_filter_sql(SQL("line.partner_id"), partner_ids),
+        ))
+        self.env.invalidate_all()
+
+    # ------------------------------------------------------------------
+    # Readers
+    # ------------------------------------------------------------------
+    @api.model
+    def _is_usable_for(self, reference_date, journal_ids):
+        """Whether the summary gives the same answer as the ledger for today's cutoff.
+
+        The summary ignores journals, is only as fresh as today's rows (the
+        nightly run moves them to the new day and a refresh run rebuilds
+        the table after the aging periods change) and is filtered by
+        company only, so other ``account.move`` record rules rule it out.
+        Today is the date of each company read (``_get_company_dates``).
+        """
+        company_dates = self._get_company_dates(self.env.companies.ids)
+        if (
+            journal_ids
+            or any(self.env.companies.sudo().mapped("statement_balance_outdated"))
+            or any(today != reference_date for today in company_dates.values())
+            or self._has_restricting_move_rules()
+        ):
+            return False
+        self.env.flush_all()
+        self.env.cr.execute(SQL(
+            """
+            SELECT EXISTS(
+                    SELECT FROM statement_open_balance balance
+                      JOIN %(company_dates)s ON company_date.company_id = balance.company_id
+                     WHERE balance.date_computed <> company_date.today
+                   )
+                OR EXISTS(
+                    SELECT FROM statement_batch_shard shard
+                      JOIN statement_batch_run run ON run.id = shard.run_id
+                     WHERE run.operation = 'refresh'
+                       AND shard.state = 'pending'
+                   )
+            """,
+            company_dates=self._company_dates_sql(company_dates),
+        ))
+        return not self.env.cr.fetchone()[0]
+
+    @api.model
+    def _has_restricting_move_rules(self):
+        """Whether a read rule on ``account.move`` filters the user's moves on more than the company."""
+        rules = self.env["ir.rule"]._get_rules("account.move", mode="read")
+        if not rules:
+            return False
+        eval_context = self.env["ir.rule"]._eval_context()
+        for rule in rules:
+            for leaf in safe_eval(rule.domain_force or "[]", eval_context):
+                # Operators are strings, always true/false leaves start with a number.
+                if isinstance(leaf, (list, tuple)) and isinstance(leaf[0], str) and leaf[0] != "company_id":
+                    return True
+        return False
+
+    @api.model
+    def _fetch_partner_totals(self, kind, company_ids, partner_ids=None):
+        """Return ``partner_id``/``partner_name`` rows with open invoices or pending payments."""
+        self.env.flush_all()
+        amount_column = SQL.identifier("open_total" if kind == "moves" else "pending_total")
+        self.env.cr.execute(SQL(
+            """
+            SELECT balance.partner_id,
+                   partner.name AS partner_name,
+                   SUM(balance.open_count) AS move_count
+              FROM statement_open_balance balance
+         LEFT JOIN res_partner partner ON partner.id = balance.partner_id
+             WHERE balance.company_id = ANY(%(company_ids)s)
+               AND balance.%(amount_column)s <> 0
+               %(partner_filter)s
+          GROUP BY balance.partner_id, partner.name
+            """,
+            company_ids=company_ids,
+            amount_column=amount_column,
+            partner_filter=SQL("AND balance.partner_id = ANY(%s)", partner_ids) if partner_ids else SQL(),
+        ))
+        return self.env.cr.dictfetchall()
+
+    @api.model
+    def _has_partner_balances(self, company_ids, partner_ids=None):
+        """Whether ``_fetch_partner_totals`` would return a partner for either kind."""
+        self.env.flush_all()
+        self.env.cr.execute(SQL(
+            """
+            SELECT EXISTS(
+                    SELECT FROM statement_open_balance balance
+                     WHERE balance.company_id = ANY(%(company_ids)s)
+                       AND balance.partner_id IS NOT NULL
+                       AND (balance.open_total <> 0 OR balance.pending_total <> 0)
+                       %(partner_filter)s
+                   )
+            """,
+            company_ids=company_ids,
+            partner_filter=SQL("AND balance.partner_id = ANY(%s)", partner_ids) if partner_ids else SQL(),
+        ))
+        return self.env.cr.fetchone()[0]
+
+    @api.model
+    def _fetch_summary_rows(self, company_ids, partner_ids=None):
+        """Return open/pending totals per partner, currency and aging bucket."""
+        self.env.flush_all()
+        self.env.cr.execute(SQL(
+            """
+            SELECT balance.partner_id,
+                   partner.name AS partner_name,
+                   balance.currency_id,
+                   currency.name AS currency_name,
+                   balance.aging_bucket,
+                   SUM(balance.open_total) AS open_total,
+                   SUM(balance.pending_total) AS pending_total
+              FROM statement_open_balance balance
+         LEFT JOIN res_partner partner ON partner.id = balance.partner_id
+              JOIN res_currency currency ON currency.id = balance.currency_id
+             WHERE balance.company_id = ANY(%(company_ids)s)
+               %(partner_filter)s
+          GROUP BY balance.partner_id, partner.name, balance.currency_id, currency.name, balance.aging_bucket
+            """,
+            company_ids=company_ids,
+            partner_filter=SQL("AND balance.partner_id = ANY(%s)", partner_ids) if partner_ids else SQL(),
+        ))
+        return self.env.cr.dictfetchall()
@@ -0,0 +1,35 @@
+class StatementPartnerGroups:
+    """The ``{currency_id: group}`` of each partner, loaded a chunk of partners at a time.
+
+    ``partner_ids`` is the order in which the groups are asked for (the
+    order of the report lines). Asking for a partner that is not loaded
+    runs ``load`` on it and the next ``chunk_size`` partners of that order,
+    and drops the chunk held so far, so memory follows the chunk and not
+    the ledger. Asking out of order stays correct, it only costs a load.
+
+        groups = StatementPartnerGroups(load, partner_ids, chunk_size=200)
+        for partner_id in partner_ids:
+            currency_groups = groups.get(partner_id, {})
+    """
+
+    def __init__(self, load, partner_ids, chunk_size):
+        self.load = load
+        self.partner_ids = list(partner_ids)
+        self.positions = {partner_id: index for index, partner_id in enumerate(self.partner_ids)}
+        self.chunk_size = max(chunk_size, 1)
+        self.groups = {}
+        self.load_count = 0
+
+    def get(self, partner_id, default=None):
+        if partner_id not in self.groups:
+            position = self.positions.get(partner_id)
+            if position is None:
+                return default
+            chunk = self.partner_ids[position : position + self.chunk_size]
+            # Released before the next chunk is read, so two chunks are never held.
+            self.groups = {}
+            self.groups = self.load(chunk)
+            for chunk_partner_id in chunk:
+                self.groups.setdefault(chunk_partner_id, {})
+            self.load_count += 1
+        return self.groups.get(partner_id, default)
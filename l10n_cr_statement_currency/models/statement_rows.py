@@ -0,0 +1,71 @@
+class StatementRow:
+    """Fixed-layout statement row: ``__slots__`` instead of a per-row dict.
+
+    Large partners have thousands of moves, and a dict per move repeats
+    every key and carries a hash table. Slotted rows only store the
+    values; ``row["name"]`` keeps working (QWeb templates, callers written
+    for dicts) and maps to the attribute.
+    """
+
+    __slots__ = ()
+
+    def __init__(self, *values):
+        for name, value in zip(self.__slots__, values, strict=True):
+            setattr(self, name, value)
+
+    def __getitem__(self, key):
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def __repr__(self):
+        values = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{type(self).__name__}({values})"
+
+
+class StatementMoveRow(StatementRow):
+    """Open invoice/refund of the dynamic report; amounts signed, in the move currency."""
+
+    __slots__ = ("id", "invoice_date", "invoice_date_due", "display_number", "original_amount", "residual_amount",
+                 "days_overdue")
+
+
+class StatementPaymentRow(StatementRow):
+    """Unapplied payment line of the dynamic report; amounts positive, in the line currency."""
+
+    __slots__ = ("line_id", "move_id", "payment_date", "display_number", "payment_amount", "residual_amount")
+
+
+class StatementInvoiceRow(StatementRow):
+    """Open invoice/refund of the PDF statement.
+
+    The formatted amounts are produced when the template reads them, with
+    the compiled formatter shared by every row of the currency, instead of
+    two strings stored per row.
+    """
+
+    __slots__ = ("id", "number", "invoice_date", "invoice_date_due", "days_overdue", "original_amount",
+                 "residual_amount", "format_amount")
+
+    @property
+    def original_formatted(self):
+        return self.format_amount(self.original_amount)
+
+    @property
+    def residual_formatted(self):
+        return self.format_amount(self.residual_amount)
+
+
+class StatementPendingPaymentRow(StatementRow):
+    """Unapplied payment of the PDF statement; formatted like ``StatementInvoiceRow``."""
+
+    __slots__ = ("line_id", "number", "payment_date", "original_amount", "residual_amount", "format_amount")
+
+    @property
+    def original_formatted(self):
+        return self.format_amount(self.original_amount)
+
+    @property
+    def residual_formatted(self):
+        return self.format_amount(self.residual_amount)
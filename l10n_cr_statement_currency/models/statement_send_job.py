@@ -0,0 +1,111 @@
+import logging
+
+from odoo import _, api, fields, models
+
+_logger = logging.getLogger(__name__)
+
+STATEMENT_MAIL_RATE_PARAM = "l10n_cr_statement_currency.mail_rate_per_minute"
+DEFAULT_STATEMENT_MAIL_RATE = 30
+
+
+class StatementSendJob(models.Model):
+    """One queued statement email, processed in the background by a cron.
+
+    Rendering the PDF and talking to the SMTP server happen in the cron, a
+    limited number of jobs per run, so mass mailings never block a request.
+    """
+
+    _name = "statement.send.job"
+    _description = "Envío programado de estado de cuenta"
+    _order = "id desc"
+
+    partner_id = fields.Many2one("res.partner", string="Cliente", required=True, ondelete="cascade", index=True)
+    company_id = fields.Many2one("res.company", string="Compañía", required=True, default=lambda self: self.env.company)
+    subject = fields.Char(string="Asunto", required=True)
+    body = fields.Html(string="Contenido", sanitize_style=True)
+    state = fields.Selection(
+        [
+            ("pending", "Pendiente"),
+            ("done", "Enviado"),
+            ("failed", "Fallido"),
+        ],
+        string="Estado",
+        default="pending",
+        required=True,
+        index=True,
+    )
+    error_message = fields.Text(string="Error", readonly=True)
+    attempt_count = fields.Integer(string="Intentos", readonly=True)
+    date_sent = fields.Datetime(string="Fecha de envío", readonly=True)
+    mail_id = fields.Many2one("mail.mail", string="Correo", readonly=True, ondelete="set null")
+
+    @api.model
+    def _enqueue_partners(self, partners):
+        """Create one pending job per partner, skipping those already queued."""
+        already_queued = self.search(
+            [("partner_id", "in", partners.ids), ("state", "=", "pending")]
+        ).partner_id
+        values = []
+        for partner in partners - already_queued:
+            mail_defaults = partner._get_statement_mail_defaults()
+            values.append(
+                {
+                    "partner_id": partner.id,
+                    "company_id": self.env.company.id,
+                    "subject": mail_defaults["subject"],
+                    "body": mail_defaults["body"],
+                }
+            )
+        jobs = self.create(values)
+        if jobs:
+            self.env.ref("l10n_cr_statement_currency.ir_cron_statement_send_jobs")._trigger()
+        return jobs
+
+    def action_retry(self):
+        self.filtered(lambda job: job.state == "failed").write({"state": "pending", "error_message": False})
+        self.env.ref("l10n_cr_statement_currency.ir_cron_statement_send_jobs")._trigger()
+
+    def _get_mail_rate(self):
+        try:
+            rate = int(self.env["ir.config_parameter"].sudo().get_param(
+                STATEMENT_MAIL_RATE_PARAM, DEFAULT_STATEMENT_MAIL_RATE
+            ))
+        except (TypeError, ValueError):
+            rate = DEFAULT_STATEMENT_MAIL_RATE
+        return max(rate, 1)
+
+    @api.model
+    def _cron_process_jobs(self):
+        """Send at most ``mail_rate_per_minute`` pending statements per run."""
+        jobs = self.search([("state", "=", "pending")], order="id", limit=self._get_mail_rate())
+        for job in jobs:
+            job._process()
+            # Commit per job so a crash never resends what already went out.
+            if not self.env.registry.in_test_mode():
+                self.env.cr.commit()
+
+        remaining = self.search_count([("state", "=", "pending")])
+        _logger.info("Statement mailing: %s processed, %s pending", len(jobs), remaining)
+        if remaining:
+            self.env.ref("l10n_cr_statement_currency.ir_cron_statement_send_jobs")._trigger(
+                fields.Datetime.add(fields.Datetime.now(), minutes=1)
+            )
+
+    def _process(self):
+        self.ensure_one()
+        partner = self.partner_id.with_company(self.company_id)
+        self.attempt_count += 1
+        try:
+            with self.env.cr.savepoint():
+                partner._check_statement_target_emails()
+                mail = partner._send_statement_email(self.subject, self.body)
+        except Exception as error:
+            _logger.warning("Statement mailing failed for partner %s: %s", self.partner_id.id, error)
+            self.write({"state": "failed", "error_message": str(error)})
+            return
+
+        # mail.send() does not raise on SMTP errors, it flags the mail instead.
+        if mail.state == "exception":
+            self.write({"state": "failed", "mail_id": mail.id, "error_message": mail.failure_reason or _("Error SMTP")})
+            return
+        self.write({"state": "done", "date_sent": fields.Datetime.now(), "mail_id": mail.id, "error_message": False})
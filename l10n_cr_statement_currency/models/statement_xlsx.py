@@ -0,0 +1,196 @@
+from odoo import _
+from odoo.tools.misc import xlsxwriter
+
+STATEMENT_XLSX_DATE_FORMAT = "dd/mm/yyyy"
+
+
+class StatementXlsxWriter:
+    """Write the original-currency ledger of the statement into an XLSX file.
+
+    The workbook runs in ``constant_memory`` mode: xlsxwriter flushes a row
+    to its temporary file as soon as the next row starts, so the rows are
+    written in order and never kept. Each currency gets its own sheet with
+    the open invoices and refunds, then the pending payments, as they
+    stream from the database; the aging sheet holds one row per partner
+    and currency. Amounts, dates and days are native cells, so Excel can
+    sum and filter them.
+
+        writer = StatementXlsxWriter(env, spool)
+        writer.write_aging_sheet(entries, aging_labels, currency_by_id)
+        for row in move_rows:
+            writer.write_move(row)
+        writer.close()
+    """
+
+    _ORIGINAL_COLUMN = 6
+    _RESIDUAL_COLUMN = 7
+
+    def __init__(self, env, fileobj):
+        self.env = env
+        self.workbook = xlsxwriter.Workbook(fileobj, {"constant_memory": True})
+        self.header_format = self.workbook.add_format({"bold": True, "bottom": 1, "bg_color": "#EEEEEE"})
+        self.date_format = self.workbook.add_format({"num_format": STATEMENT_XLSX_DATE_FORMAT})
+        self.days_format = self.workbook.add_format({"num_format": "0"})
+        self.total_label_format = self.workbook.add_format({"bold": True, "top": 1})
+        self.amount_formats = {}
+        self.total_formats = {}
+        self.sheets = {}
+        self.no_partner_label = _("No Partner")
+        # (header, width) of the currency sheets
+        self.currency_sheet_columns = (
+            (_("Cliente"), 40),
+            (_("Tipo"), 18),
+            (_("Documento"), 24),
+            (_("Fecha"), 12),
+            (_("Vencimiento"), 12),
+            (_("Días vencidos"), 14),
+            (_("Importe original"), 18),
+            (_("Saldo"), 18),
+        )
+        self.type_labels = {
+            "out_invoice": _("Factura"),
+            "out_refund": _("Nota de crédito"),
+            "payment": _("Pago sin aplicar"),
+        }
+
+    # ------------------------------------------------------------------
+    # Formats
+    # ------------------------------------------------------------------
+    def _amount_format(self, currency):
+        digits = currency.decimal_places
+        if digits not in self.amount_formats:
+            self.amount_formats[digits] = self.workbook.add_format({"num_format": self._number_format(digits)})
+        return self.amount_formats[digits]
+
+    def _total_format(self, currency):
+        digits = currency.decimal_places
+        if digits not in self.total_formats:
+            self.total_formats[digits] = self.workbook.add_format(
+                {"num_format": self._number_format(digits), "bold": True, "top": 1}
+            )
+        return self.total_formats[digits]
+
+    def _number_format(self, digits):
+        return f"#,##0.{'0' * digits}" if digits > 0 else "#,##0"
+
+    # ------------------------------------------------------------------
+    # Aging sheet
+    # ------------------------------------------------------------------
+    def write_aging_sheet(self, entries, aging_labels, currency_by_id):
+        """One row per partner and currency of ``entries`` (see ``_get_statement_summary_entries``)."""
+        sheet = self.workbook.add_worksheet(_("Antigüedad"))
+        headers = [_("Cliente"), _("Moneda")] + list(aging_labels.values()) + [
+            _("Saldo facturas"),
+            _("Pagos pendientes"),
+            _("Saldo neto"),
+        ]
+        sheet.set_column(0, 0, 40)
+        sheet.set_column(1, 1, 10)
+        sheet.set_column(2, len(headers) - 1, 16)
+        sheet.write_row(0, 0, headers, self.header_format)
+        sheet.freeze_panes(1, 2)
+
+        row_index = 0
+        for row_index, entry in enumerate(entries, start=1):
+            amount_format = self._amount_format(currency_by_id[entry["currency_id"]])
+            sheet.write_string(row_index, 0, entry["partner_name"])
+            sheet.write_string(row_index, 1, entry["currency_name"])
+            amounts = [entry["aging"][bucket] for bucket in aging_labels]
+            amounts += [entry["open_total"], entry["pending_total"], entry["open_total"] - entry["pending_total"]]
+            for column, amount in enumerate(amounts, start=2):
+                sheet.write_number(row_index, column, amount, amount_format)
+        sheet.autofilter(0, 0, row_index, len(headers) - 1)
+
+    # ------------------------------------------------------------------
+    # Currency sheets
+    # ------------------------------------------------------------------
+    def add_currency_sheet(self, currency):
+        if currency.id in self.sheets:
+            return self.sheets[currency.id]
+        sheet = self.workbook.add_worksheet(currency.name)
+        for column, (header, width) in enumerate(self.currency_sheet_columns):
+            sheet.set_column(column, column, width)
+            sheet.write_string(0, column, header, self.header_format)
+        sheet.freeze_panes(1, 1)
+        state = self.sheets[currency.id] = {
+            "sheet": sheet,
+            "currency": currency,
+            "amount_format": self._amount_format(currency),
+            "row": 0,
+            "original_total": 0.0,
+            "residual_total": 0.0,
+        }
+        return state
+
+    def _currency_sheet(self, currency_id):
+        return self.sheets.get(currency_id) or self.add_currency_sheet(self.env["res.currency"].browse(currency_id))
+
+    def write_move(self, row):
+        """Append an open invoice/refund row of ``_iter_open_move_rows``; refunds are negative."""
+        sign = -1 if row["move_type"] == "out_refund" else 1
+        self._write_ledger_row(
+            self._currency_sheet(row["currency_id"]),
+            row["partner_name"],
+            self.type_labels.get(row["move_type"], row["move_type"]),
+            row["fp_consecutive_number"] or row["name"],
+            row["invoice_date"],
+            row["invoice_date_due"],
+            row["days_overdue"],
+            sign * row["amount_total"],
+            sign * row["amount_residual"],
+        )
+
+    def write_payment(self, row):
+        """Append a pending payment row of ``_iter_pending_payment_rows``, as a credit."""
+        self._write_ledger_row(
+            self._currency_sheet(row["currency_id"]),
+            row["partner_name"],
+            self.type_labels["payment"],
+            row["display_number"],
+            row["date"],
+            None,
+            None,
+            -row["payment_amount"],
+            -row["residual_amount"],
+        )
+
+    def _write_ledger_row(self, state, partner_name, type_label, number, date, date_due, days_overdue,
+                          original_amount, residual_amount):
+        sheet = state["sheet"]
+        state["row"] += 1
+        row_index = state["row"]
+        sheet.write_string(row_index, 0, partner_name or self.no_partner_label)
+        sheet.write_string(row_index, 1, type_label)
+        sheet.write_string(row_index, 2, number or "")
+        for column, value in ((3, date), (4, date_due)):
+            if value:
+                sheet.write_datetime(row_index, column, value, self.date_format)
+        if days_overdue is not None:
+            sheet.write_number(row_index, 5, days_overdue, self.days_format)
+        sheet.write_number(row_index, self._ORIGINAL_COLUMN, original_amount, state["amount_format"])
+        sheet.write_number(row_index, self._RESIDUAL_COLUMN, residual_amount, state["amount_format"])
+        state["original_total"] += original_amount
+        state["residual_total"] += residual_amount
+
+    def _write_totals(self, state):
+        """Closing row with SUBTOTAL formulas, so the totals follow the autofilter."""
+        sheet = state["sheet"]
+        last_row = state["row"]
+        total_row = last_row + 1
+        total_format = self._total_format(state["currency"])
+        sheet.write_string(total_row, 0, _("Total %(currency)s", currency=state["currency"].name),
+                           self.total_label_format)
+        for column, value in ((self._ORIGINAL_COLUMN, state["original_total"]),
+                              (self._RESIDUAL_COLUMN, state["residual_total"])):
+            if last_row:
+                cells = xlsxwriter.utility.xl_range(1, column, last_row, column)
+                sheet.write_formula(total_row, column, f"=SUBTOTAL(9,{cells})", total_format,
+                                    state["currency"].round(value))
+            else:
+                sheet.write_number(total_row, column, 0.0, total_format)
+        sheet.autofilter(0, 0, last_row, len(self.currency_sheet_columns) - 1)
+
+    def close(self):
+        for state in self.sheets.values():
+            self._write_totals(state)
+        self.workbook.close()
@@ -0,0 +1,13 @@
+from . import test_statement_indexes
+from . import test_statement_benchmark
+from . import test_statement_query_count
+from . import test_statement_formatter
+from . import test_statement_as_of
+from . import test_statement_prerender
+from . import test_statement_batch_run
+from . import test_statement_xlsx
+from . import test_statement_export_controller
+from . import test_statement_open_balance
+from . import test_statement_result_cache
+from . import test_statement_filters
+from . import test_statement_memory
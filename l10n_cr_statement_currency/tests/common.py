@@ -0,0 +1,108 @@
+from odoo.tools import SQL
+
+
+class StatementLedgerGenerator:
+    """Build a large synthetic receivable ledger for the statement benchmarks.
+
+    Creating hundreds of thousands of invoices through the ORM would take
+    hours, so a handful of template moves is created and posted the normal
+    way and then copied in SQL: every column of the template move and of
+    its lines is duplicated, only the partner, name and dates change. The
+    copies therefore carry the exact residuals, currencies and payment
+    links of real posted documents.
+    """
+
+    def __init__(self, env, spread_days=180):
+        self.env = env
+        self.spread_days = spread_days
+
+    def create_partners(self, count, prefix="Benchmark"):
+        start = self.env["res.partner"].search_count([("name", "=like", f"{prefix} %")])
+        return self.env["res.partner"].create([
+            {
+                "name": f"{prefix} {start + index:07d}",
+                "email": f"benchmark{start + index}@example.com",
+                # The send wizard only mails partners with a statement address.
+                "statement_email": f"benchmark{start + index}@example.com",
+                "customer_rank": 1,
+            }
+            for index in range(count)
+        ])
+
+    def clone_move(self, template, partners, copies_per_partner=1):
+        """Copy ``template`` ``copies_per_partner`` times for each partner; return the number of moves."""
+        if not partners or copies_per_partner <= 0:
+            return 0
+        self.env.flush_all()
+        move_columns = self._columns("account_move")
+        line_columns = self._columns("account_move_line")
+        # Each copy is shifted back a few days so the aging buckets fill up.
+        move_overrides = {
+            "partner_id": SQL("partner.id"),
+            "commercial_partner_id": SQL("partner.id"),
+            "name": SQL("move.name || '-B' || partner.id || '-' || serie.n"),
+            "date": SQL("move.date - shift.days"),
+            "invoice_date": SQL("move.invoice_date - shift.days"),
+            "invoice_date_due": SQL("move.invoice_date_due - shift.days"),
+        }
+        line_overrides = {
+            "move_id": SQL("new_move.id"),
+            "partner_id": SQL("new_move.partner_id"),
+            "move_name": SQL("new_move.name"),
+            "date": SQL("new_move.date"),
+            "invoice_date": SQL("new_move.invoice_date"),
+            "date_maturity": SQL(
+                "CASE WHEN line.date_maturity IS NULL THEN NULL "
+                "ELSE COALESCE(new_move.invoice_date_due, new_move.date) END"
+            ),
+        }
+        self.env.cr.execute(SQL(
+            """
+            WITH new_move AS (
+                INSERT INTO account_move (%(move_columns)s)
+                SELECT %(move_values)s
+                  FROM account_move move
+            CROSS JOIN unnest(%(partner_ids)s) AS partner(id)
+            CROSS JOIN generate_series(1, %(copies)s) AS serie(n)
+            CROSS JOIN LATERAL (SELECT MOD(serie.n * 7 + partner.id, %(spread)s)::integer AS days) shift
+                 WHERE move.id = %(template_id)s
+             RETURNING id, partner_id, name, date, invoice_date, invoice_date_due
+            )
+            INSERT INTO account_move_line (%(line_columns)s)
+            SELECT %(line_values)s
+              FROM account_move_line line
+        CROSS JOIN new_move
+             WHERE line.move_id = %(template_id)s
+            """,
+            move_columns=SQL(", ").join(SQL.identifier(column) for column in move_columns),
+            move_values=self._select_list("move", move_columns, move_overrides),
+            line_columns=SQL(", ").join(SQL.identifier(column) for column in line_columns),
+            line_values=self._select_list("line", line_columns, line_overrides),
+            partner_ids=partners.ids,
+            copies=copies_per_partner,
+            spread=self.spread_days,
+            template_id=template.id,
+        ))
+        self.env.invalidate_all()
+        return len(partners) * copies_per_partner
+
+    def _columns(self, table):
+        self.env.cr.execute(SQL(
+            """
+            SELECT column_name
+              FROM information_schema.columns
+             WHERE table_schema = current_schema()
+               AND table_name = %s
+               AND column_name <> 'id'
+               AND is_generated = 'NEVER'
+          ORDER BY ordinal_position
+            """,
+            table,
+        ))
+        return [row[0] for row in self.env.cr.fetchall()]
+
+    def _select_list(self, alias, columns, overrides):
+        return SQL(", ").join(
+            overrides.get(column) or SQL.identifier(alias, column)
+            for column in columns
+        )
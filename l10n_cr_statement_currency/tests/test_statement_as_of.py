@@ -0,0 +1,49 @@
+from datetime import timedelta
+
+from odoo import fields
+from odoo.tests import tagged
+
+from odoo.addons.account.tests.common import AccountTestInvoicingCommon
+
+
+@tagged("post_install", "-at_install")
+class TestStatementAsOf(AccountTestInvoicingCommon):
+    """A past cutoff shows the residuals as they were on that date."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.today = fields.Date.today()
+        cls.partner = cls.env["res.partner"].create({"name": "As of customer"})
+        cls.invoice = cls.init_invoice(
+            "out_invoice", cls.partner, cls.today - timedelta(days=20), amounts=[100.0], post=True
+        )
+        cls.env["account.payment.register"].with_context(
+            active_model="account.move", active_ids=cls.invoice.ids
+        ).create({"payment_date": cls.today - timedelta(days=5), "amount": 40.0})._create_payments()
+
+    def _invoice_residuals(self, cutoff_date):
+        data = self.partner._prepare_statement_data(cutoff_date)
+        return {
+            invoice["id"]: invoice["residual_amount"]
+            for entry in data["by_currency"]
+            for invoice in entry["invoices"]
+        }
+
+    def test_cutoff_before_payment(self):
+        residuals = self._invoice_residuals(self.today - timedelta(days=10))
+        self.assertAlmostEqual(residuals[self.invoice.id], 100.0)
+
+    def test_cutoff_after_payment(self):
+        residuals = self._invoice_residuals(self.today - timedelta(days=2))
+        self.assertAlmostEqual(residuals[self.invoice.id], 60.0)
+        self.assertAlmostEqual(self._invoice_residuals(self.today)[self.invoice.id], 60.0)
+
+    def test_report_lines_before_payment(self):
+        report = self.env.ref("l10n_cr_statement_currency.statement_report")
+        handler = self.env["account.outstanding.original.currency.report.handler"]
+        date_to = fields.Date.to_string(self.today - timedelta(days=10))
+        options = report.get_options({"date": {"date_to": date_to, "filter": "custom", "mode": "single"}})
+        moves = handler._get_grouped_moves(options)
+        currency_data = moves[self.partner.id][self.invoice.currency_id.id]
+        self.assertAlmostEqual(currency_data["subtotal_residual"], 100.0)
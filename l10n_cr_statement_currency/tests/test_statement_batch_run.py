@@ -0,0 +1,141 @@
+from odoo import api, fields
+from odoo.fields import Command
+from odoo.modules.registry import Registry
+from odoo.tests import tagged
+from odoo.tests.common import BaseCase, get_db_name
+from odoo.tools import SQL
+
+from odoo.addons.account.tests.common import AccountTestInvoicingCommon
+from odoo.addons.l10n_cr_statement_currency.models.statement_batch_shard import STATEMENT_SHARD_MAX_ATTEMPTS
+
+
+@tagged("post_install", "-at_install")
+class TestStatementBatchRun(AccountTestInvoicingCommon):
+    """Bulk runs are cut into disjoint partner shards, each processed once."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.env["ir.config_parameter"].sudo().set_param("l10n_cr_statement_currency.shard_items", 2)
+        cls.partners = cls.env["res.partner"].create([{"name": f"Batch customer {index}"} for index in range(3)])
+        for partner in cls.partners:
+            for amount in (100.0, 200.0):
+                cls.init_invoice("out_invoice", partner, fields.Date.today(), amounts=[amount], post=True)
+
+    def test_prerender_run(self):
+        run = self.env["statement.batch.run"]._start("prerender", self.env.company)
+        shards = run.shard_ids.sorted("partner_id_from")
+        self.assertGreaterEqual(len(shards), len(self.partners))
+        for previous, shard in zip(shards, shards[1:]):
+            self.assertLess(previous.partner_id_to, shard.partner_id_from)
+        self.assertEqual(self.env["statement.batch.run"]._start("prerender", self.env.company), run)
+
+        self.env["statement.batch.shard"]._cron_process_shards()
+        self.assertEqual(run.state, "done")
+        self.assertTrue(all(shard.attempt_count == 1 for shard in run.shard_ids))
+        prerendered = self.env["ir.attachment"].search([
+            ("res_model", "=", "res.partner"),
+            ("res_id", "in", self.partners.ids),
+            ("statement_prerendered", "=", True),
+        ])
+        self.assertEqual(set(prerendered.mapped("res_id")), set(self.partners.ids))
+
+    def test_refresh_run(self):
+        self.env["statement.open.balance"].sudo().search([("partner_id", "in", self.partners.ids)]).unlink()
+        run = self.env["statement.batch.run"]._start("refresh")
+        self.env["statement.batch.shard"]._cron_process_shards()
+        self.assertEqual(run.state, "done")
+        balances = self.env["statement.open.balance"].search([("partner_id", "in", self.partners.ids)])
+        self.assertEqual(set(balances.partner_id.ids), set(self.partners.ids))
+
+    def test_exhausted_shard_is_failed_until_retried(self):
+        run = self.env["statement.batch.run"]._start("prerender", self.env.company)
+        exhausted = run.shard_ids[0]
+        for _attempt in range(STATEMENT_SHARD_MAX_ATTEMPTS):
+            self.assertTrue(exhausted._start_attempt())
+        self.assertFalse(exhausted._start_attempt())
+
+        self.env["statement.batch.shard"]._cron_process_shards()
+        self.assertEqual(exhausted.state, "failed")
+        self.assertEqual(exhausted.attempt_count, STATEMENT_SHARD_MAX_ATTEMPTS)
+        self.assertEqual(set((run.shard_ids - exhausted).mapped("state")), {"done"})
+
+        exhausted.action_retry()
+        self.assertEqual(exhausted.attempt_count, 0)
+        self.env["statement.batch.shard"]._cron_process_shards()
+        self.assertEqual(run.state, "done")
+
+
+@tagged("post_install", "-at_install")
+class TestStatementBatchWorkers(BaseCase):
+    """Workers on committed transactions of their own, as the crons run them."""
+
+    def setUp(self):
+        super().setUp()
+        self.registry = Registry(get_db_name())
+        with self.registry.cursor() as cr:
+            cr.execute(SQL("SELECT COALESCE(MAX(id), 0) FROM statement_batch_run"))
+            self.last_run_id = cr.fetchone()[0]
+        # Registered first, so the committed rows go even if the setup fails.
+        self.addCleanup(self._delete_runs)
+        with self.registry.cursor() as cr:
+            # Negative partner ids: the shards have nothing to process.
+            run = self._env(cr)["statement.batch.run"].create({
+                "operation": "refresh",
+                "shard_ids": [
+                    Command.create({"partner_id_from": -number, "partner_id_to": -number}) for number in (2, 1)
+                ],
+            })
+            self.shard_ids = run.shard_ids.sorted("id").ids
+
+    def _env(self, cr):
+        return api.Environment(cr, api.SUPERUSER_ID, {})
+
+    def _delete_runs(self):
+        """Delete every run committed since the setup, with its shards and their attempts (cascade)."""
+        with self.registry.cursor() as cr:
+            cr.execute(SQL("DELETE FROM statement_batch_run WHERE id > %s", self.last_run_id))
+
+    def _shards(self, cr):
+        return self._env(cr)["statement.batch.shard"].browse(self.shard_ids)
+
+    def _crash_after_claim(self):
+        """Claim a shard and die: the worker transaction is lost, not the attempt."""
+        with self.registry.cursor() as cr:
+            shard_id = self._env(cr)["statement.batch.shard"]._claim_next().id
+            cr.rollback()
+        return shard_id
+
+    def test_claimed_shards_are_skipped(self):
+        with self.registry.cursor() as cr_1, self.registry.cursor() as cr_2, self.registry.cursor() as cr_3:
+            claimed_1 = self._env(cr_1)["statement.batch.shard"]._claim_next()
+            claimed_2 = self._env(cr_2)["statement.batch.shard"]._claim_next()
+            self.assertEqual([claimed_1.id, claimed_2.id], self.shard_ids)
+            self.assertFalse(self._env(cr_3)["statement.batch.shard"]._claim_next())
+        with self.registry.cursor() as cr:
+            self.assertEqual(self._shards(cr).mapped("attempt_count"), [1, 1])
+
+    def test_crashed_shard_is_resumed(self):
+        self.assertEqual(self._crash_after_claim(), self.shard_ids[0])
+        with self.registry.cursor() as cr:
+            self.assertEqual(self._shards(cr).mapped("state"), ["pending", "pending"])
+            self._env(cr)["statement.batch.shard"]._cron_process_shards()
+        with self.registry.cursor() as cr:
+            shards = self._shards(cr)
+            self.assertEqual(shards.mapped("state"), ["done", "done"])
+            self.assertEqual(shards.mapped("attempt_count"), [2, 1])
+
+    def test_shard_failed_after_max_attempts(self):
+        for _attempt in range(STATEMENT_SHARD_MAX_ATTEMPTS):
+            self.assertEqual(self._crash_after_claim(), self.shard_ids[0])
+        with self.registry.cursor() as cr:
+            self._env(cr)["statement.batch.shard"]._cron_process_shards()
+        with self.registry.cursor() as cr:
+            shards = self._shards(cr)
+            self.assertEqual(shards.mapped("state"), ["failed", "done"])
+            self.assertEqual(shards.mapped("attempt_count"), [STATEMENT_SHARD_MAX_ATTEMPTS, 1])
+
+    def test_concurrent_planning_is_skipped(self):
+        with self.registry.cursor() as cr_1, self.registry.cursor() as cr_2:
+            cr_1.execute(SQL("SELECT pg_advisory_xact_lock(hashtext(%s))", "statement.batch.run:refresh:0"))
+            self.assertFalse(self._env(cr_2)["statement.batch.run"]._start("refresh"))
@@ -0,0 +1,153 @@
+import json
+import logging
+import os
+import tempfile
+import time
+import tracemalloc
+
+from odoo import fields, release
+from odoo.tests import tagged
+
+from odoo.addons.account.tests.common import AccountTestInvoicingCommon
+
+from .common import StatementLedgerGenerator
+
+_logger = logging.getLogger(__name__)
+
+# Open moves per partner: per currency, INVOICES_PER_CURRENCY invoices plus
+# one refund and one unreconciled payment.
+INVOICES_PER_CURRENCY = 8
+
+
+@tagged("post_install", "-at_install", "-standard", "statement_benchmark")
+class TestStatementBenchmark(AccountTestInvoicingCommon):
+    """Scaling benchmark of the statement pipeline.
+
+    Not part of the regular test run; launch it with
+    ``--test-tags statement_benchmark``. Environment variables:
+
+    - ``STATEMENT_BENCHMARK_TIERS``: comma separated ledger sizes in moves
+      (default ``1000,10000,100000,1000000``);
+    - ``STATEMENT_BENCHMARK_MAIL_SAMPLE``: partners sent by the wizard
+      stage (default 10);
+    - ``STATEMENT_BENCHMARK_OUTPUT``: JSON results file (default
+      ``statement_benchmark.json`` in the temporary directory).
+
+    Each tier extends the ledger of the previous one, then wall time, SQL
+    query count and Python heap peak (tracemalloc) are recorded per stage.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.report = cls.env.ref("l10n_cr_statement_currency.statement_report")
+        cls.generator = StatementLedgerGenerator(cls.env)
+        cls.currencies = (
+            cls.company_data["currency"]
+            | cls.setup_other_currency("EUR")
+            | cls.setup_other_currency("CAD")
+        )
+        cls.templates = cls._create_templates()
+
+    @classmethod
+    def _create_templates(cls):
+        """One posted invoice, refund and payment per currency, copied by the generator."""
+        partner = cls.env["res.partner"].create({"name": "Benchmark template"})
+        invoice_date = fields.Date.today()
+        templates = {"invoices": [], "others": []}
+        for currency in cls.currencies:
+            templates["invoices"].append(cls.init_invoice(
+                "out_invoice", partner, invoice_date, amounts=[1000.0], currency=currency, post=True
+            ))
+            templates["others"].append(cls.init_invoice(
+                "out_refund", partner, invoice_date, amounts=[150.0], currency=currency, post=True
+            ))
+            payment = cls.env["account.payment"].create({
+                "payment_type": "inbound",
+                "partner_type": "customer",
+                "partner_id": partner.id,
+                "amount": 300.0,
+                "currency_id": currency.id,
+                "journal_id": cls.company_data["default_journal_bank"].id,
+            })
+            payment.action_post()
+            # Payments only get a journal entry when an outstanding account is set.
+            if payment.move_id:
+                templates["others"].append(payment.move_id)
+        return templates
+
+    def test_statement_benchmark(self):
+        tiers = os.environ.get("STATEMENT_BENCHMARK_TIERS", "1000,10000,100000,1000000")
+        tiers = [int(size) for size in tiers.split(",")]
+        mail_sample = int(os.environ.get("STATEMENT_BENCHMARK_MAIL_SAMPLE", "10"))
+        output = os.environ.get("STATEMENT_BENCHMARK_OUTPUT") or os.path.join(
+            tempfile.gettempdir(), "statement_benchmark.json"
+        )
+        moves_per_partner = len(self.templates["invoices"]) * INVOICES_PER_CURRENCY + len(self.templates["others"])
+
+        results = []
+        partners = self.env["res.partner"]
+        for tier in sorted(tiers):
+            new_partners = self.generator.create_partners(max(tier // moves_per_partner - len(partners), 0))
+            for template in self.templates["invoices"]:
+                self.generator.clone_move(template, new_partners, INVOICES_PER_CURRENCY)
+            for template in self.templates["others"]:
+                self.generator.clone_move(template, new_partners)
+            partners |= new_partners
+            self.env["statement.open.balance"]._rebuild_all()
+
+            moves = len(partners) * moves_per_partner
+            for stage, function in self._stages(partners[:mail_sample]):
+                results.append(dict(self._measure(function), stage=stage, moves=moves, partners=len(partners)))
+                _logger.info("Statement benchmark: %s", results[-1])
+
+        with open(output, "w", encoding="utf-8") as result_file:
+            json.dump(
+                {
+                    "odoo_version": release.version,
+                    "module_version": self.env["ir.module.module"]._get("l10n_cr_statement_currency").latest_version,
+                    "date": fields.Datetime.to_string(fields.Datetime.now()),
+                    "moves_per_partner": moves_per_partner,
+                    "results": results,
+                },
+                result_file,
+                indent=2,
+            )
+        _logger.info("Statement benchmark results written to %s", output)
+
+    def _stages(self, mail_partners):
+        folded_options = self.report.get_options({})
+        unfolded_options = self.report.get_options({"unfold_all": True})
+        handler = self.env["account.outstanding.original.currency.report.handler"]
+        statement_partners = self.report._statement_partners_from_options(folded_options)
+        return [
+            ("dynamic_lines_folded", lambda: handler._dynamic_lines_generator(self.report, folded_options, {})),
+            ("report_lines_unfold_all", lambda: self.report._get_lines(unfolded_options)),
+            # Row storage alone: the peak memory tracks the size of the move rows.
+            ("grouped_moves", lambda: handler._get_grouped_moves(unfolded_options)),
+            ("prepare_statement_data", lambda: statement_partners._prepare_statement_data_batch()),
+            ("export_custom_pdf", lambda: self.report._export_statement_to_custom_pdf(folded_options)),
+            ("send_wizard", lambda: self._send_statements(mail_partners)),
+        ]
+
+    def _send_statements(self, partners):
+        for partner in partners:
+            wizard = self.env["statement.send.wizard"].with_context(default_partner_id=partner.id).create({})
+            wizard.action_send_statement()
+
+    def _measure(self, function):
+        self.env.invalidate_all()
+        queries_before = self.env.cr.sql_log_count
+        tracemalloc.start()
+        started = time.perf_counter()
+        try:
+            function()
+            wall_time = time.perf_counter() - started
+            peak_memory = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        return {
+            "wall_time": round(wall_time, 3),
+            "queries": self.env.cr.sql_log_count - queries_before,
+            "peak_memory_kb": peak_memory // 1024,
+        }
@@ -0,0 +1,25 @@
+import json
+from urllib.parse import urlencode
+
+from odoo.tests import HttpCase, tagged
+
+
+@tagged("post_install", "-at_install")
+class TestStatementExportController(HttpCase):
+    """The export routes only run on the statement reports."""
+
+    def _url(self, route, report_id):
+        return f"/l10n_cr_statement_currency/{route}?" + urlencode({"report_id": report_id, "options": json.dumps({})})
+
+    def test_other_report_is_not_found(self):
+        other_report = self.env["account.report"].search([
+            ("id", "not in", [
+                self.env.ref("l10n_cr_statement_currency.statement_report").id,
+                self.env.ref("l10n_cr_statement_currency.statement_summary_report").id,
+            ]),
+        ], limit=1)
+        self.authenticate("admin", "admin")
+        for route in ("statements_zip", "statement_xlsx"):
+            for report_id in (other_report.id, "not-an-id"):
+                with self.subTest(route=route, report_id=report_id):
+                    self.assertEqual(self.url_open(self._url(route, report_id)).status_code, 404)
@@ -0,0 +1,75 @@
+import json
+from datetime import timedelta
+from urllib.parse import parse_qs, urlsplit
+
+from odoo import fields
+from odoo.exceptions import UserError
+from odoo.tests import tagged
+
+from odoo.addons.account.tests.common import AccountTestInvoicingCommon
+
+
+@tagged("post_install", "-at_install")
+class TestStatementFilters(AccountTestInvoicingCommon):
+    """Due date filters select the partners, for invoices and pending payments alike."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.report = cls.env.ref("l10n_cr_statement_currency.statement_report")
+        cls.handler = cls.env["account.outstanding.original.currency.report.handler"]
+        today = fields.Date.today()
+        cls.overdue_partner = cls.env["res.partner"].create({"name": "Overdue customer"})
+        cls.current_partner = cls.env["res.partner"].create({"name": "Current customer"})
+        for partner, invoice_date in ((cls.overdue_partner, today - timedelta(days=90)), (cls.current_partner, today)):
+            cls.init_invoice("out_invoice", partner, invoice_date, amounts=[100.0], post=True)
+            cls.env["account.payment"].create({
+                "payment_type": "inbound",
+                "partner_type": "customer",
+                "partner_id": partner.id,
+                "amount": 30.0,
+                "journal_id": cls.company_data["default_journal_bank"].id,
+            }).action_post()
+        cls.partners = cls.overdue_partner | cls.current_partner
+
+    def _options(self, **filters):
+        options = self.report.get_options({})
+        options.update(filters, partner_ids=self.partners.ids)
+        return options
+
+    def _payment_partners(self, options):
+        return {row["partner_id"] for row in self.handler._compute_partner_totals(options, "pending_payments")}
+
+    def test_days_overdue_filters_pending_payments(self):
+        self.assertEqual(self._payment_partners(self._options()), set(self.partners.ids))
+        options = self._options(statement_min_days_overdue=60)
+        self.assertEqual(self._payment_partners(options), {self.overdue_partner.id})
+        self.assertEqual([partner_id for partner_id, __ in self.handler._get_statement_partners(options)],
+                         self.overdue_partner.ids)
+
+    def test_aging_bucket_filters_pending_payments(self):
+        options = self._options(statement_aging_buckets=["current"])
+        self.assertEqual(self._payment_partners(options), {self.current_partner.id})
+
+    def test_zip_export_keeps_filters(self):
+        action = self.report.action_export_statement_zip(self._options(statement_min_days_overdue=60))
+        url_options = json.loads(parse_qs(urlsplit(action["url"]).query)["options"][0])
+        self.assertEqual(url_options["statement_min_days_overdue"], 60)
+        self.assertEqual(self.report._statement_partners_from_options(url_options), self.overdue_partner)
+
+    def test_zip_export_checks_partners_without_listing_them(self):
+        for filters in (
+            {},
+            {"statement_min_days_overdue": 60},
+            {"statement_min_days_overdue": 1000},
+            {"statement_min_balance": 1000.0},
+            {"statement_aging_buckets": ["current"]},
+        ):
+            options = self._options(**filters)
+            self.assertEqual(
+                self.report._statement_has_partners(options),
+                bool(self.report._statement_partners_from_options(options)),
+                filters,
+            )
+        with self.assertRaises(UserError):
+            self.report.action_export_statement_zip(self._options(statement_min_days_overdue=1000))
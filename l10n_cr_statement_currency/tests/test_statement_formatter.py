@@ -0,0 +1,32 @@
+from odoo.tests import TransactionCase, tagged
+from odoo.tools.misc import formatLang
+
+from odoo.addons.l10n_cr_statement_currency.models.statement_formatter import statement_amount_formatter
+
+
+@tagged("post_install", "-at_install")
+class TestStatementFormatter(TransactionCase):
+
+    def test_formatter_matches_formatlang(self):
+        amounts = [0.0, 0.005, -0.015, 1.0, -12.345, 999.995, 1234567.891, -98765432.1]
+        currencies = self.env.ref("base.USD") | self.env.ref("base.EUR") | self.env.ref("base.CRC")
+        for lang_code in ("en_US", "es_CR", "fr_FR"):
+            self.env["res.lang"]._activate_lang(lang_code)
+            env = self.env(context=dict(self.env.context, lang=lang_code))
+            for currency in currencies.with_env(env):
+                for amount in amounts:
+                    expected = formatLang(env, amount, currency_obj=currency)
+                    self.assertEqual(statement_amount_formatter(env, currency)(amount), expected)
+                    self.assertEqual(
+                        statement_amount_formatter(env, currency, ascii_space=True)(amount),
+                        expected.replace("\u00a0", " "),
+                    )
+
+    def test_formatter_follows_currency_changes(self):
+        currency = self.env.ref("base.USD")
+        for position in ("before", "after"):
+            currency.position = position
+            self.assertEqual(
+                statement_amount_formatter(self.env, currency)(1.0),
+                formatLang(self.env, 1.0, currency_obj=currency),
+            )
@@ -0,0 +1,57 @@
+from odoo import fields
+from odoo.tests import tagged
+from odoo.tools import SQL
+
+from odoo.addons.account.tests.common import AccountTestInvoicingCommon
+
+
+@tagged("post_install", "-at_install")
+class TestStatementIndexes(AccountTestInvoicingCommon):
+    """The statement readers must be served by the module partial indexes."""
+
+    def setUp(self):
+        super().setUp()
+        self.handler = self.env["account.outstanding.original.currency.report.handler"]
+        # Test tables are tiny, so a sequential scan would always win; forbid
+        # it to see whether the planner is able to use the index at all.
+        self.env.cr.execute("SET LOCAL enable_seqscan = off")
+
+    def _explain(self, query):
+        self.env.cr.execute(SQL("EXPLAIN %s", query.select()))
+        return "\n".join(row[0] for row in self.env.cr.fetchall())
+
+    def test_indexes_exist(self):
+        self.env.cr.execute(
+            "SELECT indexname FROM pg_indexes WHERE indexname IN %s",
+            [("account_move__statement_open_receivable_idx", "account_move_line__statement_pending_payment_idx")],
+        )
+        self.assertEqual(len(self.env.cr.fetchall()), 2)
+
+    def test_report_open_moves_use_index(self):
+        options = {"date": {"date_to": fields.Date.to_string(fields.Date.today())}}
+        plan = self._explain(self.handler._search_open_moves(self.handler._get_moves_domain(options)))
+        self.assertIn("statement_open_receivable_idx", plan)
+
+    def test_partner_open_moves_use_index(self):
+        partner = self.partner_a
+        domain = partner._statement_invoice_domain(fields.Date.today())
+        plan = self._explain(self.handler._search_open_moves(domain))
+        self.assertIn("statement_open_receivable_idx", plan)
+
+    def test_pending_payments_use_index(self):
+        options = {"date": {"date_to": fields.Date.to_string(fields.Date.today())}}
+        domain = self.handler._get_pending_payment_lines_domain(options)
+        plan = self._explain(self.handler._search_pending_payment_lines(domain))
+        self.assertIn("statement_pending_payment_idx", plan)
+
+    def test_predicates_are_qualified(self):
+        # Another account_move alias in the query (an order or record rule join) must not make them ambiguous.
+        options = {"date": {"date_to": fields.Date.to_string(fields.Date.today())}}
+        for query in (
+            self.handler._search_open_moves(self.handler._get_moves_domain(options)),
+            self.handler._search_pending_payment_lines(self.handler._get_pending_payment_lines_domain(options)),
+        ):
+            query.add_join("LEFT JOIN", "statement_other", query.table, SQL(
+                "statement_other.id = %s", SQL.identifier(query.table, "id")
+            ))
+            self.env.cr.execute(query.select(SQL.identifier(query.table, "id")))
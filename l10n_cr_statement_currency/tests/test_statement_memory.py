@@ -0,0 +1,91 @@
+import tracemalloc
+from unittest.mock import patch
+
+from odoo import fields
+from odoo.tests import tagged
+from odoo.tools import SQL
+
+from odoo.addons.account.tests.common import AccountTestInvoicingCommon
+from odoo.addons.l10n_cr_statement_currency.models.statement_partner_groups import StatementPartnerGroups
+
+HANDLER_MODULE = "odoo.addons.l10n_cr_statement_currency.models.outstanding_original_currency_report"
+
+
+@tagged("post_install", "-at_install")
+class TestStatementMemory(AccountTestInvoicingCommon):
+    """Peak memory of the streamed paths must not follow the ledger size.
+
+    Each check runs a path on a small and on a much larger row set, under
+    ``tracemalloc``, and expects about the same peak; holding the rows
+    would make the second peak several times the first.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.report = cls.env.ref("l10n_cr_statement_currency.statement_report")
+        cls.handler = cls.env["account.outstanding.original.currency.report.handler"]
+        cls.partners = cls.env["res.partner"].create([{"name": f"Memory customer {index}"} for index in range(3)])
+        for partner in cls.partners:
+            for amount in (100.0, 200.0):
+                cls.init_invoice("out_invoice", partner, fields.Date.today(), amounts=[amount], post=True)
+            cls.env["account.payment"].create({
+                "payment_type": "inbound",
+                "partner_type": "customer",
+                "partner_id": partner.id,
+                "amount": 30.0,
+                "journal_id": cls.company_data["default_journal_bank"].id,
+            }).action_post()
+
+    def _peak(self, function):
+        # A first call fills the caches (registry, SQL, imports) out of the measure.
+        function()
+        tracemalloc.start()
+        try:
+            function()
+            return tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    def assertPeakFlat(self, function, small, large):
+        small_peak = self._peak(lambda: function(small))
+        large_peak = self._peak(lambda: function(large))
+        self.assertLess(large_peak, small_peak * 1.5, f"Peak memory grows with the rows: {small_peak} -> {large_peak}")
+
+    def test_streamed_rows(self):
+        def stream(size):
+            query = SQL(
+                "SELECT row_id AS id, repeat('x', 64) AS name FROM generate_series(1, %s) row_id ORDER BY row_id",
+                size,
+            )
+            for __ in self.handler._stream_rows(query):
+                pass
+
+        self.assertPeakFlat(stream, 4000, 40000)
+
+    def test_partner_groups(self):
+        def load(partner_ids):
+            return {
+                partner_id: {1: {"moves": [(partner_id, index) for index in range(500)]}} for partner_id in partner_ids
+            }
+
+        def unfold(partner_count):
+            partner_ids = range(partner_count)
+            groups = StatementPartnerGroups(load, partner_ids, chunk_size=10)
+            for partner_id in partner_ids:
+                groups.get(partner_id, {})
+
+        self.assertPeakFlat(unfold, 50, 500)
+
+    def test_unfold_all_by_chunks(self):
+        lines = self.report._get_lines(self.report.get_options({"unfold_all": True}))
+        with patch(f"{HANDLER_MODULE}.STATEMENT_UNFOLD_PARTNER_CHUNK", 1):
+            batch_data = self.handler._custom_unfold_all_batch_data_generator(
+                self.report,
+                self.report.get_options({"unfold_all": True}),
+                {"_report_expand_unfoldable_line_statement_partner": []},
+            )
+            for partner in self.partners:
+                self.assertTrue(batch_data["moves"].get(partner.id))
+            self.assertEqual(batch_data["moves"].load_count, len(self.partners))
+            self.assertEqual(self.report._get_lines(self.report.get_options({"unfold_all": True})), lines)
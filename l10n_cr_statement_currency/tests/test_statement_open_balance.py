@@ -0,0 +1,96 @@
+from datetime import timedelta
+
+from odoo import fields
+from odoo.tests import tagged
+
+from odoo.addons.account.tests.common import AccountTestInvoicingCommon
+
+
+@tagged("post_install", "-at_install")
+class TestStatementOpenBalance(AccountTestInvoicingCommon):
+    """The summary table answers like the ledger, or is not used."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        # Rows are dated in the timezone of their company.
+        cls.env.company.partner_id.tz = "UTC"
+        cls.today = fields.Date.today()
+        cls.open_balance = cls.env["statement.open.balance"]
+        cls.handler = cls.env["account.outstanding.original.currency.report.handler"]
+        cls.partner = cls.env["res.partner"].create({"name": "Summary customer"})
+        cls.init_invoice("out_invoice", cls.partner, cls.today, amounts=[100.0], post=True)
+        cls.init_invoice("out_invoice", cls.partner, cls.today + timedelta(days=10), amounts=[50.0], post=True)
+        cls.partnerless = cls.init_invoice(
+            "out_invoice", cls.env["res.partner"].create({"name": "Removed"}), cls.today, amounts=[30.0], post=True
+        )
+        # Posting requires a customer: drop it afterwards, as imported ledgers may have.
+        cls.env.flush_all()
+        cls.env.cr.execute(
+            "UPDATE account_move SET partner_id = NULL WHERE id = %s;"
+            "UPDATE account_move_line SET partner_id = NULL WHERE move_id = %s",
+            (cls.partnerless.id, cls.partnerless.id),
+        )
+        cls.env.invalidate_all()
+        cls.open_balance._rebuild_all()
+
+    def _summary_totals(self):
+        rows = self.open_balance._fetch_summary_rows(self.env.companies.ids)
+        totals = {}
+        for row in rows:
+            totals[row["partner_id"]] = totals.get(row["partner_id"], 0.0) + row["open_total"]
+        return totals
+
+    def _live_totals(self):
+        options = {"date": {"date_to": fields.Date.to_string(self.today)}}
+        rows = self.handler._fetch_open_move_aging_totals(
+            self.handler._get_moves_domain(options), self.today, self.env.company._get_statement_aging_limits()
+        )
+        totals = {}
+        for row in rows:
+            totals[row["partner_id"]] = totals.get(row["partner_id"], 0.0) + row["residual"]
+        return totals
+
+    def test_summary_matches_ledger(self):
+        summary, live = self._summary_totals(), self._live_totals()
+        self.assertAlmostEqual(summary[self.partner.id], 100.0)
+        self.assertAlmostEqual(summary[None], live[None])
+        self.assertAlmostEqual(summary[self.partner.id], live[self.partner.id])
+
+    def test_aging_change_reads_ledger_until_refreshed(self):
+        self.assertTrue(self.open_balance._is_usable_for(self.today, []))
+        self.env.company.statement_aging_period_1 += 1
+        self.assertFalse(self.open_balance._is_usable_for(self.today, []))
+        # The triggered rebuild cron plans the refresh run, the workers run it.
+        self.open_balance._cron_rebuild()
+        self.assertFalse(self.env.company.statement_balance_outdated)
+        self.assertFalse(self.open_balance._is_usable_for(self.today, []))
+        self.env["statement.batch.shard"]._cron_process_shards()
+        self.assertTrue(self.open_balance._is_usable_for(self.today, []))
+
+    def test_rows_of_yesterday_are_not_used(self):
+        self.env.cr.execute("UPDATE statement_open_balance SET date_computed = %s", (self.today - timedelta(days=1),))
+        self.assertFalse(self.open_balance._is_usable_for(self.today, []))
+
+    def test_rows_follow_the_company_date(self):
+        # One of these zones is always on another day than UTC.
+        for tz in ("Pacific/Kiritimati", "Pacific/Pago_Pago"):
+            self.env.company.partner_id.tz = tz
+            company_date = self.open_balance._get_company_dates(self.env.company.ids)[self.env.company.id]
+            if company_date != self.today:
+                break
+        self.open_balance._refresh()
+        rows = self.open_balance.search([("company_id", "=", self.env.company.id)])
+        self.assertEqual(set(rows.mapped("date_computed")), {company_date})
+        # The user's timezone plays no part.
+        for user_tz in ("UTC", "Pacific/Kiritimati", "Pacific/Pago_Pago"):
+            open_balance = self.open_balance.with_context(tz=user_tz)
+            self.assertTrue(open_balance._is_usable_for(company_date, []))
+            self.assertFalse(open_balance._is_usable_for(self.today, []))
+
+    def test_vendor_bills_leave_the_summary_alone(self):
+        self.env.cr.precommit.clear()
+        self.init_invoice("in_invoice", self.partner, self.today, amounts=[80.0], post=True)
+        self.assertFalse(self.open_balance._has_uncommitted_ledger_changes())
+        self.init_invoice("out_invoice", self.partner, self.today, amounts=[80.0], post=True)
+        self.assertTrue(self.open_balance._has_uncommitted_ledger_changes())
@@ -0,0 +1,80 @@
+from unittest.mock import patch
+
+from odoo import fields
+from odoo.tests import tagged
+
+from odoo.addons.account.tests.common import AccountTestInvoicingCommon
+
+
+@tagged("post_install", "-at_install")
+class TestStatementPrerender(AccountTestInvoicingCommon):
+    """Pre-rendered statements are served while current and replaced once outdated."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.partner = cls.env["res.partner"].create({"name": "Pre-render customer"})
+        cls.init_invoice("out_invoice", cls.partner, fields.Date.today(), amounts=[100.0], post=True)
+
+    def _prerendered(self):
+        return self.env["ir.attachment"].search([
+            ("res_model", "=", "res.partner"),
+            ("res_id", "=", self.partner.id),
+            ("statement_prerendered", "=", True),
+        ])
+
+    def test_print_serves_prerendered_pdf(self):
+        self.partner._prerender_statements()
+        attachment = self._prerendered()
+        self.assertEqual(len(attachment), 1)
+        action = self.partner.action_print_statement_pdf()
+        self.assertEqual(action["type"], "ir.actions.act_url")
+        self.assertIn(f"/web/content/{attachment.id}", action["url"])
+        self.assertEqual(self.partner._render_statement_report_pdf(), attachment)
+
+    def test_outdated_prerender_is_replaced(self):
+        self.partner._prerender_statements()
+        outdated = self._prerendered()
+        self.init_invoice("out_invoice", self.partner, fields.Date.today(), amounts=[50.0], post=True)
+        action = self.partner.action_print_statement_pdf()
+        self.assertEqual(action["type"], "ir.actions.act_url")
+        self.assertNotIn(f"/web/content/{outdated.id}", action["url"])
+
+        self.partner._prerender_statements()
+        self.assertFalse(outdated.exists())
+        self.assertEqual(len(self._prerendered()), 1)
+
+    def _count_preparations(self):
+        partner_class = type(self.env["res.partner"])
+        return patch.object(
+            partner_class,
+            "_prepare_statement_data_batch",
+            autospec=True,
+            side_effect=partner_class._prepare_statement_data_batch,
+        )
+
+    def test_print_prepares_data_once(self):
+        # No stored PDF: the data read for the lookup is the one rendered.
+        with self._count_preparations() as prepare:
+            self.partner.action_print_statement_pdf()
+        self.assertEqual(prepare.call_count, 1)
+
+    def test_report_export_prepares_data_once(self):
+        report = self.env.ref("l10n_cr_statement_currency.statement_report")
+        with self._count_preparations() as prepare:
+            report._render_statement_pdf(self.partner, fields.Date.context_today(report))
+        self.assertEqual(prepare.call_count, 1)
+
+    def test_companies_keep_their_prerenders(self):
+        company_2 = self.setup_other_company()["company"]
+        partner_2 = self.partner.with_company(company_2)
+        self.partner._prerender_statements()
+        partner_2._prerender_statements()
+        self.assertEqual(set(self._prerendered().company_id.ids), {self.env.company.id, company_2.id})
+
+        # A new run of one company leaves the pre-renders of the other current.
+        self.partner._prerender_statements()
+        self.assertEqual(set(self._prerendered().company_id.ids), {self.env.company.id, company_2.id})
+        report = self.env.ref("l10n_cr_statement_currency.statement_report").with_company(company_2)
+        data_by_partner = partner_2._prepare_statement_data_batch()
+        self.assertIsNotNone(report._get_prerendered_statement_pdf(partner_2, data_by_partner))
@@ -0,0 +1,103 @@
+from unittest.mock import patch
+
+from odoo import fields
+from odoo.tests import tagged
+
+from odoo.addons.account.tests.common import AccountTestInvoicingCommon
+
+
+@tagged("post_install", "-at_install")
+class TestStatementQueryCount(AccountTestInvoicingCommon):
+    """The statement entry points must run a number of queries independent of the data size.
+
+    Every check counts the queries of an entry point, doubles the customers
+    (and the moves of each new customer), counts again and expects the same
+    number, so a field read inside a loop fails here.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.report = cls.env.ref("l10n_cr_statement_currency.statement_report")
+        cls.handler = cls.env["account.outstanding.original.currency.report.handler"]
+        cls.other_currency = cls.setup_other_currency("EUR")
+        cls.customers = cls._create_customers(2, invoices_per_currency=1)
+
+    @classmethod
+    def _create_customers(cls, count, invoices_per_currency):
+        invoice_date = fields.Date.today()
+        customers = cls.env["res.partner"]
+        for __ in range(count):
+            partner = cls.env["res.partner"].create({"name": "Statement customer", "email": "customer@example.com"})
+            for currency in cls.company_data["currency"] | cls.other_currency:
+                for __ in range(invoices_per_currency):
+                    cls.init_invoice(
+                        "out_invoice", partner, invoice_date, amounts=[100.0], currency=currency, post=True
+                    )
+                cls.init_invoice("out_refund", partner, invoice_date, amounts=[10.0], currency=currency, post=True)
+                cls.env["account.payment"].create({
+                    "payment_type": "inbound",
+                    "partner_type": "customer",
+                    "partner_id": partner.id,
+                    "amount": 30.0,
+                    "currency_id": currency.id,
+                    "journal_id": cls.company_data["default_journal_bank"].id,
+                }).action_post()
+            customers |= partner
+        return customers
+
+    def _count_queries(self, function):
+        # A first call fills the registry caches (views, report, ormcache).
+        function()
+        self.env.invalidate_all()
+        queries_before = self.env.cr.sql_log_count
+        function()
+        return self.env.cr.sql_log_count - queries_before
+
+    def assertQueryCountConstant(self, function):
+        small = self._count_queries(function)
+        self.customers |= self._create_customers(len(self.customers), invoices_per_currency=2)
+        self.assertEqual(self._count_queries(function), small, "Query count grows with the number of partners/moves")
+
+    def test_dynamic_lines_folded(self):
+        self.assertQueryCountConstant(
+            lambda: self.handler._dynamic_lines_generator(self.report, self.report.get_options({}), {})
+        )
+
+    def test_report_lines_unfold_all(self):
+        self.assertQueryCountConstant(lambda: self.report._get_lines(self.report.get_options({"unfold_all": True})))
+
+    def test_prepare_statement_data(self):
+        self.assertQueryCountConstant(lambda: self.customers._prepare_statement_data_batch())
+
+    def test_prepare_statement_data_summary_only(self):
+        self.assertQueryCountConstant(lambda: self.customers._prepare_statement_data_batch(summary_only=True))
+
+    def test_summary_report_lines(self):
+        summary_report = self.env.ref("l10n_cr_statement_currency.statement_summary_report")
+        self.assertQueryCountConstant(lambda: summary_report._get_lines(summary_report.get_options({})))
+
+    def test_statement_partners_from_options(self):
+        self.assertQueryCountConstant(
+            lambda: self.report._statement_partners_from_options(self.report.get_options({})).mapped("name")
+        )
+
+    def test_statement_template(self):
+        self.assertQueryCountConstant(
+            lambda: self.env["ir.actions.report"]._render_qweb_html(
+                "l10n_cr_statement_currency.action_partner_statement_pdf", self.customers.ids
+            )
+        )
+
+    def test_streamed_rows_match_fetched_rows(self):
+        # A batch smaller than the result set makes the stream go through several FETCH round trips.
+        domain = [("partner_id", "in", self.customers.ids)]
+        with patch(
+            "odoo.addons.l10n_cr_statement_currency.models.outstanding_original_currency_report."
+            "STATEMENT_FETCH_BATCH_SIZE",
+            3,
+        ):
+            self.assertEqual(list(self.handler._iter_open_move_rows(domain)), self.handler._fetch_open_move_rows(domain))
+            self.assertEqual(
+                list(self.handler._iter_pending_payment_rows(domain)), self.handler._fetch_pending_payment_rows(domain)
+            )
@@ -0,0 +1,105 @@
+from unittest.mock import patch
+
+from odoo import fields
+from odoo.tests import tagged
+
+from odoo.addons.account.tests.common import AccountTestInvoicingCommon
+from odoo.addons.l10n_cr_statement_currency.models.outstanding_original_currency_report import (
+    STATEMENT_RESULT_CACHE,
+)
+from odoo.addons.l10n_cr_statement_currency.models.statement_cache import StatementResultCache
+
+HANDLER_CLASS = "odoo.addons.l10n_cr_statement_currency.models.outstanding_original_currency_report." \
+                "OutstandingOriginalCurrencyReportHandler"
+
+
+@tagged("post_install", "-at_install")
+class TestStatementResultCache(AccountTestInvoicingCommon):
+    """Cached report data is reused until the ledger marker moves, and stays bounded."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.report = cls.env.ref("l10n_cr_statement_currency.statement_report")
+        cls.handler = cls.env["account.outstanding.original.currency.report.handler"]
+        cls.open_balance = cls.env["statement.open.balance"]
+        cls.partner = cls.env["res.partner"].create({"name": "Cached customer"})
+        cls.init_invoice("out_invoice", cls.partner, fields.Date.today(), amounts=[100.0], post=True)
+
+    def setUp(self):
+        super().setUp()
+        STATEMENT_RESULT_CACHE.clear()
+        self.addCleanup(STATEMENT_RESULT_CACHE.clear)
+        # The bypass of test mode and of transactions that changed the ledger is lifted.
+        patcher = patch(f"{HANDLER_CLASS}._use_result_cache", return_value=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.options = self.report.get_options({})
+        self.computed = 0
+
+    def _cached(self):
+        def compute():
+            self.computed += 1
+            return self.handler._compute_partner_totals(self.options, "moves")
+        return self.handler._get_cached_result(self.options, ("partner_totals", "moves"), compute)
+
+    def test_reused_until_ledger_changes(self):
+        first = self._cached()
+        self.assertEqual(self._cached(), first)
+        self.assertEqual(self.computed, 1)
+
+        self.env.cr.precommit.clear()
+        marker = self.open_balance._get_ledger_change_marker()
+        self.open_balance._mark_ledger_changed()
+        self.assertEqual(self.open_balance._get_ledger_change_marker(), marker + 1)
+        # One row per transaction, however many changes it makes.
+        self.open_balance._mark_ledger_changed()
+        self.assertEqual(self.open_balance._get_ledger_change_marker(), marker + 1)
+        self._cached()
+        self.assertEqual(self.computed, 2)
+
+        # Compaction keeps the marker, so the entries stay valid.
+        self.open_balance._compact_ledger_changes()
+        self.assertEqual(self.open_balance._get_ledger_change_marker(), marker + 1)
+        self._cached()
+        self.assertEqual(self.computed, 2)
+
+    def test_unfold_all_rows_are_not_cached(self):
+        for amount in (200.0, 300.0, 400.0):
+            self.init_invoice("out_invoice", self.partner, fields.Date.today(), amounts=[amount], post=True)
+        options = self.report.get_options({"unfold_all": True})
+        batch_data = self.handler._custom_unfold_all_batch_data_generator(
+            self.report, options, {"_report_expand_unfoldable_line_statement_partner": []}
+        )
+        # The partner order (totals) is cached, the moves loaded from it are not.
+        rows = STATEMENT_RESULT_CACHE.rows
+        self.assertTrue(rows)
+        currency_groups = batch_data["moves"].get(self.partner.id)
+        self.assertEqual(sum(len(group["moves"]) for group in currency_groups.values()), 4)
+        batch_data["pending_payments"].get(self.partner.id)
+        self.assertEqual(STATEMENT_RESULT_CACHE.rows, rows)
+
+    def test_ledger_changing_transaction_is_flagged(self):
+        self.env.cr.precommit.clear()
+        self.assertFalse(self.open_balance._has_uncommitted_ledger_changes())
+        self.open_balance._mark_ledger_changed()
+        self.assertTrue(self.open_balance._has_uncommitted_ledger_changes())
+
+    def test_only_renamed_customers_move_the_marker(self):
+        vendor = self.env["res.partner"].create({"name": "Uncached vendor"})
+        self.env.cr.precommit.clear()
+        vendor.name = "Renamed vendor"
+        self.assertFalse(self.open_balance._has_uncommitted_ledger_changes())
+        self.partner.name = "Renamed customer"
+        self.assertTrue(self.open_balance._has_uncommitted_ledger_changes())
+
+    def test_row_budget(self):
+        cache = StatementResultCache(max_entries=10, max_rows=5)
+        self.assertFalse(cache.put("too_big", list(range(6))))
+        cache.put("a", [1, 2, 3])
+        cache.put("b", [1, 2])
+        cache.get("a")
+        cache.put("c", [1])
+        # "b" is the least recently used entry and goes to make room.
+        self.assertEqual(list(cache.entries), ["a", "c"])
+        self.assertEqual(cache.rows, 4)
@@ -0,0 +1,89 @@
+import json
+import re
+import zipfile
+from datetime import timedelta
+from urllib.parse import parse_qs, urlsplit
+
+from odoo import fields
+from odoo.exceptions import UserError
+from odoo.tests import tagged
+
+from odoo.addons.account.tests.common import AccountTestInvoicingCommon
+
+
+@tagged("post_install", "-at_install")
+class TestStatementXlsx(AccountTestInvoicingCommon):
+    """The XLSX export writes an aging sheet and one ledger sheet per currency."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.report = cls.env.ref("l10n_cr_statement_currency.statement_report")
+        cls.other_currency = cls.setup_other_currency("EUR")
+        cls.partner = cls.env["res.partner"].create({"name": "XLSX customer"})
+        today = fields.Date.today()
+        cls.init_invoice("out_invoice", cls.partner, today, amounts=[100.0], post=True)
+        cls.init_invoice("out_invoice", cls.partner, today, amounts=[200.0], currency=cls.other_currency, post=True)
+        cls.init_invoice("out_refund", cls.partner, today, amounts=[20.0], currency=cls.other_currency, post=True)
+        cls.overdue_partner = cls.env["res.partner"].create({"name": "Late payer"})
+        cls.init_invoice("out_invoice", cls.overdue_partner, today - timedelta(days=90), amounts=[300.0], post=True)
+
+    def _export(self):
+        options = self.report.get_options({})
+        options["partner_ids"] = self.partner.ids
+        return self._read_workbook(options)
+
+    def _export_from_action(self, **filters):
+        """Export with the options the download URL of the toolbar action carries."""
+        options = self.report.get_options({})
+        options.update(filters, partner_ids=(self.partner | self.overdue_partner).ids)
+        action = self.report.action_export_statement_xlsx(options)
+        return self._read_workbook(json.loads(parse_qs(urlsplit(action["url"]).query)["options"][0]))
+
+    def _read_workbook(self, options):
+        spool, filename = self.report._export_statement_to_xlsx(options)
+        self.assertTrue(filename.endswith(".xlsx"))
+        spool.seek(0)
+        with zipfile.ZipFile(spool) as workbook:
+            sheet_names = re.findall(r'<sheet name="([^"]+)"', workbook.read("xl/workbook.xml").decode())
+            sheets = {
+                name: workbook.read(f"xl/worksheets/sheet{index}.xml").decode()
+                for index, name in enumerate(sheet_names, start=1)
+            }
+        return sheet_names, sheets
+
+    def test_sheets_per_currency(self):
+        sheet_names, sheets = self._export()
+        currency_names = sorted([self.company_data["currency"].name, self.other_currency.name])
+        self.assertEqual(sheet_names, ["Antigüedad", *currency_names])
+        # Header, one row per partner and currency.
+        self.assertEqual(sheets["Antigüedad"].count("<row "), 3)
+        # Header, invoice and refund, totals.
+        self.assertEqual(sheets[self.other_currency.name].count("<row "), 4)
+
+    def test_amounts_are_numbers(self):
+        __, sheets = self._export()
+        other_sheet = sheets[self.other_currency.name]
+        self.assertIn("<v>200</v>", other_sheet)
+        self.assertIn("<v>-20</v>", other_sheet)
+        self.assertIn("SUBTOTAL(9,H2:H3)", other_sheet)
+
+    def test_action_url_options(self):
+        company_currency = self.company_data["currency"].name
+        sheet_names, sheets = self._export_from_action()
+        self.assertIn(self.other_currency.name, sheet_names)
+        self.assertIn(self.partner.name, sheets[company_currency])
+        self.assertIn(self.overdue_partner.name, sheets[company_currency])
+
+        # The days overdue filter travels in the URL and leaves out the current invoices.
+        sheet_names, sheets = self._export_from_action(statement_min_days_overdue=60)
+        self.assertEqual(sheet_names, ["Antigüedad", company_currency])
+        self.assertNotIn(self.partner.name, sheets[company_currency])
+        self.assertIn(self.overdue_partner.name, sheets[company_currency])
+        self.assertIn("<v>300</v>", sheets[company_currency])
+        # Header, the overdue invoice, totals.
+        self.assertEqual(sheets[company_currency].count("<row "), 3)
+
+    def test_action_refuses_an_empty_selection(self):
+        with self.assertRaises(UserError):
+            self._export_from_action(statement_min_days_overdue=1000)
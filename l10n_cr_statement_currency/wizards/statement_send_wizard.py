@@ -1,7 +1,4 @@
-from markupsafe import Markup, escape
-
-from odoo import _, api, fields, models
-from odoo.exceptions import UserError
+from odoo import api, fields, models
 
 
 class StatementSendWizard(models.TransientModel):
@@ -20,66 +17,20 @@ class StatementSendWizard(models.TransientModel):
         partner = self.env["res.partner"].browse(values.get("partner_id") or self.env.context.get("default_partner_id"))
         if partner:
             targets = partner._get_statement_target_emails()
+            mail_defaults = partner._get_statement_mail_defaults()
             values.setdefault("email_to", targets["email_to"])
             values.setdefault("email_cc", targets["email_cc"])
-            values.setdefault("subject", _("Estado de cuenta - %(partner)s") % {"partner": partner.name})
-            values.setdefault(
-                "body",
-                _(
-                    """
-                    <p>Dear Sir or Madam, %(partner)s,</p>
-                    <p>Please find attached your account statement. If you have any questions, please do not hesitate to contact us.</p>
-                    <p>Best regards.</p>
-                    """
-                )
-                % {"partner": partner.name},
-            )
+            values.setdefault("subject", mail_defaults["subject"])
+            values.setdefault("body", mail_defaults["body"])
         return values
 
 
     def _validate_target_emails(self):
         self.ensure_one()
-        targets = self.partner_id._get_statement_target_emails()
-        if not targets["email_to"]:
-            raise UserError(_('El contacto no tiene configurado un correo en "Correo para estados de cuenta".'))
+        self.partner_id._check_statement_target_emails()
 
     def action_send_statement(self):
         self.ensure_one()
         self._validate_target_emails()
-        targets = self.partner_id._get_statement_target_emails()
-        attachment = self.partner_id._render_statement_report_pdf()
-        mail = self.env["mail.mail"].create(
-            {
-                "subject": self.subject,
-                "body_html": self.body or "",
-                "email_to": targets["email_to"],
-                "email_cc": targets["email_cc"],
-                "attachment_ids": [(4, attachment.id)],
-                "auto_delete": False,
-            }
-        )
-        mail.send()
-        chatter_body = Markup(
-            "<p>%s</p>"
-            "<ul>"
-            "<li><strong>%s</strong> %s</li>"
-            "<li><strong>%s</strong> %s</li>"
-            "<li><strong>%s</strong> %s</li>"
-            "</ul>"
-        ) % (
-            escape(_("Se envió un estado de cuenta por correo electrónico.")),
-            escape(_("Para:")),
-            escape(targets["email_to"] or "-"),
-            escape(_("CC:")),
-            escape(targets["email_cc"] or "-"),
-            escape(_("Asunto:")),
-            escape(self.subject or "-"),
-        )
-        self.partner_id.message_post(
-            body=chatter_body,
-            body_is_html=True,
-            attachment_ids=[attachment.id],
-            message_type="comment",
-            subtype_xmlid="mail.mt_note",
-        )
+        self.partner_id._send_statement_email(self.subject, self.body)
         return {"type": "ir.actions.act_window_close"}